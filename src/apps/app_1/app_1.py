@@ -4,9 +4,15 @@ import sys
 import time
 import math
 from core.camera.camera_manager import CameraManager
+from core.render.dirty_rects import DirtyRectRenderer
+from core.render.text_cache import render_text
 from dotenv import load_dotenv
 import os
 
+from core.apps.lifecycle import App
+from core.assets.asset_manager import play_sound
+from core.input.gestures import PINCH_END, PINCH_MOVE, PINCH_START
+
 load_dotenv()
 # Initialize Pygame
 pygame.init()
@@ -20,112 +26,133 @@ LIGHT_BLUE = (173, 216, 230)
 WHITE = (255, 255, 255)
 NAVY_BLUE = (20, 20, 40)
 PIXEL_TO_MM = 0.4478  # Adjust this variable as needed
-PINCH_RELEASE_DISTANCE = 60  # Distance to release the pinch
-PINCH_HOLD_TIME = 0.2  # Minimum time to hold the pinch before releasing
 
 def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
-def play_sound(file_path):
-        mixer.music.stop()
-        mixer.music.load(file_path)
-        mixer.music.play()
-
 def draw_line_with_measurement(screen, start_point, end_point):
+    # Returns the area drawn (line and label) or None
     if start_point and end_point:
-        pygame.draw.line(screen, LIGHT_BLUE, start_point, end_point, 2)
+        line_rect = pygame.draw.line(screen, LIGHT_BLUE, start_point, end_point, 2)
         pygame.draw.circle(screen, LIGHT_BLUE, start_point, 5)
         pygame.draw.circle(screen, LIGHT_BLUE, end_point, 5)
         mid_line_point = ((start_point[0] + end_point[0]) // 2, (start_point[1] + end_point[1]) // 2)
         line_length = distance(start_point, end_point) * PIXEL_TO_MM
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(f'{line_length:.2f} mm', True, WHITE)
-        screen.blit(text_surface, mid_line_point)
-
-def run(screen, camera_manager):
-    running = True
-    drawing = False
-    start_point = None
-    end_point = None
-    permanent_lines = []
-    pinch_start_time = None
-
-    home_button_center = (150, 100)  # Moved farther right and down
-    home_button_radius = 50
-
-    clear_button_rect = pygame.Rect((SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] - 150, 300, 70))
+        text_surface = render_text(f'{line_length:.2f} mm', 36, WHITE)
+        text_rect = screen.blit(text_surface, mid_line_point)
+        return line_rect.inflate(12, 12).union(text_rect)
+    return None
+
+class MeasureApp(App):
+    name = 'app_1'
+
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.drawing = False
+        self.start_point = None
+        self.end_point = None
+        self.permanent_lines = []
+        self.line_areas = []
+        # The hand drawing the current line, and every hand that is pinching
+        self.drawing_hand = None
+        self.pinched_hands = set()
+
+        self.home_button_center = (150, 100)  # Moved farther right and down
+        self.home_button_radius = 50
+
+        self.clear_button_rect = pygame.Rect((SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] - 150, 300, 70))
+
+        # Index finger tips of all hands
+        self.cursors = []
+        self.hands = []
+        # Everything is redrawn each frame, but only what moved is pushed to the display
+        self.renderer = DirtyRectRenderer(screen)
+
+    def on_enter(self):
+        self.renderer.invalidate()
+        # Resumed: the cursor last seen was on the home button
+        self.cursors = []
+        self.drawing = False
+        self.pinched_hands = set()
+
+    def handle_gesture(self, event):
+        # A pinch draws a line from where it starts to where it is released
+        if event.type == PINCH_START:
+            self.pinched_hands.add(event.hand)
+            if not self.drawing:
+                play_sound('audio/quick_click.wav')
+                self.start_point = event.position
+                self.end_point = None
+                self.drawing = True
+                self.drawing_hand = event.hand
+                play_sound('audio/drawing.wav')
+        elif event.type == PINCH_MOVE:
+            if self.drawing and event.hand == self.drawing_hand:
+                self.end_point = event.position
+        elif event.type == PINCH_END:
+            self.pinched_hands.discard(event.hand)
+            if self.drawing and event.hand == self.drawing_hand:
+                if self.start_point and self.end_point:
+                    play_sound('audio/quick_click.wav')
+                    self.permanent_lines.append((self.start_point, self.end_point))
+                self.drawing = False
+
+    def update(self, dt, hands):
+        self.renderer.begin_frame()
+        self.hands = hands
+        self.cursors = [hand.cursor for hand in hands]
+
+        # Check if any cursor touches the home button or the clear button
+        if any(distance(cursor, self.home_button_center) <= self.home_button_radius for cursor in self.cursors):
+            play_sound('audio/back.wav')
+            self.close()
+        elif any(self.clear_button_rect.collidepoint(cursor) for cursor in self.cursors):
+            # Damaging the old lines makes this frame erase them
+            for area in self.line_areas:
+                self.renderer.damage(area)
+            self.permanent_lines = []
+
+    def draw(self, screen):
+        renderer = self.renderer
+        screen.fill(BLACK)
 
-    while running:
-        if not camera_manager.update():
-            continue
+        for hand in self.hands:
+            thumb_pos = (int(hand[4][0]), int(hand[4][1]))
+            index_pos = (int(hand[8][0]), int(hand[8][1]))
+            mid_point = ((thumb_pos[0] + index_pos[0]) // 2, (thumb_pos[1] + index_pos[1]) // 2)
+            pygame.draw.circle(screen, LIGHT_BLUE, mid_point, 10, 3)
+            if hand.id in self.pinched_hands:
+                pygame.draw.circle(screen, WHITE, mid_point, 10)
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                camera_manager.release()
-                sys.exit()
+            pygame.draw.circle(screen, WHITE, thumb_pos, 5)
+            pygame.draw.circle(screen, WHITE, index_pos, 5)
+            renderer.damage((mid_point[0] - 12, mid_point[1] - 12, 24, 24))
+            renderer.damage((thumb_pos[0] - 6, thumb_pos[1] - 6, 12, 12))
+            renderer.damage((index_pos[0] - 6, index_pos[1] - 6, 12, 12))
 
-        screen.fill(BLACK)
+        self.line_areas = [draw_line_with_measurement(screen, line[0], line[1]) for line in self.permanent_lines]
 
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                thumb_pos = (int(hand_landmarks[4][0]), int(hand_landmarks[4][1]))  # THUMB_TIP
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))  # INDEX_FINGER_TIP
-
-                mid_point = ((thumb_pos[0] + index_pos[0]) // 2, (thumb_pos[1] + index_pos[1]) // 2)
-                pygame.draw.circle(screen, LIGHT_BLUE, mid_point, 10, 3)
-
-                pygame.draw.circle(screen, WHITE, thumb_pos, 5)
-                pygame.draw.circle(screen, WHITE, index_pos, 5)
-
-                distance_between_fingers = distance(thumb_pos, index_pos)
-                if distance_between_fingers < 50:  # Threshold for starting a pinch
-                    pygame.draw.circle(screen, WHITE, mid_point, 10)
-                    if not drawing:
-                        play_sound('audio/quick_click.wav')
-                        start_point = mid_point
-                        drawing = True
-                        pinch_start_time = time.time()
-                        play_sound('audio/drawing.wav')
-                    else:
-                        end_point = mid_point
-                else:
-                    if drawing and (distance_between_fingers > PINCH_RELEASE_DISTANCE or (time.time() - pinch_start_time) > PINCH_HOLD_TIME):
-                        if start_point and end_point:
-                            play_sound('audio/quick_click.wav')
-                            permanent_lines.append((start_point, end_point))
-                        drawing = False
-
-        for line in permanent_lines:
-            draw_line_with_measurement(screen, line[0], line[1])
-
-        if drawing and start_point and end_point:
-            draw_line_with_measurement(screen, start_point, end_point)
-
-        # Check if the cursor touches the home button or the clear button
-        if index_pos and distance(index_pos, home_button_center) <= home_button_radius:
-            running = False
-            play_sound('audio/back.wav')
-        elif index_pos and clear_button_rect.collidepoint(index_pos):
-            permanent_lines = []
+        if self.drawing and self.start_point and self.end_point:
+            renderer.damage(draw_line_with_measurement(screen, self.start_point, self.end_point))
 
         # Draw home button
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, home_button_radius)
-        pygame.draw.circle(screen, LIGHT_BLUE, home_button_center, home_button_radius, 5)
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.home_button_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.home_button_radius, 5)
+        text_surface = render_text('Home', 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.home_button_center)
         screen.blit(text_surface, text_rect)
 
         # Draw clear button
-        pygame.draw.rect(screen, NAVY_BLUE, clear_button_rect, border_radius=15)
-        pygame.draw.rect(screen, LIGHT_BLUE, clear_button_rect, 5, border_radius=15)
-        text_surface = font.render('Clear', True, WHITE)
-        text_rect = text_surface.get_rect(center=clear_button_rect.center)
+        pygame.draw.rect(screen, NAVY_BLUE, self.clear_button_rect, border_radius=15)
+        pygame.draw.rect(screen, LIGHT_BLUE, self.clear_button_rect, 5, border_radius=15)
+        text_surface = render_text('Clear', 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.clear_button_rect.center)
         screen.blit(text_surface, text_rect)
 
-        pygame.display.flip()
-        pygame.time.delay(1)
+        return renderer.flush_damage()
+
 
+def run(screen, camera_manager):
+    # Standalone: runs the app in the shared main loop until it closes
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, MeasureApp(screen, camera_manager))
@@ -10,6 +10,10 @@ import sys
 from dotenv import load_dotenv
 import os
 
+from core.apps.lifecycle import App
+from core.assets.asset_manager import play_sound
+from core.render.text_cache import render_text
+
 load_dotenv()
 
 SCREEN_WIDTH = 1920
@@ -30,13 +34,6 @@ checkpoint = "vinvino02/glpn-nyu"
 image_processor = AutoImageProcessor.from_pretrained(checkpoint)
 model = AutoModelForDepthEstimation.from_pretrained(checkpoint)
 
-def play_sound(file_path):
-    try:
-        mixer.music.load(file_path)
-        mixer.music.play()
-    except pygame.error as e:
-        print(f"Error playing sound {file_path}: {e}")
-
 def perform_depth_estimation(image):
     # Process the image and get pixel values
     pixel_values = image_processor(image, return_tensors="pt").pixel_values
@@ -84,104 +81,101 @@ def save_images(depth_map):
     cv2.imwrite(depth_map_path, depth_map)
     print(f"Saved depth map as {depth_map_path}")
 
-def run(screen, camera_manager):
-    running = True
-    depth_image = None
-    scanning = False
-
-    circle_radius = 100
-    home_button_center = (50 + circle_radius, SCREEN_SIZE[1] - 50 - circle_radius)
-    scan_button_rect = pygame.Rect((SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] - 150, 300, 70))
-
-    font = pygame.font.Font(None, 36)
-
-    while running:
-        if not camera_manager.update():
-            continue
-
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        index_pos = None
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))  # INDEX_FINGER_TIP
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                sys.exit()
-
-        screen.fill(BLACK)
-
-        if index_pos:
-            if scan_button_rect.collidepoint(index_pos):
-                scanning = True
-                depth_image = None  # Clear the previous depth map
+class DepthScanApp(App):
+    name = 'app_2'
+
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.depth_image = None
+        self.depth_surface = None
+        # Row of the scan line while the scan animation runs, otherwise None
+        self.scan_y = None
+        # Index finger tips of all hands
+        self.cursors = []
+
+        self.circle_radius = 100
+        self.home_button_center = (50 + self.circle_radius, SCREEN_SIZE[1] - 50 - self.circle_radius)
+        self.scan_button_rect = pygame.Rect((SCREEN_SIZE[0] // 2 - 150, SCREEN_SIZE[1] - 150, 300, 70))
+
+    def update(self, dt, hands):
+        if self.scan_y is not None:
+            # The scan line sweeps down one step per frame, then the frame is scanned
+            self.scan_y += 20
+            if self.scan_y >= SCREEN_SIZE[1]:
+                self.scan_y = None
+                self.scan()
+            return
+
+        # Any hand can press the buttons
+        self.cursors = [hand.cursor for hand in hands]
+        for index_pos in self.cursors:
+            if self.scan_button_rect.collidepoint(index_pos):
+                self.scan_y = 0
+                self.depth_image = None  # Clear the previous depth map
+                self.depth_surface = None
 
                 # Play start sound
                 play_sound('audio/drawing.wav')
+                return
 
-                # Run scanning animation
-                for y in range(0, SCREEN_SIZE[1], 20):
-                    screen.fill(BLACK)
-                    pygame.draw.line(screen, WHITE, (0, y), (SCREEN_SIZE[0], y), 5)
-                    pygame.display.flip()
-                    pygame.time.delay(10)
-
-                # Clear the scanning lines
-                screen.fill(BLACK)
-                pygame.display.flip()
+            if (index_pos[0] - self.home_button_center[0])**2 + (index_pos[1] - self.home_button_center[1])**2 <= self.circle_radius**2:
+                self.close()
+                return
 
-                # Play end sound
-                play_sound('audio/quick_click.wav')
+    def scan(self):
+        # Play end sound
+        play_sound('audio/quick_click.wav')
 
-                # Capture an image from the camera
-                ret, frame = camera_manager.cap.read()
-                if ret:
-                    # Apply M1 transformation to the captured image
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    frame_transformed = cv2.warpPerspective(frame_rgb, camera_manager.M1, (SCREEN_SIZE[0], SCREEN_SIZE[1]))
-                    image = Image.fromarray(frame_transformed)
-                    depth_colored, depth_cv = perform_depth_estimation(image)
+        # The main loop has already picked up the latest camera frame; it
+        # comes warped into display space with precomputed remap tables
+        frame = self.camera_manager.get_projector_frame()
+        if frame is not None:
+            image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            depth_colored, depth_cv = perform_depth_estimation(image)
 
-                    # Save images
-                    save_images(depth_cv)
+            # Save images
+            save_images(depth_cv)
 
-                    depth_image = depth_colored
+            self.depth_image = depth_colored
+            # Ensure the image is correctly converted to RGB format for Pygame
+            depth_surface = pygame.surfarray.make_surface(depth_colored.transpose((1, 0, 2)))
+            self.depth_surface = pygame.transform.scale(depth_surface, (SCREEN_SIZE[0], SCREEN_SIZE[1]))
 
-                scanning = False
+    def draw(self, screen):
+        screen.fill(BLACK)
 
-            if (index_pos[0] - home_button_center[0])**2 + (index_pos[1] - home_button_center[1])**2 <= circle_radius**2:
-                running = False
+        if self.scan_y is not None:
+            # Scanning animation
+            pygame.draw.line(screen, WHITE, (0, self.scan_y), (SCREEN_SIZE[0], self.scan_y), 5)
+            return None
 
-        if depth_image is not None:
-            # Ensure the image is correctly converted to RGB format for Pygame
-            depth_surface = pygame.surfarray.make_surface(depth_image.transpose((1, 0, 2)))
-            depth_surface = pygame.transform.scale(depth_surface, (SCREEN_SIZE[0], SCREEN_SIZE[1]))
-            screen.blit(depth_surface, (0, 0))
+        if self.depth_surface is not None:
+            screen.blit(self.depth_surface, (0, 0))
 
         # Draw a black bar at the bottom for hand tracking
         pygame.draw.rect(screen, BLACK, (0, SCREEN_SIZE[1] - 200, SCREEN_SIZE[0], 200))
 
         # Draw scan button
-        pygame.draw.rect(screen, NAVY_BLUE, scan_button_rect, border_radius=15)
-        pygame.draw.rect(screen, LIGHT_BLUE, scan_button_rect, 5, border_radius=15)
-        button_text = 'Scanning...' if scanning else 'Start Scan'
-        text_surface = font.render(button_text, True, WHITE)
-        text_rect = text_surface.get_rect(center=scan_button_rect.center)
+        pygame.draw.rect(screen, NAVY_BLUE, self.scan_button_rect, border_radius=15)
+        pygame.draw.rect(screen, LIGHT_BLUE, self.scan_button_rect, 5, border_radius=15)
+        text_surface = render_text('Start Scan', 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.scan_button_rect.center)
         screen.blit(text_surface, text_rect)
 
         # Draw home button
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, circle_radius)
-        pygame.draw.circle(screen, LIGHT_BLUE, home_button_center, circle_radius, 5)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.circle_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.circle_radius, 5)
+        text_surface = render_text('Home', 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.home_button_center)
         screen.blit(text_surface, text_rect)
 
-        # Draw the hand tracking circle on top of everything
-        if index_pos:
-            pygame.draw.circle(screen, LIGHT_BLUE, index_pos, 10, 3)
+        # Draw the hand tracking circles on top of everything
+        for cursor in self.cursors:
+            pygame.draw.circle(screen, LIGHT_BLUE, cursor, 10, 3)
+        return None
 
-        pygame.display.flip()
-        pygame.time.delay(1)
 
+def run(screen, camera_manager):
+    # Standalone: runs the app in the shared main loop until it closes
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, DepthScanApp(screen, camera_manager))
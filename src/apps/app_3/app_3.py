@@ -10,6 +10,13 @@ import time
 from dotenv import load_dotenv
 import os
 
+from core.apps.lifecycle import App
+from core.assets.asset_manager import EFFECTS_CHANNEL, load_image, play_sound, assets
+from core.input.gestures import DWELL, PINCH_START
+from core.input.hands import steering_hand
+from core.input.hit_test import HitTestGrid
+from core.render.text_cache import render_text
+
 load_dotenv()
 pygame.init()
 mixer.init()
@@ -23,46 +30,131 @@ WHITE = (255, 255, 255)
 LIGHT_BLUE = (173, 216, 230)
 NAVY_BLUE = (20, 20, 40)
 
-def play_sound(file_path):
-    try:
-        mixer.music.load(file_path)
-        mixer.music.play()
-    except pygame.error as e:
-        print(f"Error playing sound {file_path}: {e}")
+# Menu sounds go to the UI channel, the games' sounds to the effects channel
+def play_effect(file_path):
+    play_sound(file_path, EFFECTS_CHANNEL)
+
+def move_invaders(invaders, invader_speed_x, invader_direction, invader_drop_speed, screen_width):
+    """
+    Moves the invader block sideways; when it touches an edge it drops one
+    step and turns around. Returns (invader_direction, moved_down).
+    """
+    move_down = False
+    for invader, _ in invaders:
+        invader.x += invader_speed_x * invader_direction
+        if invader.left <= 0 or invader.right >= screen_width:
+            move_down = True
+
+    if move_down:
+        invader_direction *= -1
+        for invader, _ in invaders:
+            invader.y += invader_drop_speed
+            invader.x += invader_speed_x * invader_direction
+    return invader_direction, move_down
+
+def resolve_bullet_hits(bullets, invaders):
+    """Removes every bullet and the invader it hit, returns the number of hits."""
+    hits = 0
+    for bullet in bullets[:]:
+        for invader, img in invaders[:]:
+            if bullet.colliderect(invader):
+                invaders.remove((invader, img))
+                bullets.remove(bullet)
+                hits += 1
+                break
+    return hits
+
+def step_ball(ball, paddle, bricks, ball_dx, ball_dy, screen_size):
+    """
+    Moves the breakout ball one frame and bounces it off walls, the paddle
+    and bricks (a hit brick is removed). Returns (ball_dx, ball_dy, events)
+    where events lists 'bounce', 'brick' and 'lost' in the order they happened.
+    """
+    events = []
+    ball.x += ball_dx
+    ball.y += ball_dy
+
+    if ball.left <= 0 or ball.right >= screen_size[0]:
+        events.append('bounce')
+        ball_dx *= -1
+    if ball.top <= 0:
+        events.append('bounce')
+        ball_dy *= -1
+    if ball.bottom >= screen_size[1]:
+        events.append('lost')
+        return ball_dx, ball_dy, events
+
+    if ball.colliderect(paddle):
+        events.append('bounce')
+        ball_dy *= -1
+
+    for brick in bricks[:]:
+        if ball.colliderect(brick):
+            bricks.remove(brick)
+            events.append('brick')
+            ball_dy *= -1
+            break
+    return ball_dx, ball_dy, events
 
-def space_invaders(screen, camera_manager, SCREEN_SIZE):
-    import pygame
-    import sys
-    import math
-    from core.camera.camera_manager import CameraManager
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+# Time the win/lose message stays up before returning home
+GAME_OVER_DELAY = 3.0
 
-    pygame.init()
 
-    pygame.display.set_caption("Space Invaders with Hand Control")
+def draw_home_button(screen, center, radius, outline_color):
+    pygame.draw.circle(screen, NAVY_BLUE, center, radius)
+    pygame.draw.circle(screen, outline_color, center, radius, 5)
+    text_surface = render_text('Home', 36, WHITE)
+    text_rect = text_surface.get_rect(center=center)
+    screen.blit(text_surface, text_rect)
 
-    player_scale = 8
-    invader_scale = 3
 
-    player_img = pygame.image.load("apps/app_3/player.png")
-    invader1_img = pygame.image.load("apps/app_3/invader1.png")
-    invader2_img = pygame.image.load("apps/app_3/invader2.png")
+def draw_centered_message(screen, text):
+    surface = render_text(text, 55, WHITE)
+    screen.blit(surface, (SCREEN_SIZE[0] // 2 - surface.get_width() // 2, SCREEN_SIZE[1] // 2 - surface.get_height() // 2))
 
-    player_img = pygame.transform.scale(player_img, (int(player_img.get_width() * player_scale), int(player_img.get_height() * player_scale)))
-    invader1_img = pygame.transform.scale(invader1_img, (int(invader1_img.get_width() * invader_scale), int(invader1_img.get_height() * invader_scale)))
-    invader2_img = pygame.transform.scale(invader2_img, (int(invader2_img.get_width() * invader_scale), int(invader2_img.get_height() * invader_scale)))
 
-    player_width = player_img.get_width()
-    player_height = player_img.get_height()
+class SpaceInvadersGame(App):
+    name = 'app_3.space_invaders'
+    # The game advances one step per frame and was tuned at the camera's rate
+    target_fps = 30
 
-    
+    player_scale = 8
+    invader_scale = 3
+
+    player_speed = 5
+    bullet_speed = -10
+    invader_speed_y = 10
+    invader_drop_speed = 20
+    invader_speed_increase_factor = 1.07
 
     home_button_center = (60, 60)
     home_button_radius = 50
 
-    def distance(p1, p2):
-        return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
-
-    def initialize_game():
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.player_img = assets.scaled_image("apps/app_3/player.png", self.player_scale)
+        self.invader1_img = assets.scaled_image("apps/app_3/invader1.png", self.invader_scale)
+        self.invader2_img = assets.scaled_image("apps/app_3/invader2.png", self.invader_scale)
+        assets.preload_sounds(['./apps/app_3/laser.mp3', './apps/app_3/explosion.mp3'])
+
+        self.restart()
+
+    def restart(self):
+        self.player, self.bullets, self.invaders = self.initialize_game()
+        self.invader_speed_x = 3
+        self.invader_direction = 1
+        self.can_shoot = True
+        # Set when the game is won or lost, with the message to show
+        self.game_over_time = None
+        self.game_over_text = None
+        # Id of the hand moving the player
+        self.player_hand = None
+
+    def initialize_game(self):
+        player_width = self.player_img.get_width()
+        player_height = self.player_img.get_height()
         player = pygame.Rect(SCREEN_SIZE[0] // 2 - player_width // 2, SCREEN_SIZE[1] - player_height - 10, player_width, player_height)
 
         bullets = []
@@ -73,338 +165,225 @@ def space_invaders(screen, camera_manager, SCREEN_SIZE):
 
         for row in range(invader_rows):
             for col in range(invader_columns):
-                x = col * (invader1_img.get_width() + invader_gap) + 150
-                y = row * (invader1_img.get_height() + invader_gap) + 50
-                invader_rect = pygame.Rect(x, y, invader1_img.get_width(), invader1_img.get_height())
+                x = col * (self.invader1_img.get_width() + invader_gap) + 150
+                y = row * (self.invader1_img.get_height() + invader_gap) + 50
+                invader_rect = pygame.Rect(x, y, self.invader1_img.get_width(), self.invader1_img.get_height())
                 if row < 3:
-                    invaders.append((invader_rect, invader1_img))
+                    invaders.append((invader_rect, self.invader1_img))
                 else:
-                    invaders.append((invader_rect, invader2_img))
+                    invaders.append((invader_rect, self.invader2_img))
 
         return player, bullets, invaders
 
-    global can_shoot
-
-    player, bullets, invaders = initialize_game()
-
-    running = True
-
-    BLACK = (0, 0, 0)
-    WHITE = (255, 255, 255)
-    RED = (255, 0, 0)
-    LIGHT_BLUE = (173, 216, 230)
-    NAVY_BLUE = (20, 20, 40)
+    def on_enter(self):
+        pygame.display.set_caption("Space Invaders with Hand Control")
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if distance(event.pos, self.home_button_center) <= self.home_button_radius:
+                self.close()
+
+    def update(self, dt, hands):
+        if self.game_over_time is not None:
+            if time.time() - self.game_over_time >= GAME_OVER_DELAY:
+                # The next visit starts a new game
+                self.restart()
+                self.close()
+            return
+
+        steering = steering_hand(hands, self.player_hand)
+        if steering is not None:
+            self.player_hand = steering.id
+            self.player.centerx = steering.cursor[0]
+            self.player.clamp_ip(self.screen.get_rect())
+
+        if self.can_shoot:
+            play_effect('./apps/app_3/laser.mp3')
+            bullet = pygame.Rect(self.player.centerx - 2.5, self.player.top - 10, 5, 10)
+            self.bullets.append(bullet)
+            self.can_shoot = False
+
+        for bullet in self.bullets[:]:
+            bullet.y += self.bullet_speed
+            if bullet.bottom < 0:
+                self.bullets.remove(bullet)
+                self.can_shoot = True
 
-    player_speed = 5
-    bullet_speed = -10
-    invader_speed_x = 3
-    invader_speed_y = 10
-    invader_drop_speed = 20
-    invader_direction = 1
-    invader_speed_increase_factor = 1.07
-    can_shoot = True
+        self.invader_direction, move_down = move_invaders(self.invaders, self.invader_speed_x, self.invader_direction,
+                                                          self.invader_drop_speed, SCREEN_SIZE[0])
+        if move_down:
+            self.invader_speed_x *= self.invader_speed_increase_factor
 
-    while running:
-        if not camera_manager.update():
-            continue
+        if resolve_bullet_hits(self.bullets, self.invaders):
+            play_effect('./apps/app_3/explosion.mp3')
+            self.can_shoot = True
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                camera_manager.release()
-                sys.exit()
+        if any(distance(hand.cursor, self.home_button_center) <= self.home_button_radius for hand in hands):
+            self.close()
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = event.pos
-                if distance(mouse_pos, home_button_center) <= home_button_radius:
-                    running = False
+        if not self.invaders:
+            self.game_over_text = "YOU WIN!"
+        elif any(invader.bottom >= SCREEN_SIZE[1] for invader, _ in self.invaders):
+            self.game_over_text = "GAME OVER"
+        if self.game_over_text is not None:
+            self.game_over_time = time.time()
 
+    def draw(self, screen):
         screen.fill(BLACK)
 
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))
-                player.centerx = index_pos[0]
-                player.clamp_ip(screen.get_rect())
-
-        if can_shoot:
-            play_sound('./apps/app_3/laser.mp3')
-            bullet = pygame.Rect(player.centerx - 2.5, player.top - 10, 5, 10)
-            bullets.append(bullet)
-            can_shoot = False
-
-        for bullet in bullets[:]:
-            bullet.y += bullet_speed
-            if bullet.bottom < 0:
-                bullets.remove(bullet)
-                can_shoot = True
-
-        move_down = False
-        for invader, _ in invaders:
-            invader.x += invader_speed_x * invader_direction
-            if invader.left <= 0 or invader.right >= SCREEN_SIZE[0]:
-                move_down = True
-
-        if move_down:
-            invader_direction *= -1
-            for invader, _ in invaders:
-                invader.y += invader_drop_speed
-                invader.x += invader_speed_x * invader_direction
-
-            invader_speed_x *= invader_speed_increase_factor
-
-        for bullet in bullets[:]:
-            for invader, img in invaders[:]:
-                if bullet.colliderect(invader):
-                    play_sound('./apps/app_3/explosion.mp3')
-                    invaders.remove((invader, img))
-                    bullets.remove(bullet)
-                    can_shoot = True
-                    break
-
-        for invader, img in invaders:
+        for invader, img in self.invaders:
             screen.blit(img, invader.topleft)
 
-        screen.blit(player_img, player.topleft)
-        for bullet in bullets:
+        screen.blit(self.player_img, self.player.topleft)
+        for bullet in self.bullets:
             pygame.draw.rect(screen, RED, bullet)
 
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, home_button_radius)
-        pygame.draw.circle(screen, LIGHT_BLUE, home_button_center, home_button_radius, 5)
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
-        screen.blit(text_surface, text_rect)
-
-        if transformed_landmarks:
-            index_pos = (int(transformed_landmarks[0][8][0]), int(transformed_landmarks[0][8][1]))
-            if distance(index_pos, home_button_center) <= home_button_radius:
-                running = False
-
-        if not invaders:
-            font = pygame.font.SysFont(None, 55)
-            win_text = font.render("YOU WIN!", True, WHITE)
-            screen.blit(win_text, (SCREEN_SIZE[0] // 2 - win_text.get_width() // 2, SCREEN_SIZE[1] // 2 - win_text.get_height() // 2))
-            pygame.display.flip()
-            pygame.time.delay(3000)
-            running = False
-
-        if any(invader.bottom >= SCREEN_SIZE[1] for invader, _ in invaders):
-            font = pygame.font.SysFont(None, 55)
-            lose_text = font.render("GAME OVER", True, WHITE)
-            screen.blit(lose_text, (SCREEN_SIZE[0] // 2 - lose_text.get_width() // 2, SCREEN_SIZE[1] // 2 - lose_text.get_height() // 2))
-            pygame.display.flip()
-            pygame.time.delay(3000)
-            running = False
-
-        pygame.display.flip()
-        pygame.time.Clock().tick(60)
-
-def brick_breaker(screen, camera_manager, SCREEN_SIZE):
-    import pygame
-    from pygame import mixer
-    import sys
-    import time
-    import math
-    from core.camera.camera_manager import CameraManager
-
-    pygame.init()
-
-    mixer.init()
-
-    
-
-    BLACK = (0, 0, 0)
-    WHITE = (255, 255, 255)
-    NAVY_BLUE = (20, 20, 40)
-
-    PADDLE_WIDTH = 150
-    PADDLE_HEIGHT = 20
-    BALL_RADIUS = 10
-    BRICK_WIDTH = 125
-    BRICK_HEIGHT = 30
-    BRICKS_PER_ROW = SCREEN_SIZE[0] // BRICK_WIDTH
-    BRICK_ROWS = 5
-    global ball_dx, ball_dy
-    ball_dx = 7  
-    ball_dy = -7
-
-    RED = (255, 0, 0)
-    BLUE = (0, 0, 255)
-
-    def create_bricks():
-        bricks = []
-        for row in range(BRICK_ROWS):
-            for col in range(BRICKS_PER_ROW):
-                brick = pygame.Rect(col * BRICK_WIDTH, row * BRICK_HEIGHT + 50, BRICK_WIDTH - 5, BRICK_HEIGHT - 5)
-                bricks.append(brick)
-        return bricks
-
-    def distance(p1, p2):
-        return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-    
-    running = True
-
-    paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
-    ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
-    bricks = create_bricks()
+        draw_home_button(screen, self.home_button_center, self.home_button_radius, LIGHT_BLUE)
 
-    home_button_center = (100, SCREEN_SIZE[1] - 100)
-    home_button_radius = 50
+        if self.game_over_text is not None:
+            draw_centered_message(screen, self.game_over_text)
+        return None
 
-    while running:
-        if not camera_manager.update():
-            continue
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                camera_manager.release()
-                sys.exit()
+PADDLE_WIDTH = 150
+PADDLE_HEIGHT = 20
+BALL_RADIUS = 10
+BRICK_WIDTH = 125
+BRICK_HEIGHT = 30
+BRICKS_PER_ROW = SCREEN_SIZE[0] // BRICK_WIDTH
+BRICK_ROWS = 5
 
-        screen.fill(BLACK)
 
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))
-                paddle.centerx = index_pos[0]
-                paddle.clamp_ip(screen.get_rect())
-
-        ball.x += ball_dx
-        ball.y += ball_dy
-
-        if ball.left <= 0 or ball.right >= SCREEN_SIZE[0]:
-            play_sound('./apps/app_3/bounce.mp3')
-            ball_dx *= -1
-        if ball.top <= 0:
-            play_sound('./apps/app_3/bounce.mp3')
-            ball_dy *= -1
-        if ball.bottom >= SCREEN_SIZE[1]:
-            paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
-            ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
-            bricks = create_bricks()
-            ball_dx, ball_dy = 7, -7
-
-        if ball.colliderect(paddle):
-            play_sound('./apps/app_3/bounce.mp3')
-            ball_dy *= -1
+def create_bricks():
+    bricks = []
+    for row in range(BRICK_ROWS):
+        for col in range(BRICKS_PER_ROW):
+            brick = pygame.Rect(col * BRICK_WIDTH, row * BRICK_HEIGHT + 50, BRICK_WIDTH - 5, BRICK_HEIGHT - 5)
+            bricks.append(brick)
+    return bricks
 
-        for brick in bricks[:]:
-            if ball.colliderect(brick):
-                bricks.remove(brick)
-                play_sound('./apps/app_3/explosion.mp3')
-                ball_dy *= -1
-                break
 
-        pygame.draw.rect(screen, WHITE, paddle)
-        pygame.draw.ellipse(screen, BLUE, ball)
-        for brick in bricks:
-            pygame.draw.rect(screen, RED, brick)
+class BrickBreakerGame(App):
+    name = 'app_3.brick_breaker'
+    # The game advances one step per frame and was tuned at the camera's rate
+    target_fps = 30
 
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, home_button_radius)
-        pygame.draw.circle(screen, WHITE, home_button_center, home_button_radius, 5)
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
-        screen.blit(text_surface, text_rect)
+    home_button_center = (100, SCREEN_SIZE[1] - 100)
+    home_button_radius = 50
 
-        if transformed_landmarks:
-            index_pos = (int(transformed_landmarks[0][8][0]), int(transformed_landmarks[0][8][1]))
-            if distance(index_pos, home_button_center) <= home_button_radius:
-                running = False
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.reset()
+
+    def reset(self):
+        self.paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
+        self.bricks = create_bricks()
+        self.ball_dx, self.ball_dy = 7, -7
+        # Id of the hand moving the paddle
+        self.paddle_hand = None
+
+    def update(self, dt, hands):
+        steering = steering_hand(hands, self.paddle_hand)
+        if steering is not None:
+            self.paddle_hand = steering.id
+            self.paddle.centerx = steering.cursor[0]
+            self.paddle.clamp_ip(self.screen.get_rect())
+
+        self.ball_dx, self.ball_dy, events = step_ball(self.ball, self.paddle, self.bricks,
+                                                       self.ball_dx, self.ball_dy, SCREEN_SIZE)
+        for event in events:
+            if event == 'bounce':
+                play_effect('./apps/app_3/bounce.mp3')
+            elif event == 'brick':
+                play_effect('./apps/app_3/explosion.mp3')
+            elif event == 'lost':
+                self.reset()
+
+        if any(distance(hand.cursor, self.home_button_center) <= self.home_button_radius for hand in hands):
+            self.close()
+
+    def draw(self, screen):
+        screen.fill(BLACK)
+        pygame.draw.rect(screen, WHITE, self.paddle)
+        pygame.draw.ellipse(screen, BLUE, self.ball)
+        for brick in self.bricks:
+            pygame.draw.rect(screen, RED, brick)
 
-        pygame.display.flip()
-        pygame.time.delay(10)
+        draw_home_button(screen, self.home_button_center, self.home_button_radius, WHITE)
+        return None
 
-PINCH_THRESHOLD = 40
-HOVER_DELAY = 1.0  # Time in seconds to trigger action on hover
 
 def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
 
-def is_hover(pos, button_center, radius):
-    return (pos[0] - button_center[0])**2 + (pos[1] - button_center[1])**2 <= radius**2
 
-def run(screen, camera_manager):
-    running = True
+class ArcadeMenu(App):
+    name = 'app_3.menu'
+
     circle_radius = 100
     space_invaders_button_center = (SCREEN_SIZE[0] // 3, SCREEN_SIZE[1] // 2)
     brick_breaker_button_center = (2 * SCREEN_SIZE[0] // 3, SCREEN_SIZE[1] // 2)
     home_button_center = (50 + circle_radius, SCREEN_SIZE[1] - 50 - circle_radius)
 
-    # Load images for buttons
-    space_invaders_img = pygame.image.load('./apps/app_3/space_invaders.jpg')
-    space_invaders_img = pygame.transform.scale(space_invaders_img, (2 * circle_radius, 2 * circle_radius))
-
-    brick_breaker_img = pygame.image.load('./apps/app_3/brick_breaker.jpg')
-    brick_breaker_img = pygame.transform.scale(brick_breaker_img, (2 * circle_radius, 2 * circle_radius))
-
-    # Hover tracking
-    hover_start_time = { 'space_invaders': 0, 'brick_breaker': 0, 'home': 0 }
-
-    while running:
-        if not camera_manager.update():
-            continue
-
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))  # Index finger tip position
-
-                # Check if hovering over space invaders button
-                if is_hover(index_pos, space_invaders_button_center, circle_radius):
-                    if hover_start_time['space_invaders'] == 0:
-                        hover_start_time['space_invaders'] = time.time()
-                    elif time.time() - hover_start_time['space_invaders'] >= HOVER_DELAY:
-                        play_sound('./apps/app_3/game_start.mp3')
-                        space_invaders(screen, camera_manager, SCREEN_SIZE)  
-                        return
-                else:
-                    hover_start_time['space_invaders'] = 0
-
-                # Check if hovering over brick breaker button
-                if is_hover(index_pos, brick_breaker_button_center, circle_radius):
-                    if hover_start_time['brick_breaker'] == 0:
-                        hover_start_time['brick_breaker'] = time.time()
-                    elif time.time() - hover_start_time['brick_breaker'] >= HOVER_DELAY:
-                        play_sound('./apps/app_3/game_start.mp3')
-                        brick_breaker(screen, camera_manager, SCREEN_SIZE)
-                        return
-                else:
-                    hover_start_time['brick_breaker'] = 0
-
-                # Check if hovering over home button
-                if is_hover(index_pos, home_button_center, circle_radius):
-                    if hover_start_time['home'] == 0:
-                        hover_start_time['home'] = time.time()
-                    elif time.time() - hover_start_time['home'] >= HOVER_DELAY:
-                        play_sound('audio/back.wav')
-                        running = False
-                else:
-                    hover_start_time['home'] = 0
-
+    # Game started by each button
+    games = {'space_invaders': SpaceInvadersGame, 'brick_breaker': BrickBreakerGame}
+
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        circle_radius = self.circle_radius
+
+        # Load images for buttons
+        self.space_invaders_img = load_image('./apps/app_3/space_invaders.jpg', (2 * circle_radius, 2 * circle_radius))
+        self.brick_breaker_img = load_image('./apps/app_3/brick_breaker.jpg', (2 * circle_radius, 2 * circle_radius))
+
+        self.hits = HitTestGrid(SCREEN_SIZE[0], SCREEN_SIZE[1])
+        self.hits.add_circle('space_invaders', self.space_invaders_button_center, circle_radius)
+        self.hits.add_circle('brick_breaker', self.brick_breaker_button_center, circle_radius)
+        self.hits.add_circle('home', self.home_button_center, circle_radius)
+        # Games are created on first use and kept with the menu, so leaving
+        # a game and coming back resumes it
+        self.game_instances = {}
+
+    def start_game(self, button):
+        # The game takes the menu's place
+        play_sound('./apps/app_3/game_start.mp3')
+        if button not in self.game_instances:
+            self.game_instances[button] = self.games[button](self.screen, self.camera_manager)
+        self.close(self.game_instances[button])
+
+    def handle_gesture(self, event):
+        # Pinching a game button starts it at once; resting a fingertip on a
+        # button (a dwell) starts the game or returns to the home screen
+        if self.closed or event.type not in (PINCH_START, DWELL):
+            return
+        button = self.hits.hit(event.cursor)
+        if button in self.games:
+            self.start_game(button)
+        elif button == 'home' and event.type == DWELL:
+            play_sound('audio/back.wav')
+            self.close()
+
+    def draw(self, screen):
+        circle_radius = self.circle_radius
         screen.fill(BLACK)
 
         # Draw Space Invaders button with white circle overlay
-        screen.blit(space_invaders_img, (space_invaders_button_center[0] - circle_radius, 
-                                        space_invaders_button_center[1] - circle_radius))
-        pygame.draw.circle(screen, WHITE, space_invaders_button_center, circle_radius, 5)  # White overlay circle
+        screen.blit(self.space_invaders_img, (self.space_invaders_button_center[0] - circle_radius,
+                                             self.space_invaders_button_center[1] - circle_radius))
+        pygame.draw.circle(screen, WHITE, self.space_invaders_button_center, circle_radius, 5)  # White overlay circle
 
         # Draw Brick Breaker button with white circle overlay
-        screen.blit(brick_breaker_img, (brick_breaker_button_center[0] - circle_radius, 
-                                        brick_breaker_button_center[1] - circle_radius))
-        pygame.draw.circle(screen, WHITE, brick_breaker_button_center, circle_radius, 5)  # White overlay circle
+        screen.blit(self.brick_breaker_img, (self.brick_breaker_button_center[0] - circle_radius,
+                                            self.brick_breaker_button_center[1] - circle_radius))
+        pygame.draw.circle(screen, WHITE, self.brick_breaker_button_center, circle_radius, 5)  # White overlay circle
 
         # Draw Home button with text and white circle overlay
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, circle_radius)
-        pygame.draw.circle(screen, WHITE, home_button_center, circle_radius, 5)  # White overlay circle
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
-        screen.blit(text_surface, text_rect)
-        pygame.display.flip()
-        pygame.time.delay(50)
+        draw_home_button(screen, self.home_button_center, circle_radius, WHITE)
+        return None
+
+
+def run(screen, camera_manager):
+    # Standalone: runs the arcade in the shared main loop until it closes
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, ArcadeMenu(screen, camera_manager))
@@ -4,9 +4,14 @@ import sys
 import time
 import math
 from core.camera.camera_manager import CameraManager
+from core.render.dirty_rects import DirtyRectRenderer
+from core.render.text_cache import render_text
 from dotenv import load_dotenv
 import os
 
+from core.apps.lifecycle import App
+from core.input.hands import steering_hand
+
 load_dotenv()
 pygame.init()
 mixer.init()
@@ -45,79 +50,111 @@ def create_bricks():
 def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
-def run(screen, camera_manager):
-    global ball_dx, ball_dy
-    running = True
+def step_ball(ball, paddle, bricks, ball_dx, ball_dy):
+    """
+    Moves the ball one frame and bounces it off walls, the paddle and bricks
+    (a hit brick is removed). Returns the new (ball_dx, ball_dy, lost) where
+    lost means the ball fell past the paddle.
+    """
+    ball.x += ball_dx
+    ball.y += ball_dy
+
+    if ball.left <= 0 or ball.right >= SCREEN_SIZE[0]:
+        ball_dx *= -1
+    if ball.top <= 0:
+        ball_dy *= -1
+    if ball.bottom >= SCREEN_SIZE[1]:
+        return ball_dx, ball_dy, True
+
+    if ball.colliderect(paddle):
+        ball_dy *= -1
+
+    for brick in bricks[:]:
+        if ball.colliderect(brick):
+            bricks.remove(brick)
+            ball_dy *= -1
+            break
+    return ball_dx, ball_dy, False
 
-    paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 100, PADDLE_WIDTH, PADDLE_HEIGHT)
-    ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
-    bricks = create_bricks()
+class BreakoutApp(App):
+    name = 'app_4'
+    # The ball moves a fixed step per frame and was tuned at the camera's rate
+    target_fps = 30
 
     home_button_center = (100, SCREEN_SIZE[1] - 100)
     home_button_radius = 50
 
-    while running:
-        if not camera_manager.update():
-            continue
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                camera_manager.release()
-                sys.exit()
-
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 100, PADDLE_WIDTH, PADDLE_HEIGHT)
+        self.ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
+        self.bricks = create_bricks()
+        self.ball_dx, self.ball_dy = ball_dx, ball_dy
+        # Index finger tips of all hands, and the id of the hand steering the paddle
+        self.cursors = []
+        self.paddle_hand = None
+
+        # Everything is redrawn each frame, but only what moved is pushed to the display
+        self.renderer = DirtyRectRenderer(screen)
+
+    def on_enter(self):
+        self.renderer.invalidate()
+
+    def update(self, dt, hands):
+        renderer = self.renderer
+        renderer.begin_frame()
+
+        self.cursors = [hand.cursor for hand in hands]
+        # The paddle follows one hand's index finger until that hand is lost,
+        # so another hand reaching in does not take it over
+        steering = steering_hand(hands, self.paddle_hand)
+        if steering is not None:
+            self.paddle_hand = steering.id
+            self.paddle.centerx = steering.cursor[0]
+            self.paddle.clamp_ip(self.screen.get_rect())
+
+        bricks_before = len(self.bricks)
+        previous_bricks = self.bricks[:]
+        self.ball_dx, self.ball_dy, lost = step_ball(self.ball, self.paddle, self.bricks, self.ball_dx, self.ball_dy)
+        if len(self.bricks) != bricks_before:
+            for brick in previous_bricks:
+                if brick not in self.bricks:
+                    renderer.damage(brick)
+        if lost:
+            self.paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
+            self.ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
+            self.bricks = create_bricks()
+            self.ball_dx, self.ball_dy = 7, -7
+            renderer.invalidate()
+
+        if any(distance(cursor, self.home_button_center) <= self.home_button_radius for cursor in self.cursors):
+            self.close()
+
+    def draw(self, screen):
+        renderer = self.renderer
         screen.fill(BLACK)
 
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))  # INDEX_TIP
-
-                # Move the paddle to follow the index finger
-                paddle.centerx = index_pos[0]
-                paddle.clamp_ip(screen.get_rect())
-
-                pygame.draw.circle(screen, WHITE, index_pos, 5)  # Draw index finger
+        for cursor in self.cursors:
+            pygame.draw.circle(screen, WHITE, cursor, 5)  # Draw index finger
+            renderer.damage((cursor[0] - 6, cursor[1] - 6, 12, 12))
+        renderer.damage(self.paddle)
+        renderer.damage(self.ball)
 
-        ball.x += ball_dx
-        ball.y += ball_dy
-
-        if ball.left <= 0 or ball.right >= SCREEN_SIZE[0]:
-            ball_dx *= -1
-        if ball.top <= 0:
-            ball_dy *= -1
-        if ball.bottom >= SCREEN_SIZE[1]:
-            paddle = pygame.Rect(SCREEN_SIZE[0] // 2 - PADDLE_WIDTH // 2, SCREEN_SIZE[1] - 50, PADDLE_WIDTH, PADDLE_HEIGHT)
-            ball = pygame.Rect(SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2, BALL_RADIUS * 2, BALL_RADIUS * 2)
-            bricks = create_bricks()
-            ball_dx, ball_dy = 7, -7
-
-        if ball.colliderect(paddle):
-            ball_dy *= -1
-
-        for brick in bricks[:]:
-            if ball.colliderect(brick):
-                bricks.remove(brick)
-                ball_dy *= -1
-                break
-
-        pygame.draw.rect(screen, WHITE, paddle)
-        pygame.draw.ellipse(screen, BLUE, ball)
-        for brick in bricks:
+        pygame.draw.rect(screen, WHITE, self.paddle)
+        pygame.draw.ellipse(screen, BLUE, self.ball)
+        for brick in self.bricks:
             pygame.draw.rect(screen, RED, brick)
 
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, home_button_radius)
-        pygame.draw.circle(screen, LIGHT_BLUE, home_button_center, home_button_radius, 5)
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render('Home', True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.home_button_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.home_button_radius, 5)
+        text_surface = render_text('Home', 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.home_button_center)
         screen.blit(text_surface, text_rect)
 
-        if transformed_landmarks:
-            if distance(index_pos, home_button_center) <= home_button_radius:
-                running = False
+        return renderer.flush_damage()
 
-        pygame.display.flip()
-        pygame.time.delay(10)
 
+def run(screen, camera_manager):
+    # Standalone: runs the app in the shared main loop until it closes
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, BreakoutApp(screen, camera_manager))
@@ -11,12 +11,16 @@ from core.data.constants import (
     NAVY_BLUE,
     LIGHT_BLUE
 )
+from core.apps.lifecycle import App
+from core.assets.asset_manager import play_sound
+from core.render.text_cache import render_text
 from widgets.app_circle import AppCircle
 
 pygame.init()
 
 # Example list of cooking categories
 CATEGORIES = ["Lamb", "Beef", "Pasta", "Seafood", "Mince"]
+WHITE = (255, 255, 255)
 
 
 def create_category_circles():
@@ -60,36 +64,44 @@ def create_category_circles():
     return circles
 
 
-def main():
-    screen = pygame.display.set_mode(SCREEN_SIZE)
-    pygame.display.set_caption("Circular Cooking Categories")
-
-    # Create all our category circles
-    circles = create_category_circles()
-
-    clock = pygame.time.Clock()
-    running = True
-
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                # Left-click detection; check if any circle is hovered
-                for circle in circles:
-                    if circle.is_hovered_flag:
-                        print(f"You clicked on: {circle.text}")
-
-        # Clear the screen
-        screen.fill((0, 0, 0))
-
-        # Update hover states & draw each circle
-        for circle in circles:
-            # Check if mouse is inside this circle
-            if circle.is_hovered(mouse_pos):
+class CookingApp(App):
+    name = 'app_5'
+    home_button_center = (150, 100)
+    home_button_radius = 50
+
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        # Create all our category circles
+        self.circles = create_category_circles()
+
+    def on_enter(self):
+        pygame.display.set_caption("Circular Cooking Categories")
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if math.dist(event.pos, self.home_button_center) <= self.home_button_radius:
+                play_sound('audio/back.wav')
+                self.close()
+                return
+            # Left-click detection; check if any circle is hovered
+            for circle in self.circles:
+                if circle.is_hovered_flag:
+                    print(f"You clicked on: {circle.text}")
+
+    def update(self, dt, hands):
+        # Any index finger tip on the home button returns to the home screen
+        if any(math.dist(hand.cursor, self.home_button_center) <= self.home_button_radius for hand in hands):
+            play_sound('audio/back.wav')
+            self.close()
+            return
+
+        # The mouse and every index finger tip can hover a category
+        cursors = [pygame.mouse.get_pos()] + [hand_landmarks[8] for hand_landmarks in hands]
+
+        # Update hover states
+        for circle in self.circles:
+            # Check if a cursor is inside this circle
+            if any(circle.is_hovered(cursor) for cursor in cursors):
                 circle.is_hovered_flag = True
                 # Start hover timer if first time hovered
                 if circle.hover_time == 0:
@@ -97,11 +109,28 @@ def main():
             else:
                 circle.is_hovered_flag = False
                 circle.hover_time = 0  # reset hover timer if not hovered
+            circle.update()
+
+    def draw(self, screen):
+        # Clear the screen
+        screen.fill((0, 0, 0))
+        for circle in self.circles:
+            circle.render(screen)
 
-            circle.draw(screen)
+        # Draw home button
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.home_button_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.home_button_radius, 5)
+        text_surface = render_text('Home', 36, WHITE)
+        screen.blit(text_surface, text_surface.get_rect(center=self.home_button_center))
+        return None
+
+
+def main():
+    screen = pygame.display.set_mode(SCREEN_SIZE)
 
-        pygame.display.flip()
-        clock.tick(60)
+    # Runs in the shared main loop without hand tracking
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, None, CookingApp(screen, None))
 
     pygame.quit()
     sys.exit()
@@ -10,6 +10,12 @@ from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 import os.path
 
+from core.apps.lifecycle import App
+from core.assets.asset_manager import play_sound
+from core.input.gestures import PINCH_START
+from core.input.hit_test import HitTestGrid
+from core.render.text_cache import render_text
+
 # Initialize Pygame and set up some basic screen properties and colors
 pygame.init()
 SCREEN_SIZE = (1280, 720)
@@ -21,46 +27,40 @@ RED = (255, 0, 0)
 PIXEL_TO_MM = 0.4478 
 
 # Font and Layout Settings
-HEADER_FONT = pygame.font.Font(None, 40)
-DAY_FONT = pygame.font.Font(None, 32)
-CALENDAR_FONT = pygame.font.Font(None, 28)
-CLOCK_FONT = pygame.font.Font(None, 60)
-DATE_FONT = pygame.font.Font(None, 40)
-EVENT_FONT = pygame.font.Font(None, 30) 
+HEADER_FONT_SIZE = 40
+DAY_FONT_SIZE = 32
+CALENDAR_FONT_SIZE = 28
+CLOCK_FONT_SIZE = 60
+DATE_FONT_SIZE = 40
+EVENT_FONT_SIZE = 30
 
 CENTER_X = SCREEN_SIZE[0] // 2
 CENTER_Y = SCREEN_SIZE[1] // 2
 
-PINCH_THRESHOLD = 50  # Threshold for detecting a pinch
-pinch_active = False
+HIT_RADIUS = 50  # Radius around the arrows and days that a pinch selects
 
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
 def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
 
-def play_sound(file_path):
-    pygame.mixer.music.stop()
-    pygame.mixer.music.load(file_path)
-    pygame.mixer.music.play()
-
 #   draw the current time and date on the screen
 def draw_clock_and_date(screen):
     now = datetime.now()
     current_time = now.strftime("%I:%M %p")
     current_date = now.strftime("%a, %b %d, %Y")
 
-    time_surface = CLOCK_FONT.render(current_time, True, WHITE)
+    time_surface = render_text(current_time, CLOCK_FONT_SIZE, WHITE)
     time_rect = time_surface.get_rect(center=(CENTER_X, CENTER_Y - 260))
     screen.blit(time_surface, time_rect)
 
-    date_surface = DATE_FONT.render(current_date, True, WHITE)
+    date_surface = render_text(current_date, DATE_FONT_SIZE, WHITE)
     date_rect = date_surface.get_rect(center=(CENTER_X, CENTER_Y - 310))
     screen.blit(date_surface, date_rect)
 
 #   draw the calendar's header, including month and year
 def draw_calendar_header(screen, month, year):
-    header_surface = HEADER_FONT.render(f"{calendar.month_name[month]} {year}", True, WHITE)
+    header_surface = render_text(f"{calendar.month_name[month]} {year}", HEADER_FONT_SIZE, WHITE)
     header_rect = header_surface.get_rect(center=(CENTER_X, CENTER_Y - 160))
     screen.blit(header_surface, header_rect)
 
@@ -72,17 +72,14 @@ def draw_calendar_header(screen, month, year):
 def draw_days_of_week(screen):
     days = ["S", "M", "T", "W", "T", "F", "S"]
     for i, day in enumerate(days):
-        day_surface = DAY_FONT.render(day, True, WHITE)
+        day_surface = render_text(day, DAY_FONT_SIZE, WHITE)
         day_rect = day_surface.get_rect(center=(CENTER_X - 225 + i * 75, CENTER_Y - 110))
         screen.blit(day_surface, day_rect)
 
-#   draw the calendar grid and highlight the current or selected day
-def draw_calendar(screen, month, year, selected_day=None):
+#   screen position of every day of the month
+def get_day_positions(month, year):
     cal = calendar.Calendar(firstweekday=calendar.SUNDAY)
     days = cal.monthdayscalendar(year, month)
-
-    today = datetime.today()
-    current_day = today.day if today.month == month and today.year == year else None
     day_positions = {}
 
     for row, week in enumerate(days):
@@ -94,15 +91,24 @@ def draw_calendar(screen, month, year, selected_day=None):
             y = CENTER_Y - 50 + row * 60 
             day_positions[day] = (x, y)
 
-            if day == current_day:
-                pygame.draw.circle(screen, RED, (x, y), 20)  # Red circle for current day
+    return day_positions
+
+#   draw the calendar grid and highlight the current or selected day
+def draw_calendar(screen, month, year, selected_day=None):
+    today = datetime.today()
+    current_day = today.day if today.month == month and today.year == year else None
+    day_positions = get_day_positions(month, year)
+
+    for day, (x, y) in day_positions.items():
+        if day == current_day:
+            pygame.draw.circle(screen, RED, (x, y), 20)  # Red circle for current day
 
-            if day == selected_day:
-                pygame.draw.circle(screen, LIGHT_BLUE, (x, y), 25, 3)  # Highlight selected day
+        if day == selected_day:
+            pygame.draw.circle(screen, LIGHT_BLUE, (x, y), 25, 3)  # Highlight selected day
 
-            day_surface = CALENDAR_FONT.render(str(day), True, WHITE)
-            day_rect = day_surface.get_rect(center=(x, y))
-            screen.blit(day_surface, day_rect)
+        day_surface = render_text(str(day), CALENDAR_FONT_SIZE, WHITE)
+        day_rect = day_surface.get_rect(center=(x, y))
+        screen.blit(day_surface, day_rect)
 
     return day_positions
 
@@ -111,13 +117,13 @@ def draw_events(screen, events):
     y_offset = CENTER_Y - 260
     x_offset = CENTER_X + 300
 
-    heading_surface = HEADER_FONT.render("Events", True, WHITE)
+    heading_surface = render_text("Events", HEADER_FONT_SIZE, WHITE)
     heading_rect = heading_surface.get_rect(topleft=(x_offset, y_offset))
     screen.blit(heading_surface, heading_rect)
     y_offset += 60
 
     for event in events:
-        event_surface = EVENT_FONT.render(event, True, WHITE)
+        event_surface = render_text(event, EVENT_FONT_SIZE, WHITE)
         event_rect = event_surface.get_rect(topleft=(x_offset, y_offset))
         screen.blit(event_surface, event_rect)
         y_offset += 40
@@ -173,116 +179,112 @@ def get_google_calendar_events(day=None, month=None, year=None):
 
     return event_list
 
-#   change the month being displayed on the calendar
-def change_month(direction):
-    global month, year
-    month += direction
-    if month > 12:
-        month = 1
-        year += 1
-    elif month < 1:
-        month = 12
-        year -= 1
-
-#   handle pinch gestures for changing months or selecting a day
-def handle_pinch(mid_point, day_positions):
-    global pinch_active, selected_day, events
-    if not pinch_active:
-        left_arrow_pos = (CENTER_X - 150, CENTER_Y - 160)
-        right_arrow_pos = (CENTER_X + 150, CENTER_Y - 160)
-
-        if distance(mid_point, left_arrow_pos) < PINCH_THRESHOLD:
-            change_month(-1)  # Move the month backward
-            pinch_active = True
-        elif distance(mid_point, right_arrow_pos) < PINCH_THRESHOLD:
-            change_month(1)  # Move the month forward
-            pinch_active = True
+#   register the month arrows and the home button for hit testing
+def register_buttons(hits, home_button_center, home_button_radius):
+    hits.add_circle('left_arrow', (CENTER_X - 150, CENTER_Y - 160), HIT_RADIUS)
+    hits.add_circle('right_arrow', (CENTER_X + 150, CENTER_Y - 160), HIT_RADIUS)
+    hits.add_circle('home', home_button_center, home_button_radius)
+
+#   register the days of the displayed month, dropping days it does not have
+def register_days(hits, day_positions):
+    for day in range(1, 32):
+        if day in day_positions:
+            hits.add_circle(('day', day), day_positions[day], HIT_RADIUS)
         else:
-            for day, pos in day_positions.items():
-                if distance(mid_point, pos) < PINCH_THRESHOLD:
-                    selected_day = day
-                    events = get_google_calendar_events(day, month, year)
-                    pinch_active = True
-                    break
-
-#   reset the pinch state
-def reset_pinch():
-    global pinch_active
-    pinch_active = False
+            hits.remove(('day', day))
+
+class CalendarApp(App):
+    name = 'app_6'
 
-# Main   run the calendar application
-def run(screen, camera_manager):
-    global month, year, selected_day, events
-    running = True
     home_button_center = (150, CENTER_Y)
     home_button_radius = 50
 
-    month = datetime.now().month
-    year = datetime.now().year
-
-    selected_day = None
-    day_positions = {}
-    events = get_google_calendar_events()
-
-    while running:
-        if not camera_manager.update():
-            continue
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-                pygame.quit()
-                camera_manager.release()
-                sys.exit()
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.month = datetime.now().month
+        self.year = datetime.now().year
+
+        self.selected_day = None
+        self.events = get_google_calendar_events()
+        self.hands = []
+
+        self.hits = HitTestGrid(SCREEN_SIZE[0], SCREEN_SIZE[1])
+        register_buttons(self.hits, self.home_button_center, self.home_button_radius)
+        register_days(self.hits, get_day_positions(self.month, self.year))
+
+    #   change the month being displayed on the calendar
+    def change_month(self, direction):
+        self.month += direction
+        if self.month > 12:
+            self.month = 1
+            self.year += 1
+        elif self.month < 1:
+            self.month = 12
+            self.year -= 1
+        register_days(self.hits, get_day_positions(self.month, self.year))
+
+    #   handle pinch gestures for changing months or selecting a day
+    def handle_gesture(self, event):
+        if event.type != PINCH_START:
+            return
+        under_pinch = self.hits.query(event.position)
+        if 'left_arrow' in under_pinch:
+            self.change_month(-1)  # Move the month backward
+        elif 'right_arrow' in under_pinch:
+            self.change_month(1)  # Move the month forward
+        else:
+            days = [key[1] for key in under_pinch if key[0] == 'day']
+            if days:
+                # Neighbouring days overlap; the earliest one wins
+                self.selected_day = min(days)
+                self.events = get_google_calendar_events(self.selected_day, self.month, self.year)
+
+    def update(self, dt, hands):
+        self.hands = hands
+
+        # Check if a cursor touches the home button, for all hands at once
+        under_fingertips = self.hits.query_many([hand_landmarks[8] for hand_landmarks in hands])
+        if any('home' in under_fingertip for under_fingertip in under_fingertips):
+            play_sound("audio/back.wav")
+            self.close()
 
+    def draw(self, screen):
         screen.fill(BLACK)
 
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
-        index_pos = None
+        for hand_landmarks in self.hands:
+            thumb_pos = (int(hand_landmarks[4][0]), int(hand_landmarks[4][1]))
+            index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))
 
-        if transformed_landmarks:
-            for hand_landmarks in transformed_landmarks:
-                thumb_pos = (int(hand_landmarks[4][0]), int(hand_landmarks[4][1]))
-                index_pos = (int(hand_landmarks[8][0]), int(hand_landmarks[8][1]))
+            mid_point = ((thumb_pos[0] + index_pos[0]) // 2, (thumb_pos[1] + index_pos[1]) // 2)
+            pygame.draw.circle(screen, LIGHT_BLUE, mid_point, 10, 3)
 
-                mid_point = ((thumb_pos[0] + index_pos[0]) // 2, (thumb_pos[1] + index_pos[1]) // 2)
-                pygame.draw.circle(screen, LIGHT_BLUE, mid_point, 10, 3)
-
-                pygame.draw.circle(screen, WHITE, thumb_pos, 5)
-                pygame.draw.circle(screen, WHITE, index_pos, 5)
-
-                distance_between_fingers = distance(thumb_pos, index_pos)
-                if distance_between_fingers < PINCH_THRESHOLD:
-                    handle_pinch(mid_point, day_positions)
-                else:
-                    reset_pinch()  # Reset the pinch when fingers are apart
-
-        # Check if the cursor touches the home button
-        if index_pos and distance(index_pos, home_button_center) <= home_button_radius:
-            running = False
-            play_sound("audio/back.wav")
+            pygame.draw.circle(screen, WHITE, thumb_pos, 5)
+            pygame.draw.circle(screen, WHITE, index_pos, 5)
 
         # Draw home button
-        pygame.draw.circle(screen, NAVY_BLUE, home_button_center, home_button_radius)
-        pygame.draw.circle(screen, LIGHT_BLUE, home_button_center, home_button_radius, 5)
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render("Home", True, WHITE)
-        text_rect = text_surface.get_rect(center=home_button_center)
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.home_button_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.home_button_radius, 5)
+        text_surface = render_text("Home", 36, WHITE)
+        text_rect = text_surface.get_rect(center=self.home_button_center)
         screen.blit(text_surface, text_rect)
 
         # Draw the clock, calendar, and events
         draw_clock_and_date(screen)
-        draw_calendar_header(screen, month, year)
+        draw_calendar_header(screen, self.month, self.year)
         draw_days_of_week(screen)
-        day_positions = draw_calendar(screen, month, year, selected_day)
-        draw_events(screen, events)
+        draw_calendar(screen, self.month, self.year, self.selected_day)
+        draw_events(screen, self.events)
+        return None
 
-        pygame.display.flip()
-        pygame.time.delay(1)
+
+# Main   run the calendar application
+def run(screen, camera_manager):
+    # Standalone: runs the app in the shared main loop until it closes
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, CalendarApp(screen, camera_manager))
 
 if __name__ == "__main__":
     screen = pygame.display.set_mode((1280, 720), pygame.NOFRAME | pygame.FULLSCREEN)
     pygame.display.set_caption("Hand Tracking Calendar")
     camera_manager = CameraManager("./M1.npy", 1920, 1200) 
     run(screen, camera_manager)
-  #made by @r3z2
@@ -1,8 +1,11 @@
+import math
 import pygame
 import sys
 import numpy as np
-import sounddevice as sd
 from scipy.fftpack import fft
+from core.apps.lifecycle import App
+from core.assets.asset_manager import play_sound
+from core.render.text_cache import render_text
 
 # Initialize pygame
 pygame.init()
@@ -18,6 +21,8 @@ GRAY = (200, 200, 200)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 YELLOW = (255, 255, 0)
+NAVY_BLUE = (20, 20, 40)
+LIGHT_BLUE = (173, 216, 230)
 
 # Guitar string names and their standard frequencies (in Hz)
 strings = [
@@ -29,16 +34,11 @@ strings = [
     {"name": "E (1st)", "frequency": 329.63},
 ]
 
-# Create screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Guitar Tuning Application")
-
 # Font
-font = pygame.font.SysFont("Arial", 24)
-large_font = pygame.font.SysFont("Arial", 36)
+FONT_NAME = "Arial"
 
 # Function to draw guitar strings
-def draw_strings(selected_string=None, frequency=None):
+def draw_strings(screen, selected_string=None, frequency=None):
     for i, string in enumerate(strings):
         y_pos = 100 + i * 80
 
@@ -53,12 +53,12 @@ def draw_strings(selected_string=None, frequency=None):
         else:
             color = BLACK
 
-        text = font.render(string["name"], True, color)
+        text = render_text(string["name"], 24, color, FONT_NAME)
         pygame.draw.line(screen, GRAY, (100, y_pos), (700, y_pos), 4)
         screen.blit(text, (50, y_pos - 15))
 
         if selected_string == i and frequency:
-            freq_text = large_font.render(f"Freq: {frequency:.2f} Hz", True, color)
+            freq_text = render_text(f"Freq: {frequency:.2f} Hz", 36, color, FONT_NAME)
             screen.blit(freq_text, (300, y_pos - 25))
 
 # Function to calculate the dominant frequency from audio data
@@ -97,29 +97,79 @@ def audio_callback(indata, frames, time, status):
     detected_frequency = get_frequency(mono_data, samplerate)
     selected_string = match_string(detected_frequency)
 
-# Initialize audio stream
 detected_frequency = None
 selected_string = None
 samplerate = 44100
-stream = sd.InputStream(callback=audio_callback, channels=1, samplerate=samplerate)
-stream.start()
 
-# Main loop
-running = True
-while running:
-    screen.fill(WHITE)
 
-    # Draw guitar strings
-    draw_strings(selected_string, detected_frequency)
+class TunerApp(App):
+    name = 'app_8'
+    home_button_radius = 50
+
+    def __init__(self, screen, camera_manager):
+        super().__init__(screen, camera_manager)
+        self.stream = None
+        # Bottom left, clear of the string labels
+        self.home_button_center = (100, screen.get_height() - 100)
+
+    def on_enter(self):
+        pygame.display.set_caption("Guitar Tuning Application")
+
+        # Imported here so the tuning helpers can be used without an audio device
+        import sounddevice as sd
+
+        # The microphone is only open while the tuner is on screen
+        self.stream = sd.InputStream(callback=audio_callback, channels=1, samplerate=samplerate)
+        self.stream.start()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if math.dist(event.pos, self.home_button_center) <= self.home_button_radius:
+                self.go_home()
+
+    def update(self, dt, hands):
+        # Any index finger tip on the home button returns to the home screen
+        if any(math.dist(hand.cursor, self.home_button_center) <= self.home_button_radius for hand in hands):
+            self.go_home()
+
+    def go_home(self):
+        play_sound('audio/back.wav')
+        # The main loop calls on_exit next, which closes the microphone
+        self.close()
+
+    def on_exit(self):
+        # Stop audio stream; also runs when the app is suspended
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def on_destroy(self):
+        self.on_exit()
+
+    def draw(self, screen):
+        screen.fill(WHITE)
+
+        # Draw guitar strings
+        draw_strings(screen, selected_string, detected_frequency)
+
+        # Draw home button
+        pygame.draw.circle(screen, NAVY_BLUE, self.home_button_center, self.home_button_radius)
+        pygame.draw.circle(screen, LIGHT_BLUE, self.home_button_center, self.home_button_radius, 5)
+        text_surface = render_text('Home', 36, WHITE)
+        screen.blit(text_surface, text_surface.get_rect(center=self.home_button_center))
+        return None
+
+
+def run(screen=None, camera_manager=None):
+    if screen is None:
+        # Create screen
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    # Runs in the shared main loop until the window is closed
+    from features.home.home_screen import run_main_loop
+    run_main_loop(screen, camera_manager, TunerApp(screen, camera_manager))
 
-    pygame.display.flip()
 
-# Stop audio stream and quit pygame
-stream.stop()
-stream.close()
-pygame.quit()
-sys.exit()
\ No newline at end of file
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,72 @@
+import pygame
+
+from apps.app_3 import app_3
+from apps.app_4 import app_4
+from benchmarks.harness import benchmark
+
+
+def invader_grid(rows=5, columns=11, size=(36, 24), gap=15):
+    image = pygame.Surface(size)
+    return [(pygame.Rect(col * (size[0] + gap) + 150, row * (size[1] + gap) + 50, *size), image)
+            for row in range(rows) for col in range(columns)]
+
+
+@benchmark('app_3.space_invaders.step')
+def space_invaders_step():
+    screen_size = app_3.SCREEN_SIZE
+    state = {}
+
+    def reset():
+        state['invaders'] = invader_grid()
+        state['direction'] = 1
+        state['speed_x'] = 3
+
+    reset()
+
+    def step():
+        invaders = state['invaders']
+        bullets = [pygame.Rect(x, screen_size[1] // 2, 5, 10) for x in range(100, screen_size[0], 160)]
+        state['direction'], moved_down = app_3.move_invaders(invaders, state['speed_x'], state['direction'],
+                                                             20, screen_size[0])
+        if moved_down:
+            state['speed_x'] *= 1.07
+        app_3.resolve_bullet_hits(bullets, invaders)
+        if not invaders or any(invader.bottom >= screen_size[1] for invader, _ in invaders):
+            reset()
+    return step
+
+
+def breakout_step(step_ball, screen_size, create_bricks):
+    paddle = pygame.Rect(screen_size[0] // 2 - 75, screen_size[1] - 50, 150, 20)
+    state = {'ball': pygame.Rect(screen_size[0] // 2, screen_size[1] // 2, 20, 20),
+             'bricks': create_bricks(), 'dx': 7, 'dy': -7}
+
+    def step():
+        result = step_ball(state['ball'], paddle, state['bricks'], state['dx'], state['dy'])
+        state['dx'], state['dy'] = result[0], result[1]
+        lost = result[2] if isinstance(result[2], bool) else 'lost' in result[2]
+        # Keep the paddle under the ball so the game does not end
+        paddle.centerx = state['ball'].centerx
+        if lost or not state['bricks']:
+            state['ball'] = pygame.Rect(screen_size[0] // 2, screen_size[1] // 2, 20, 20)
+            state['bricks'] = create_bricks()
+            state['dx'], state['dy'] = 7, -7
+    return step
+
+
+@benchmark('app_4.breakout.step')
+def app_4_breakout_step():
+    return breakout_step(app_4.step_ball, app_4.SCREEN_SIZE, app_4.create_bricks)
+
+
+@benchmark('app_3.brick_breaker.step')
+def app_3_brick_breaker_step():
+    screen_size = app_3.SCREEN_SIZE
+
+    def create_bricks():
+        return [pygame.Rect(col * 125, row * 30 + 50, 120, 25)
+                for row in range(5) for col in range(screen_size[0] // 125)]
+
+    def step_ball(ball, paddle, bricks, dx, dy):
+        return app_3.step_ball(ball, paddle, bricks, dx, dy, screen_size)
+    return breakout_step(step_ball, screen_size, create_bricks)
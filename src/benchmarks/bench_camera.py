@@ -0,0 +1,177 @@
+import contextlib
+import io
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from benchmarks.harness import benchmark
+from core.camera.camera_manager import CameraManager
+from core.camera.frame_sources import ImageDirectorySource, LandmarkRecorder, LandmarkStreamSource
+from core.camera.hand_tracking import HandAssociator
+from core.camera.landmark_filter import OneEuroFilter
+from core.camera.projection import DisplayProjection, apply_homography
+
+# Real hand inference needs camera frames with hands in them, e.g. frames
+# saved from the table camera; point BENCH_HAND_FRAMES at their directory to
+# include the camera.inference benchmarks
+HAND_FRAMES_DIR = os.environ.get('BENCH_HAND_FRAMES')
+
+
+def synthetic_source(num_frames=300, num_hands=1, frame_size=(1920, 1080)):
+    """A replay of hands drifting over the table, recorded to a temporary file."""
+    rng = np.random.default_rng(0)
+    base = rng.uniform((400, 200), (1500, 900), size=(num_hands, 1, 2))
+    offsets = rng.normal(0, 40, size=(num_hands, 21, 2))
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = LandmarkRecorder(os.path.join(directory, 'synthetic.npz'), num_hands, frame_size)
+        for i in range(num_frames):
+            drift = np.array([np.sin(i / 20.0), np.cos(i / 25.0)]) * 150
+            recorder.record(i / 30.0, (base + offsets + drift).astype(np.float32))
+        # Keeps the "Saved N landmark frames" line out of the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            recorder.save()
+        # The source reads the whole recording up front
+        return LandmarkStreamSource(recorder.path)
+
+
+def replay_camera_manager(landmark_filter=None, num_hands=1):
+    source = synthetic_source(num_hands=num_hands)
+    camera_manager = CameraManager('./M.npy', 1920, 1080, source=source, landmark_filter=landmark_filter,
+                                   max_num_hands=max(num_hands, 1))
+    camera_manager.update()
+    return camera_manager
+
+
+@benchmark('camera.get_transformed_landmarks.cached')
+def cached_landmarks():
+    # Repeated calls within one captured frame
+    camera_manager = replay_camera_manager()
+    return camera_manager.get_transformed_landmarks
+
+
+@benchmark('camera.update_and_project')
+def update_and_project():
+    camera_manager = replay_camera_manager()
+
+    def step():
+        camera_manager.update()
+        camera_manager.get_transformed_landmarks()
+    return step
+
+
+@benchmark('camera.update_and_project.one_euro')
+def update_and_project_filtered():
+    camera_manager = replay_camera_manager(OneEuroFilter())
+
+    def step():
+        camera_manager.update()
+        camera_manager.get_transformed_landmarks()
+    return step
+
+
+@benchmark('camera.projection.apply_homography')
+def projection_apply_homography():
+    # Two hands through the raw matrix, converting it every call
+    M = np.load('./M.npy')
+    points = np.random.default_rng(3).uniform(0, 1000, size=(2, 21, 2)).astype(np.float32)
+    out = np.empty_like(points)
+    return lambda: apply_homography(points, M, out=out)
+
+
+@benchmark('camera.projection.display_projection')
+def projection_display_projection():
+    # The same with the terms precomputed per display
+    projection = DisplayProjection(np.load('./M.npy'), (1920, 1080))
+    points = np.random.default_rng(3).uniform(0, 1000, size=(2, 21, 2)).astype(np.float32)
+    out = np.empty_like(points)
+    return lambda: projection.to_display(points, out=out)
+
+
+@benchmark('camera.projection.lens_model')
+def projection_lens_model():
+    # Undistortion and projection in one call, for a wide-angle lens
+    camera_matrix = np.array([[1000, 0, 960], [0, 1000, 540], [0, 0, 1]], dtype=np.float64)
+    projection = DisplayProjection(np.load('./M.npy'), (1920, 1080), camera_matrix, [-0.3, 0.1, 0, 0, 0])
+    points = np.random.default_rng(3).uniform(0, 1000, size=(2, 21, 2)).astype(np.float32)
+    out = np.empty_like(points)
+    return lambda: projection.to_display(points, out=out)
+
+
+def camera_frame():
+    return np.random.default_rng(4).integers(0, 256, size=(1080, 1920, 3), dtype=np.uint8)
+
+
+@benchmark('camera.projector_frame.warp_perspective')
+def projector_frame_warp_perspective():
+    # What app_2 used to do per scan
+    M = np.load('./M.npy')
+    frame = camera_frame()
+    return lambda: cv2.warpPerspective(frame, M, (1920, 1080))
+
+
+@benchmark('camera.projector_frame.remap')
+def projector_frame_remap():
+    # Remap tables built once, into a reused buffer
+    projection = DisplayProjection(np.load('./M.npy'), (1920, 1080))
+    frame = camera_frame()
+    out = np.empty_like(frame)
+    projection.frame_maps((1920, 1080))
+    return lambda: projection.warp_frame(frame, out=out)
+
+
+@benchmark('camera.projector_frame.preview')
+def projector_frame_preview():
+    # A quarter-size preview straight from the camera frame
+    projection = DisplayProjection(np.load('./M.npy'), (1920, 1080))
+    frame = camera_frame()
+    out = np.empty((270, 480, 3), dtype=np.uint8)
+    projection.frame_maps((480, 270))
+    return lambda: projection.warp_frame(frame, (480, 270), out=out)
+
+
+def hand_association(num_hands):
+    def setup():
+        source = synthetic_source(num_hands=num_hands)
+        frames = [source.read_landmarks()[2] for _ in range(len(source.timestamps))]
+        associator = HandAssociator(num_hands)
+        index = [0]
+
+        def associate():
+            i = index[0] = (index[0] + 1) % len(frames)
+            return associator.update(frames[i])
+        return associate
+    return setup
+
+
+def hands_pipeline(num_hands):
+    # Association, projection and One-Euro filtering of every hand
+    def setup():
+        camera_manager = replay_camera_manager(OneEuroFilter(), num_hands)
+
+        def step():
+            camera_manager.update()
+            camera_manager.get_transformed_landmarks()
+        return step
+    return setup
+
+
+def hands_inference(num_hands):
+    # MediaPipe plus everything after it, tracking up to `num_hands` hands
+    def setup():
+        camera_manager = CameraManager('./M.npy', 1920, 1080, landmark_filter=OneEuroFilter(),
+                                       source=ImageDirectorySource(HAND_FRAMES_DIR), max_num_hands=num_hands)
+
+        def step():
+            camera_manager.update()
+            camera_manager.get_transformed_landmarks()
+        return step
+    return setup
+
+
+for hand_count in range(1, 5):
+    benchmark(f'camera.associate.{hand_count}_hands')(hand_association(hand_count))
+    benchmark(f'camera.pipeline.{hand_count}_hands')(hands_pipeline(hand_count))
+    if HAND_FRAMES_DIR:
+        benchmark(f'camera.inference.{hand_count}_hands')(hands_inference(hand_count))
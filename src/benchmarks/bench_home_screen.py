@@ -0,0 +1,106 @@
+import numpy as np
+import pygame
+
+from benchmarks.harness import benchmark
+from core.data.constants import SCREEN_SIZE
+from core.apps.registry import AppRegistry
+from core.input.hit_test import HitTestGrid
+from core.input.gestures import GestureEngine
+from features.home.home_screen import create_circles, register_circles, update_hover_state
+from widgets.app_circle import AppCircle
+
+
+def random_points(count=1024, seed=0):
+    rng = np.random.default_rng(seed)
+    return [tuple(p) for p in rng.integers((0, 0), SCREEN_SIZE, size=(count, 2))]
+
+
+def open_circles():
+    circles = create_circles(AppRegistry().available())
+    for circle in circles:
+        circle.visible = True
+        circle.center = circle.final_pos
+    return circles
+
+
+@benchmark('widgets.app_circle.draw')
+def app_circle_draw():
+    screen = pygame.display.get_surface()
+    circles = [AppCircle(circle.final_pos, circle.radius, circle.app_index, circle.final_pos, circle.is_main,
+                         image_path=circle.image_path, text=circle.text)
+               for circle in open_circles()]
+    for circle in circles:
+        circle.visible = True
+        circle.is_hovered_flag = True
+        circle.hover_time = 1.0
+
+    def draw():
+        for circle in circles:
+            circle.draw(screen)
+    return draw
+
+
+@benchmark('widgets.app_circle.is_hovered')
+def app_circle_is_hovered():
+    circle = AppCircle((960, 540), 75, 1, (960, 540))
+    points = random_points()
+    index = [0]
+
+    def hovered():
+        index[0] = (index[0] + 1) % len(points)
+        return circle.is_hovered(points[index[0]])
+    return hovered
+
+
+def random_hands(count=1024, hands=1, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform((0, 0), SCREEN_SIZE, size=(count, hands, 21, 2)).astype(np.float32)
+
+
+@benchmark('home.hover_and_pinch')
+def hover_and_pinch():
+    circles = open_circles()
+    hits = HitTestGrid(*SCREEN_SIZE)
+    gestures = GestureEngine()
+    frames = random_hands()
+    index = [0]
+
+    def step():
+        i = index[0] = (index[0] + 1) % len(frames)
+        for circle in circles:
+            circle.is_hovered_flag = False
+        register_circles(hits, circles)
+        update_hover_state(circles, hits.query(frames[i][0][8]))
+        return gestures.update(frames[i])
+    return step
+
+
+@benchmark('input.gestures.update')
+def gestures_update():
+    # Four hands whose pinches open and close every few frames
+    gestures = GestureEngine()
+    frames = random_hands(hands=4)
+    closed = np.arange(len(frames)) // 3 % 2 == 0
+    frames[closed, :, 4] = frames[closed, :, 8] + 10
+    index = [0]
+
+    def update():
+        i = index[0] = (index[0] + 1) % len(frames)
+        return gestures.update(frames[i])
+    return update
+
+
+@benchmark('input.hit_test.query_many')
+def hit_test_query_many():
+    # Four fingertips against a calendar-sized set of widgets
+    hits = HitTestGrid(*SCREEN_SIZE)
+    rng = np.random.default_rng(2)
+    for key, (x, y) in enumerate(rng.integers((0, 0), SCREEN_SIZE, size=(64, 2))):
+        hits.add_circle(key, (int(x), int(y)), 40)
+    points = np.array(random_points(), dtype=np.float64)
+    index = [0]
+
+    def query():
+        i = index[0] = (index[0] + 4) % (len(points) - 4)
+        return hits.query_many(points[i:i + 4])
+    return query
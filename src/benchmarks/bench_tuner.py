@@ -0,0 +1,17 @@
+import numpy as np
+
+from apps.app_8 import app_8
+from benchmarks.harness import benchmark
+
+
+@benchmark('app_8.get_frequency')
+def get_frequency():
+    # One audio callback block of an A string with a little noise
+    samplerate = app_8.samplerate
+    t = np.arange(2048) / samplerate
+    rng = np.random.default_rng(0)
+    block = np.sin(2 * np.pi * 110.0 * t) + rng.normal(0, 0.05, t.shape)
+
+    def frequency():
+        return app_8.match_string(app_8.get_frequency(block, samplerate))
+    return frequency
@@ -0,0 +1,103 @@
+import json
+import time
+
+import numpy as np
+
+# name -> setup function returning the callable to measure
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Registers a setup function; it returns the zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def measure(func, min_time=0.5, target_batch_time=0.002):
+    """
+    Times `func` in batches sized so one batch takes about
+    `target_batch_time`, until `min_time` seconds have been spent. Per-call
+    latency percentiles are computed from the batch averages.
+    """
+    # Warm up and size the batches
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_batch_time or batch >= 1 << 20:
+            break
+        batch *= 2
+
+    per_call = []
+    calls = 0
+    total = 0.0
+    while total < min_time:
+        start = time.perf_counter()
+        for _ in range(batch):
+            func()
+        elapsed = time.perf_counter() - start
+        per_call.append(elapsed / batch)
+        calls += batch
+        total += elapsed
+
+    per_call_us = np.array(per_call) * 1e6
+    return {
+        'calls': calls,
+        'calls_per_second': calls / total,
+        'mean_us': float(per_call_us.mean()),
+        'p50_us': float(np.percentile(per_call_us, 50)),
+        'p95_us': float(np.percentile(per_call_us, 95)),
+    }
+
+
+def run_benchmarks(name_filter=None, min_time=0.5):
+    results = {}
+    for name in sorted(BENCHMARKS):
+        if name_filter and name_filter not in name:
+            continue
+        func = BENCHMARKS[name]()
+        results[name] = measure(func, min_time=min_time)
+        print_result(name, results[name])
+    return results
+
+
+def print_result(name, result):
+    print(f"{name:<40}{result['calls_per_second']:>14,.0f}/s"
+          f"{result['p50_us']:>12.2f} us p50{result['p95_us']:>12.2f} us p95")
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved benchmark results to {path}")
+
+
+def compare_results(baseline_path, current_path, threshold=0.10):
+    """
+    Prints the p50 change per benchmark between two result files. Returns
+    the names that got slower by more than `threshold` (fraction).
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+
+    regressions = []
+    print(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:<40}{'only in ' + ('current' if name in current else 'baseline'):>34}")
+            continue
+        before = baseline[name]['p50_us']
+        after = current[name]['p50_us']
+        change = (after - before) / before if before else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<40}{before:>10.2f}us{after:>10.2f}us{change:>+10.1%}{flag}")
+    return regressions
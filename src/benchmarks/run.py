@@ -0,0 +1,51 @@
+"""
+Runs the hot-path benchmarks against synthetic inputs without a camera or
+display. From the src directory:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json
+    python -m benchmarks.run --compare before.json after.json
+"""
+import argparse
+import os
+import sys
+
+# No window, no audio device needed
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Holomat hot-path benchmarks')
+    parser.add_argument('--filter', default=None, help='Only run benchmarks whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Seconds to spend per benchmark')
+    parser.add_argument('--output', default=None, help='Write results to this JSON file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two result files instead of running')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Slowdown (fraction of p50) reported as a regression')
+    args = parser.parse_args()
+
+    # Relative asset paths (M.npy, app icons) are resolved from src/
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from benchmarks.harness import run_benchmarks, save_results, compare_results
+
+    if args.compare:
+        regressions = compare_results(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1920, 1080))
+
+    # Importing registers the benchmarks
+    from benchmarks import bench_camera, bench_home_screen, bench_arcade, bench_tuner
+
+    results = run_benchmarks(args.filter, args.min_time)
+    if args.output:
+        save_results(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
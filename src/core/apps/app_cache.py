@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+from core.data.constants import DEFAULT_APP_MEMORY_MB
+
+
+class SuspendedApps:
+    """
+    Apps that were left for the home screen, kept alive with their state
+    and loaded assets so reopening one is instant.
+
+    Each app is charged the memory its manifest declares
+    (`memory_budget_mb`). When the total exceeds `budget_mb` the least
+    recently used apps are destroyed until it fits again; an app larger
+    than the whole budget is never kept.
+    """
+
+    def __init__(self, budget_mb):
+        self.budget_mb = budget_mb
+        self._apps = OrderedDict()
+
+    def __contains__(self, index):
+        return index in self._apps
+
+    def __len__(self):
+        return len(self._apps)
+
+    @property
+    def used_mb(self):
+        return sum(size for _, size in self._apps.values())
+
+    def suspend(self, index, app, memory_mb=None):
+        size = DEFAULT_APP_MEMORY_MB if memory_mb is None else memory_mb
+        self._apps.pop(index, None)
+        self._apps[index] = (app, size)
+        while self._apps and self.used_mb > self.budget_mb:
+            self.evict()
+
+    def resume(self, index):
+        """Takes the suspended app out of the cache, or returns None."""
+        entry = self._apps.pop(index, None)
+        return entry[0] if entry is not None else None
+
+    def evict(self, index=None):
+        """Destroys `index`, or the least recently used app."""
+        if index is None:
+            index = next(iter(self._apps))
+        app, size = self._apps.pop(index)
+        print(f"Evicting app {index} ({size} MB, {self.used_mb} of {self.budget_mb} MB still in use)")
+        app.on_destroy()
+
+    def clear(self):
+        while self._apps:
+            self.evict()
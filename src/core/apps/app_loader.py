@@ -0,0 +1,136 @@
+import importlib
+import threading
+import time
+import traceback
+
+from core.apps.registry import PRELOAD_IDLE, PRELOAD_STARTUP
+from core.instrumentation.timing import timings
+
+UNLOADED, LOADING, READY, FAILED = 'unloaded', 'loading', 'ready', 'failed'
+
+
+class AppLoader:
+    """
+    Imports app modules off the render thread and caches them.
+
+    `request(index)` starts importing an app in the background and `get`
+    returns the module once it is ready, so the home screen can show a
+    loading state instead of freezing. `warm_up(indices)` queues apps to be
+    imported ahead of time, but only while `set_idle(True)` says the home
+    screen has nothing better to do. Import time (which includes the
+    module's own setup such as loading models) is recorded per app as the
+    `app_N.import` timing stage.
+
+    Only the registry's available apps are ever imported.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.apps = {manifest.index: manifest for manifest in registry.available()}
+        self.modules = {}
+        self.errors = {}
+        self.load_times = {}
+        self._status = {index: UNLOADED for index in self.apps}
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._warm_queue = []
+        self._warm_thread = None
+
+    def status(self, index):
+        with self._lock:
+            return self._status.get(index, FAILED)
+
+    def get(self, index):
+        """The imported module, or None while it is not loaded (yet)."""
+        return self.modules.get(index)
+
+    def entry(self, index):
+        """The app's App class, or None while it is not loaded (or failed to)."""
+        module = self.modules.get(index)
+        return getattr(module, self.apps[index].entry, None) if module is not None else None
+
+    def request(self, index):
+        """Starts loading `index` in the background unless already done."""
+        with self._lock:
+            if self._status.get(index) != UNLOADED:
+                return
+            self._status[index] = LOADING
+        threading.Thread(target=self._load, args=(index,), name=f'load-app-{index}', daemon=True).start()
+
+    def load(self, index):
+        """Loads `index` on the calling thread. Returns the module or None."""
+        with self._lock:
+            status = self._status.get(index)
+            if status == UNLOADED:
+                self._status[index] = LOADING
+        if status == UNLOADED:
+            self._load(index)
+        else:
+            # Already being loaded elsewhere; wait for it
+            while self.status(index) == LOADING:
+                time.sleep(0.01)
+        return self.get(index)
+
+    def _load(self, index):
+        info = self.apps[index]
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(info.module)
+            # A module without its entry point would only fail when opened
+            if not callable(getattr(module, info.entry, None)):
+                raise AttributeError(f"{info.module} has no entry point '{info.entry}'")
+        except Exception as e:
+            print(f"Failed to load app {index} ({info.module}): {e}")
+            traceback.print_exc()
+            self.errors[index] = e
+            status = FAILED
+        else:
+            self.modules[index] = module
+            status = READY
+        elapsed = time.perf_counter() - start
+        self.load_times[index] = elapsed
+        timings.record(f'app_{index}.import', elapsed)
+        print(f"Loaded app {index} in {elapsed * 1000:.0f} ms" if status == READY else
+              f"App {index} failed after {elapsed * 1000:.0f} ms")
+        with self._lock:
+            self._status[index] = status
+
+    def set_idle(self, idle):
+        if idle:
+            self._idle.set()
+        else:
+            self._idle.clear()
+
+    def preload(self):
+        """Applies the manifests' preload policies."""
+        for index in self.registry.with_preload(PRELOAD_STARTUP):
+            self.request(index)
+        self.warm_up(self.registry.with_preload(PRELOAD_IDLE))
+
+    def warm_up(self, indices):
+        """Queues apps to be imported in the background whenever idle."""
+        with self._lock:
+            self._warm_queue.extend(index for index in indices if index in self.apps)
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(target=self._warm_loop, name='app-warm-up', daemon=True)
+                self._warm_thread.start()
+
+    def _warm_loop(self):
+        while True:
+            self._idle.wait()
+            with self._lock:
+                if not self._warm_queue:
+                    self._warm_thread = None
+                    return
+                index = self._warm_queue.pop(0)
+                if self._status.get(index) != UNLOADED:
+                    continue
+                self._status[index] = LOADING
+            self._load(index)
+
+    def report(self):
+        for index in self.apps:
+            status = self.status(index)
+            load_time = self.load_times.get(index)
+            timing = f'{load_time * 1000:8.0f} ms' if load_time is not None else ' ' * 11
+            print(f"app_{index:<3} {status:<9} {timing}")
@@ -0,0 +1,73 @@
+class App:
+    """
+    Base class for apps driven by the home screen's main loop
+    (features.home.home_screen.run_main_loop).
+
+    The loop owns the camera, event pumping, frame pacing and timing; an app
+    only reacts to its lifecycle calls:
+
+    - `on_enter()` when it becomes the active app (again)
+    - `handle_event(event)` for every pygame event except QUIT
+    - `handle_gesture(event)` for every pinch start, move and end and every
+      dwell of any hand (core.input.gestures.GestureEvent), before `update`
+    - `update(dt, hands)` once per frame with the seconds since the last
+      frame and every tracked hand (core.camera.hand_tracking.TrackedHand),
+      ordered by hand id
+    - `draw(surface)` once per frame; returns the dirty rects to push to the
+      display, or None to flip the whole screen
+    - `on_exit()` when it stops being the active app
+    - `on_destroy()` when a suspended app is dropped for good
+
+    An app that closes back to the home screen is suspended, not destroyed
+    (see core.apps.app_cache): reopening it calls `on_enter()` on the same
+    instance, so state and assets survive. Release what must not stay open
+    in the background (devices, streams) in `on_exit()`.
+
+    `open(app)` shows another app on top of this one, `close()` returns to
+    the app below and `close(next_app)` replaces this app with another.
+    """
+
+    # Prefix of the app's timing stages
+    name = 'app'
+    # Frame rate while this app is active, None for the main loop's default
+    target_fps = None
+
+    def __init__(self, screen, camera_manager):
+        self.screen = screen
+        self.camera_manager = camera_manager
+        self.closed = False
+        self.next_app = None
+        self.opened_app = None
+
+    def on_enter(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def handle_gesture(self, event):
+        pass
+
+    def update(self, dt, hands):
+        pass
+
+    def draw(self, surface):
+        return None
+
+    def on_exit(self):
+        pass
+
+    def on_destroy(self):
+        pass
+
+    def reopen(self):
+        # Lets a closed app be shown again
+        self.closed = False
+        self.next_app = None
+
+    def open(self, app):
+        self.opened_app = app
+
+    def close(self, next_app=None):
+        self.closed = True
+        self.next_app = next_app
@@ -0,0 +1,146 @@
+import ast
+import importlib.util
+import json
+import os
+import re
+from collections import namedtuple
+
+# Everything the home screen needs to know about an app without importing
+# it, read from apps/app_N/manifest.json. `index` is the N of the folder
+# (voice commands refer to apps by it), `module`/`entry` come from the
+# manifest's "module:AppClass" entry point and `missing` lists heavy
+# dependencies that are not installed.
+AppManifest = namedtuple('AppManifest', [
+    'index', 'name', 'module', 'entry', 'path', 'icon', 'order',
+    'heavy_dependencies', 'preload', 'memory_budget_mb', 'missing'
+])
+
+MANIFEST_NAME = 'manifest.json'
+APP_DIR_PATTERN = re.compile(r'^app_(\d+)$')
+
+# When an app is imported: as soon as the home screen starts, while the
+# home screen is idle, or only when it is opened
+PRELOAD_STARTUP, PRELOAD_IDLE, PRELOAD_ON_DEMAND = 'startup', 'idle', 'on_demand'
+PRELOAD_POLICIES = (PRELOAD_STARTUP, PRELOAD_IDLE, PRELOAD_ON_DEMAND)
+
+
+def _module_path(apps_dir, module):
+    # apps.app_1.app_1 -> <apps_dir>/app_1/app_1.py
+    parts = module.split('.')
+    return os.path.join(apps_dir, *parts[1:]) + '.py'
+
+
+def _is_installed(dependency):
+    # Only the top level package is looked up, which does not import it
+    try:
+        return importlib.util.find_spec(dependency.split('.')[0]) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _defines(path, name):
+    # Whether the module at `path` defines `name` at top level, read without
+    # importing it (which could take seconds for apps that load models)
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return False
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name == name:
+            return True
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == name
+                                                for target in node.targets):
+            return True
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and any((alias.asname or alias.name) == name
+                                                                  for alias in node.names):
+            return True
+    return False
+
+
+def load_manifest(app_dir, index):
+    with open(os.path.join(app_dir, MANIFEST_NAME)) as f:
+        data = json.load(f)
+
+    module, _, entry = data['entry_point'].partition(':')
+    preload = data.get('preload', PRELOAD_IDLE)
+    if preload not in PRELOAD_POLICIES:
+        raise ValueError(f"Unknown preload policy '{preload}'")
+    icon = data.get('icon')
+    dependencies = data.get('heavy_dependencies', [])
+    return AppManifest(
+        index=index,
+        name=data.get('name', f'App {index}'),
+        module=module,
+        entry=entry or 'run',
+        path=_module_path(os.path.dirname(app_dir), module),
+        icon=os.path.join(app_dir, icon) if icon else None,
+        order=data.get('order', index),
+        heavy_dependencies=dependencies,
+        preload=preload,
+        memory_budget_mb=data.get('memory_budget_mb'),
+        missing=[dependency for dependency in dependencies if not _is_installed(dependency)]
+    )
+
+
+class AppRegistry:
+    """
+    The installed apps, read from their manifests. Nothing is imported:
+    an app is available when its entry module exists, defines the entry
+    point and its heavy dependencies are installed, so the home screen only
+    shows (and only ever imports) apps that can actually start.
+    """
+
+    def __init__(self, apps_dir='./apps'):
+        self.apps_dir = apps_dir
+        self.manifests = {}
+        self.errors = {}
+        # Whether each app's module defines its entry point, checked once
+        self._entry_found = {}
+        if os.path.isdir(apps_dir):
+            for name in sorted(os.listdir(apps_dir)):
+                match = APP_DIR_PATTERN.match(name)
+                app_dir = os.path.join(apps_dir, name)
+                if not match or not os.path.exists(os.path.join(app_dir, MANIFEST_NAME)):
+                    continue
+                index = int(match.group(1))
+                try:
+                    self.manifests[index] = load_manifest(app_dir, index)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Invalid manifest for {name}: {e}")
+                    self.errors[index] = e
+
+    def get(self, index):
+        return self.manifests.get(index)
+
+    def is_available(self, index):
+        manifest = self.manifests.get(index)
+        return manifest is not None and not manifest.missing and self.has_entry(index)
+
+    def has_entry(self, index):
+        if index not in self._entry_found:
+            manifest = self.manifests[index]
+            self._entry_found[index] = _defines(manifest.path, manifest.entry)
+        return self._entry_found[index]
+
+    def available(self):
+        """Available apps in home screen order."""
+        return sorted((manifest for index, manifest in self.manifests.items() if self.is_available(index)),
+                      key=lambda manifest: (manifest.order, manifest.index))
+
+    def with_preload(self, policy):
+        return [manifest.index for manifest in self.available() if manifest.preload == policy]
+
+    def report(self):
+        for index, manifest in sorted(self.manifests.items()):
+            if self.is_available(index):
+                status = 'available'
+            elif manifest.missing:
+                status = f"missing {', '.join(manifest.missing)}"
+            elif not os.path.exists(manifest.path):
+                status = f'no module at {manifest.path}'
+            else:
+                status = f'no {manifest.entry} in {manifest.path}'
+            print(f"app_{index:<3} {manifest.name:<16} {manifest.preload:<10} {status}")
+        for index, error in sorted(self.errors.items()):
+            print(f"app_{index:<3} invalid manifest: {error}")
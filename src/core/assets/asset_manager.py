@@ -0,0 +1,142 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+# Sounds played on the same channel cut each other off, like the single
+# mixer.music stream they replace; different channels play together
+UI_CHANNEL = 0
+EFFECTS_CHANNEL = 1
+RESERVED_CHANNELS = 2
+
+
+class AssetManager:
+    """
+    Images and short sounds, decoded once and shared by the home screen,
+    widgets and apps.
+
+    Images are cached per (path, size), converted to the display format
+    once a display exists, and evicted least recently used when they take
+    more than `max_image_mb`. Sounds are decoded into mixer Sound objects
+    and played on reserved channels (`UI_CHANNEL` for clicks, `EFFECTS_CHANNEL`
+    for game effects), leaving mixer.music to the assistant's speech. A
+    sound that cannot be loaded is reported once and then stays silent.
+    """
+
+    def __init__(self, max_image_mb=256):
+        self.max_image_bytes = max_image_mb * 1024 * 1024
+        self.image_bytes = 0
+        self.sound_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images = OrderedDict()
+        self._sounds = {}
+        self._channels = None
+
+    def image(self, path, size=None):
+        """The image at `path`, scaled to `size` if given."""
+        key = (os.path.normpath(path), size)
+        surface = self._images.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = pygame.image.load(path)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        if pygame.display.get_surface() is not None:
+            # Display-format surfaces blit faster
+            surface = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+        self._images[key] = surface
+        self.image_bytes += _surface_bytes(surface)
+        while self.image_bytes > self.max_image_bytes and len(self._images) > 1:
+            self._evict_image()
+        return surface
+
+    def scaled_image(self, path, scale):
+        """The image at `path` scaled by a factor."""
+        width, height = self.image(path).get_size()
+        return self.image(path, (int(width * scale), int(height * scale)))
+
+    def _evict_image(self):
+        _, surface = self._images.popitem(last=False)
+        self.image_bytes -= _surface_bytes(surface)
+        self.evictions += 1
+
+    def unload(self, prefix):
+        """Drops every cached image and sound whose path starts with `prefix`."""
+        prefix = os.path.normpath(prefix)
+        for key in [key for key in self._images if key[0].startswith(prefix)]:
+            self.image_bytes -= _surface_bytes(self._images.pop(key))
+        for path in [path for path in self._sounds if path.startswith(prefix)]:
+            sound = self._sounds.pop(path)
+            if sound is not None:
+                self.sound_bytes -= _sound_bytes(sound)
+
+    def sound(self, path):
+        """The decoded sound at `path`, or None if it cannot be played."""
+        path = os.path.normpath(path)
+        if path in self._sounds:
+            return self._sounds[path]
+        sound = None
+        if pygame.mixer.get_init():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Error loading sound {path}: {e}")
+            else:
+                self.sound_bytes += _sound_bytes(sound)
+        self._sounds[path] = sound
+        return sound
+
+    def preload_sounds(self, paths):
+        for path in paths:
+            self.sound(path)
+
+    def play_sound(self, path, channel=UI_CHANNEL):
+        sound = self.sound(path)
+        if sound is None:
+            return
+        if self._channels is None:
+            pygame.mixer.set_reserved(RESERVED_CHANNELS)
+            self._channels = [pygame.mixer.Channel(i) for i in range(RESERVED_CHANNELS)]
+        self._channels[channel].play(sound)
+
+    def memory_usage(self):
+        return {
+            'images': len(self._images),
+            'image_mb': self.image_bytes / (1024 * 1024),
+            'sounds': sum(sound is not None for sound in self._sounds.values()),
+            'sound_mb': self.sound_bytes / (1024 * 1024),
+        }
+
+    def stats(self):
+        total = self.hits + self.misses
+        stats = self.memory_usage()
+        stats.update(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                     hit_rate=self.hits / total if total else 0.0)
+        return stats
+
+
+def _surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _sound_bytes(sound):
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency * channels * abs(sample_format) // 8)
+
+
+# Shared by the home screen, widgets and all apps
+assets = AssetManager()
+
+
+def load_image(path, size=None):
+    return assets.image(path, size)
+
+
+def play_sound(path, channel=UI_CHANNEL):
+    assets.play_sound(path, channel)
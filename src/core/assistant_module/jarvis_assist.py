@@ -4,7 +4,6 @@ from openai import OpenAI
 import time
 from pygame import mixer
 import os
-from googlesearch import search
 
 from core.assistant_module import jarvis_tools
 from core.data import shared_variables
@@ -17,9 +16,19 @@ mixer.init()
 assistant_id = ""
 thread_id = ""
 
-# Retrieve the assistant and thread
-assistant = client.beta.assistants.retrieve(assistant_id)
-thread = client.beta.threads.retrieve(thread_id)
+_assistant_and_thread = None
+
+
+def get_assistant_and_thread():
+    """
+    Retrieves the assistant and thread on first use. These are network
+    calls, so they are not made at import time.
+    """
+    global _assistant_and_thread
+    if _assistant_and_thread is None:
+        _assistant_and_thread = (client.beta.assistants.retrieve(assistant_id),
+                                 client.beta.threads.retrieve(thread_id))
+    return _assistant_and_thread
 
 conversation_history = [
     {
@@ -55,6 +64,7 @@ for func_name in dir(jarvis_tools):
 
 
 def perform_web_search(query, num_results=3):
+    from googlesearch import search
     try:
         results = list(search(query, num_results=num_results, advanced=True))
         return [{'title': r.title, 'description': r.description, 'url': r.url} for r in results]
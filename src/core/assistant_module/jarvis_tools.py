@@ -1,10 +1,8 @@
 import pygame
-import python_weather
 import asyncio
 
 import features.home.home_screen as home_screen
 from core.assistant_module import jarvis_assist
-from icrawler.builtin import GoogleImageCrawler
 import os
 
 
@@ -23,12 +21,15 @@ def is_silent_mode():
 
 
 async def get_weather(city_name):
+    # Imported on use; only the weather command needs it
+    import python_weather
     async with python_weather.Client(unit=python_weather.IMPERIAL) as client:
         weather = await client.get(city_name)
         return weather
 
 
 def search(query):
+    from icrawler.builtin import GoogleImageCrawler
     google_crawler = GoogleImageCrawler(storage={"root_dir": r'./images'})
     google_crawler.crawl(keyword=query, max_num=1)
 
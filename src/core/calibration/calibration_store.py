@@ -0,0 +1,229 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from core.camera.projection import DisplayProjection
+from core.data.constants import CALIBRATION_DIR, DEFAULT_CALIBRATION, LEGACY_MATRIX_PATH
+
+
+class Calibration:
+    """
+    One version of a named camera to display calibration: the homography,
+    the display it maps onto and how it was made.
+
+    `camera_points` / `display_points` / `inliers` are the correspondences
+    it was solved from, when known. `fiducials` are where the drift
+    monitor's fiducials were seen in the camera (NaN for unseen ones) while
+    this calibration was fresh, the baseline later checks compare against.
+
+    `camera_matrix` / `dist_coeffs` are the camera's lens model, if it was
+    calibrated (see core.calibration.camera_intrinsics). The homography then
+    maps undistorted camera pixels; `camera_points` always stay as seen.
+    """
+
+    def __init__(self, name, version, matrix, display_size, source='manual', created=None, rms_error=None,
+                 camera_points=None, display_points=None, inliers=None, fiducials=None, camera_matrix=None,
+                 dist_coeffs=None):
+        self.name = name
+        self.version = version
+        self.matrix = np.asarray(matrix, dtype=np.float64)
+        self.display_size = tuple(int(v) for v in display_size)
+        self.source = source
+        self.created = time.time() if created is None else created
+        self.rms_error = rms_error
+        self.camera_points = camera_points
+        self.display_points = display_points
+        self.inliers = inliers
+        self.fiducials = fiducials
+        self.camera_matrix = camera_matrix
+        self.dist_coeffs = dist_coeffs
+
+    def projection(self, display_size=None):
+        """A DisplayProjection of this calibration, onto its own display size by default."""
+        return DisplayProjection(self.matrix, display_size or self.display_size, self.camera_matrix,
+                                 self.dist_coeffs)
+
+    def __repr__(self):
+        error = f', {self.rms_error:.2f} px' if self.rms_error is not None else ''
+        lens = ', lens model' if self.dist_coeffs is not None else ''
+        return f"Calibration({self.name!r} v{self.version}, {self.source}{error}{lens})"
+
+
+class CalibrationStore:
+    """
+    Versioned calibrations, several per installation (one per display, or
+    per camera if there are more).
+
+    Every save of a name adds a version and makes it current; older
+    versions stay on disk so a bad calibration can be rolled back with
+    `set_current()`. `index.json` in `directory` lists names, versions and
+    their metadata; each version's arrays live in `<name>.v<version>.npz`.
+    Safe to use from the drift monitor's worker thread.
+    """
+
+    def __init__(self, directory=CALIBRATION_DIR):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._index = self._read_index()
+        self._projections = {}
+
+    def _index_path(self):
+        return os.path.join(self.directory, 'index.json')
+
+    def _read_index(self):
+        try:
+            with open(self._index_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so a crash never leaves a half-written index
+        temp_path = self._index_path() + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self._index, f, indent=2)
+        os.replace(temp_path, self._index_path())
+
+    def names(self):
+        return sorted(self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def versions(self, name):
+        """Metadata of every version of `name`, oldest first."""
+        entry = self._entry(name)
+        return [dict(entry['versions'][key], version=int(key)) for key in sorted(entry['versions'], key=int)]
+
+    def current_version(self, name):
+        return self._entry(name)['current']
+
+    def _entry(self, name):
+        if name not in self._index:
+            raise KeyError(f"No calibration named '{name}' in {self.directory}")
+        return self._index[name]
+
+    def load(self, name, version=None):
+        """The current version of `name`, or the given one."""
+        with self._lock:
+            entry = self._entry(name)
+            version = entry['current'] if version is None else version
+            meta = entry['versions'].get(str(version))
+            if meta is None:
+                raise KeyError(f"Calibration '{name}' has no version {version}")
+            with np.load(os.path.join(self.directory, meta['file'])) as data:
+                arrays = {key: data[key] for key in data.files}
+        return Calibration(name, version, arrays['matrix'], meta['display_size'], meta['source'], meta['created'],
+                           meta.get('rms_error'), arrays.get('camera_points'), arrays.get('display_points'),
+                           arrays.get('inliers'), arrays.get('fiducials'), arrays.get('camera_matrix'),
+                           arrays.get('dist_coeffs'))
+
+    def save(self, name, matrix, display_size, source='manual', rms_error=None, camera_points=None,
+             display_points=None, inliers=None, fiducials=None, camera_matrix=None, dist_coeffs=None,
+             make_current=True):
+        """Stores a new version of `name`, makes it current (unless told not to) and returns it."""
+        with self._lock:
+            entry = self._index.setdefault(name, {'current': 0, 'versions': {}})
+            version = max((int(key) for key in entry['versions']), default=0) + 1
+            calibration = Calibration(name, version, matrix, display_size, source, None, rms_error,
+                                      camera_points, display_points, inliers, fiducials, camera_matrix,
+                                      dist_coeffs)
+            file_name = self._write_arrays(calibration)
+            entry['versions'][str(version)] = {
+                'file': file_name,
+                'display_size': list(calibration.display_size),
+                'source': source,
+                'created': calibration.created,
+                'rms_error': rms_error,
+                'lens_model': dist_coeffs is not None,
+            }
+            if make_current:
+                entry['current'] = version
+            self._write_index()
+        print(f"Saved {calibration}")
+        return calibration
+
+    def _write_arrays(self, calibration):
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = f'{calibration.name}.v{calibration.version}.npz'
+        arrays = {'matrix': calibration.matrix}
+        for key in ('camera_points', 'display_points', 'inliers', 'fiducials', 'camera_matrix', 'dist_coeffs'):
+            value = getattr(calibration, key)
+            if value is not None:
+                arrays[key] = np.asarray(value)
+        np.savez(os.path.join(self.directory, file_name), **arrays)
+        return file_name
+
+    def set_fiducials(self, calibration, fiducials):
+        """Records the drift monitor's baseline for an existing version."""
+        with self._lock:
+            calibration.fiducials = fiducials
+            self._write_arrays(calibration)
+
+    def set_current(self, name, version):
+        """Rolls `name` back (or forward) to an existing version."""
+        with self._lock:
+            entry = self._entry(name)
+            if str(version) not in entry['versions']:
+                raise KeyError(f"Calibration '{name}' has no version {version}")
+            entry['current'] = version
+            self._write_index()
+
+    def import_matrix(self, name, path, display_size):
+        """Adds a single-matrix .npy file (the old M.npy) as a new version."""
+        return self.save(name, np.load(path), display_size, source=f'import:{os.path.basename(path)}')
+
+    def projection(self, name):
+        """The current version of `name` as a DisplayProjection, built once per version."""
+        with self._lock:
+            key = (name, self.current_version(name))
+            if key not in self._projections:
+                self._projections[key] = self.load(name).projection()
+            return self._projections[key]
+
+
+def load_calibration(spec, display_size, store=None):
+    """
+    The calibration CameraManager starts with. `spec` is either a path to a
+    bare .npy homography, used as is, or a calibration name in the store.
+    The first time the default calibration is asked for, the old M.npy is
+    imported as its first version.
+    """
+    if spec.endswith('.npy'):
+        return Calibration(None, 0, np.load(spec), display_size, source=spec)
+    store = store or CalibrationStore()
+    if spec not in store and spec == DEFAULT_CALIBRATION and os.path.exists(LEGACY_MATRIX_PATH):
+        print(f"Importing {LEGACY_MATRIX_PATH} as calibration '{spec}'")
+        return store.import_matrix(spec, LEGACY_MATRIX_PATH, display_size)
+    return store.load(spec)
+
+
+def main():
+    # Lists the stored calibrations, or switches one to another version:
+    #   python -m core.calibration.calibration_store
+    #   python -m core.calibration.calibration_store --use projector 2
+    parser = argparse.ArgumentParser(description='Holomat calibration store')
+    parser.add_argument('--dir', default=CALIBRATION_DIR)
+    parser.add_argument('--use', nargs=2, metavar=('NAME', 'VERSION'), help='Make VERSION the current one')
+    args = parser.parse_args()
+
+    store = CalibrationStore(args.dir)
+    if args.use:
+        store.set_current(args.use[0], int(args.use[1]))
+    for name in store.names():
+        current = store.current_version(name)
+        for meta in store.versions(name):
+            marker = '*' if meta['version'] == current else ' '
+            error = f"{meta['rms_error']:.2f} px" if meta['rms_error'] is not None else '-'
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['created']))
+            lens = 'lens model' if meta.get('lens_model') else ''
+            print(f"{marker} {name:<16} v{meta['version']:<4} {created}  {meta['source']:<16} {error:<9} {lens}")
+
+
+if __name__ == '__main__':
+    main()
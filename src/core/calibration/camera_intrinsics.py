@@ -0,0 +1,147 @@
+import argparse
+
+import cv2
+import numpy as np
+
+from core.calibration.calibration_store import CalibrationStore, load_calibration
+from core.calibration.homography import solve_homography
+from core.camera.frame_sources import DeviceSource
+from core.camera.projection import DisplayProjection
+from core.data.constants import (CHESSBOARD_SIZE, CHESSBOARD_SQUARE_MM, DEFAULT_CALIBRATION, MIN_CHESSBOARD_VIEWS,
+                                 SCREEN_SIZE)
+
+SUBPIXEL_CRITERIA = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01)
+
+
+def chessboard_object_points(pattern_size, square_size):
+    """The chessboard's inner corners in its own plane (z = 0), row by row."""
+    columns, rows = pattern_size
+    points = np.zeros((columns * rows, 3), dtype=np.float32)
+    points[:, :2] = np.mgrid[0:columns, 0:rows].T.reshape(-1, 2) * square_size
+    return points
+
+
+def find_chessboard(gray, pattern_size):
+    """Sub-pixel inner corners of the chessboard in a grayscale image, or None."""
+    flags = cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_FAST_CHECK
+    found, corners = cv2.findChessboardCorners(gray, pattern_size, flags)
+    if not found:
+        return None
+    return cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), SUBPIXEL_CRITERIA)
+
+
+def calibrate_lens(views, image_size, pattern_size=CHESSBOARD_SIZE, square_size=CHESSBOARD_SQUARE_MM):
+    """
+    Camera matrix and distortion coefficients from chessboard corners found
+    in several views. Returns (rms_error, camera_matrix, dist_coeffs), the
+    error in camera pixels.
+    """
+    object_points = [chessboard_object_points(pattern_size, square_size)] * len(views)
+    rms_error, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(object_points, views, image_size, None, None)
+    return rms_error, camera_matrix, dist_coeffs.ravel()
+
+
+def refit_homography(calibration, camera_matrix, dist_coeffs):
+    """
+    The homography of `calibration` solved again from the fingertip points
+    it was made with, undistorted with a new lens model. Returns
+    (M, inliers, rms_error) like solve_homography, or None when the
+    calibration has no recorded points (e.g. an imported M.npy).
+    """
+    if calibration.camera_points is None or calibration.display_points is None:
+        return None
+    lens = DisplayProjection(np.eye(3), calibration.display_size, camera_matrix, dist_coeffs)
+    return solve_homography(lens.undistort(calibration.camera_points), calibration.display_points)
+
+
+def collect_views(source, pattern_size, min_views):
+    """
+    Live camera view for holding the chessboard up: Space keeps the current
+    view, Enter finishes once there are `min_views`, Q aborts. Returns the
+    corners of every kept view and the image size, or None when aborted.
+    """
+    views = []
+    image_size = None
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            continue
+        image_size = (frame.shape[1], frame.shape[0])
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        corners = find_chessboard(gray, pattern_size)
+
+        preview = frame.copy()
+        if corners is not None:
+            cv2.drawChessboardCorners(preview, pattern_size, corners, True)
+        cv2.putText(preview, f'{len(views)}/{min_views} views - Space: keep, Enter: done, Q: quit', (30, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.imshow("Lens Calibration", preview)
+
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord(' ') and corners is not None:
+            views.append(corners)
+            print(f"Kept view {len(views)}")
+        elif key == 13:  # Enter key
+            if len(views) >= min_views:
+                return views, image_size
+            print(f"Need at least {min_views} views, have {len(views)}")
+        elif key in (ord('q'), 27):
+            return None
+
+
+def main():
+    # Calibrates the camera's lens with a printed chessboard and adds the
+    # lens model to a display calibration:
+    #   python -m core.calibration.camera_intrinsics [NAME]
+    parser = argparse.ArgumentParser(description='Holomat lens calibration')
+    parser.add_argument('name', nargs='?', default=DEFAULT_CALIBRATION, help='Calibration to add the lens model to')
+    parser.add_argument('--camera', type=int, default=0)
+    parser.add_argument('--views', type=int, default=MIN_CHESSBOARD_VIEWS)
+    args = parser.parse_args()
+
+    store = CalibrationStore()
+    try:
+        calibration = load_calibration(args.name, SCREEN_SIZE, store)
+    except KeyError:
+        print(f"No calibration named '{args.name}' yet, run the hand calibration first.")
+        return
+
+    print("Hold the chessboard at different angles, and into every corner of the camera's view.")
+    source = DeviceSource(args.camera, 1920, 1080)
+    try:
+        collected = collect_views(source, CHESSBOARD_SIZE, args.views)
+    finally:
+        source.release()
+        cv2.destroyAllWindows()
+    if collected is None:
+        return
+
+    views, image_size = collected
+    lens_error, camera_matrix, dist_coeffs = calibrate_lens(views, image_size)
+    print(f"Lens model fits to {lens_error:.2f} camera px over {len(views)} views")
+
+    refit = refit_homography(calibration, camera_matrix, dist_coeffs)
+    if refit is None:
+        # The current homography was fitted to distorted points and would
+        # misplace every cursor with the lens model, so the lens is stored
+        # without being used; the hand calibration picks it up from there
+        store.save(args.name, calibration.matrix, calibration.display_size, source='lens',
+                   rms_error=calibration.rms_error, camera_matrix=camera_matrix, dist_coeffs=dist_coeffs,
+                   make_current=False)
+        print("This calibration has no recorded points to refit; run the hand calibration again to use the lens model.")
+        return
+
+    M, inliers, rms_error = refit
+    if M is None:
+        print("Error: The recorded points do not fit a homography with this lens model, calibration not changed.")
+        return
+    store.save(args.name, M, calibration.display_size, source='lens', rms_error=rms_error,
+               camera_points=calibration.camera_points, display_points=calibration.display_points,
+               inliers=inliers, fiducials=calibration.fiducials, camera_matrix=camera_matrix,
+               dist_coeffs=dist_coeffs)
+    before = f"{calibration.rms_error:.2f} px" if calibration.rms_error is not None else "unknown"
+    print(f"Display error over the calibration points: {before} before, {rms_error:.2f} px with the lens model")
+
+
+if __name__ == '__main__':
+    main()
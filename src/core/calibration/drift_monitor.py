@@ -0,0 +1,182 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+from core.calibration.homography import calibration_targets, solve_homography
+from core.camera.projection import DisplayProjection
+from core.data.constants import DEFAULT_CALIBRATION, DRIFT_CHECK_INTERVAL, DRIFT_THRESHOLD, FIDUCIAL_SIZE
+
+# Seconds between the fiducials appearing and the camera frame used, so the
+# projector and the camera's exposure have caught up
+FIDUCIAL_SETTLE = 0.3
+# Seconds to wait for such a frame before giving up until the next check
+FIDUCIAL_TIMEOUT = 2.0
+MIN_FIDUCIALS = 4
+
+IDLE, SHOWING, DETECTING = 'idle', 'showing', 'detecting'
+
+
+def fiducial_points(display_size, margin):
+    # Corners and edge midpoints; the middle of the table is the home circle
+    points = calibration_targets(display_size, 3, 3, margin)
+    del points[4]
+    return points
+
+
+def render_fiducial(marker_id, size, dictionary):
+    """An ArUco marker with the white border detection needs, as a pygame surface."""
+    border = size // 8
+    marker = cv2.aruco.generateImageMarker(dictionary, marker_id, size - 2 * border)
+    image = np.full((size, size), 255, dtype=np.uint8)
+    image[border:size - border, border:size - border] = marker
+    return pygame.surfarray.make_surface(np.repeat(image.T[:, :, None], 3, axis=2))
+
+
+class DriftMonitor:
+    """
+    Checks in the background that a calibration still matches the table
+    and corrects it when the projector or camera has been knocked.
+
+    Every `interval` seconds, once the home screen reports that nobody is
+    using the table, `wants_fiducials()` turns true and the home screen
+    draws `markers` (ArUco fiducials at known display positions). The
+    first camera frame taken after they settled is handed to a worker
+    thread that finds them.
+
+    The first check after a calibration records where the fiducials appear
+    in the camera as its baseline. Later checks compare against that
+    baseline: if the fiducials moved by more than `threshold` display pixels
+    (median), the homography from their new camera positions to the
+    baseline ones is composed with the calibration, saved as a new version
+    and handed to the camera manager. Comparing against a baseline rather
+    than against the projected positions keeps the fingertip height offset
+    the original calibration was made with.
+    """
+
+    def __init__(self, camera_manager, store, name=DEFAULT_CALIBRATION, interval=DRIFT_CHECK_INTERVAL,
+                 threshold=DRIFT_THRESHOLD, marker_size=FIDUCIAL_SIZE):
+        self.camera_manager = camera_manager
+        self.store = store
+        self.name = name
+        self.interval = interval
+        self.threshold = threshold
+
+        display_size = (camera_manager.width, camera_manager.height)
+        self.points = np.array(fiducial_points(display_size, marker_size), dtype=np.float32)
+        dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_50)
+        self._detector = cv2.aruco.ArucoDetector(dictionary)
+        # (rect, surface) per fiducial, marker id = index
+        self.markers = []
+        for marker_id, (x, y) in enumerate(self.points):
+            rect = pygame.Rect(int(x) - marker_size // 2, int(y) - marker_size // 2, marker_size, marker_size)
+            self.markers.append((rect, render_fiducial(marker_id, marker_size, dictionary)))
+
+        self.state = IDLE
+        self.last_check = time.time()
+        self.last_drift = None
+        self._shown_at = None
+        self._thread = None
+
+    def wants_fiducials(self, idle):
+        """
+        Called once per home screen frame with whether the table is idle.
+        Returns True while the fiducials should be on screen.
+        """
+        now = time.time()
+        camera_manager = self.camera_manager
+        if self.state == IDLE:
+            if idle and self.interval and now - self.last_check >= self.interval and camera_manager.frame is not None:
+                self.state = SHOWING
+                self._shown_at = now
+            return self.state == SHOWING
+        if self.state != SHOWING:
+            return False
+
+        if not idle:
+            # Someone came back; try again the next time the table is idle
+            self.state = IDLE
+        elif (camera_manager.frame_timestamp is not None
+              and camera_manager.frame_timestamp >= self._shown_at + FIDUCIAL_SETTLE):
+            self.state = DETECTING
+            self.last_check = now
+            self._thread = threading.Thread(target=self._check, args=(camera_manager.frame.copy(),),
+                                            name='drift-check', daemon=True)
+            self._thread.start()
+        elif now - self._shown_at > FIDUCIAL_TIMEOUT:
+            print("Drift check: no camera frame with the fiducials, skipping")
+            self.state = IDLE
+            self.last_check = now
+        return self.state == SHOWING
+
+    def detect(self, frame):
+        """Camera positions of the fiducials in a BGR frame, NaN where not found."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        corners, ids, _ = self._detector.detectMarkers(gray)
+        found = np.full((len(self.points), 2), np.nan, dtype=np.float32)
+        if ids is not None:
+            for marker_corners, marker_id in zip(corners, ids.ravel()):
+                if marker_id < len(found):
+                    found[marker_id] = marker_corners.reshape(4, 2).mean(axis=0)
+        return found
+
+    def _check(self, frame):
+        try:
+            self.check(frame)
+        finally:
+            self.state = IDLE
+
+    def check(self, frame):
+        """Runs one drift check on a frame showing the fiducials."""
+        calibration = self.camera_manager.calibration
+        if calibration.name != self.name:
+            return
+        found = self.detect(frame)
+        seen = ~np.isnan(found[:, 0])
+        if np.count_nonzero(seen) < MIN_FIDUCIALS:
+            print(f"Drift check: only {np.count_nonzero(seen)} fiducials found")
+            return
+
+        baseline = calibration.fiducials
+        if baseline is None:
+            self.store.set_fiducials(calibration, found)
+            print(f"Drift check: recorded the fiducial baseline of {calibration}")
+            return
+
+        common = seen & ~np.isnan(baseline[:, 0])
+        if np.count_nonzero(common) < MIN_FIDUCIALS:
+            print("Drift check: too few fiducials in common with the baseline")
+            return
+
+        # How far the fiducials moved, as seen through the calibration
+        projection = self.camera_manager.projection
+        moved = projection.to_display(found[common]) - projection.to_display(baseline[common])
+        self.last_drift = float(np.median(np.linalg.norm(moved, axis=-1)))
+        if self.last_drift <= self.threshold:
+            print(f"Drift check: {self.last_drift:.1f} px, calibration OK")
+            return
+
+        # Camera now -> camera at calibration time, then the old mapping;
+        # with a lens model both in undistorted camera pixels
+        correction, _, rms_error = solve_homography(projection.undistort(found[common]),
+                                                    projection.undistort(baseline[common]), self.threshold)
+        if correction is None:
+            print(f"Drift check: {self.last_drift:.1f} px of drift, but no correction fits")
+            return
+        matrix = calibration.matrix @ correction
+        matrix /= matrix[2, 2]
+        # The new baseline: fiducials not seen this time are carried over,
+        # i.e. moved to where the new mapping puts them
+        fiducials = found.copy()
+        carried = ~seen & ~np.isnan(baseline[:, 0])
+        moved_projection = DisplayProjection(matrix, projection.display_size, calibration.camera_matrix,
+                                             calibration.dist_coeffs)
+        fiducials[carried] = moved_projection.to_camera(projection.to_display(baseline[carried]))
+        refined = self.store.save(self.name, matrix, calibration.display_size, source='drift',
+                                  rms_error=calibration.rms_error, fiducials=fiducials,
+                                  camera_matrix=calibration.camera_matrix, dist_coeffs=calibration.dist_coeffs)
+        print(f"Drift check: {self.last_drift:.1f} px of drift, switched to {refined} "
+              f"(correction fits to {rms_error:.2f} camera px)")
+        self.camera_manager.set_calibration(refined)
@@ -1,7 +1,13 @@
+import sys
+
 import cv2
 import numpy as np
 import mediapipe as mp
 
+from core.calibration.calibration_store import CalibrationStore
+from core.calibration.homography import calibration_targets, reprojection_errors, solve_homography
+from core.data.constants import DEFAULT_CALIBRATION
+
 # Initialize mediapipe
 mp_hands = mp.solutions.hands
 hands = mp_hands.Hands(static_image_mode=False,
@@ -17,8 +23,24 @@ cap = cv2.VideoCapture(0)
 # Projector width and height
 width, height = 1920, 1080
 
-# Define target points for calibration (projected positions)
-target_points = [(100, 100), (1800, 100), (1800, 950), (100, 950)] # Projector Coordinates
+# Name to save the calibration under, e.g. one per display
+calibration_name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CALIBRATION
+
+# Keep the camera's lens model, if core.calibration.camera_intrinsics made
+# one: the homography is then solved on undistorted fingertip positions.
+# The newest one is used even if it is not current, which is how it is
+# stored when there were no recorded points to refit
+store = CalibrationStore()
+lens = None
+if calibration_name in store:
+    lens_versions = [meta['version'] for meta in store.versions(calibration_name) if meta.get('lens_model')]
+    if lens_versions:
+        lens = store.load(calibration_name, lens_versions[-1])
+        print(f"Using the lens model of {lens}")
+
+# Define target points for calibration (projected positions). A 3x3 grid
+# instead of the 4 corners lets RANSAC drop a bad tap and evens out jitter
+target_points = calibration_targets((width, height), 3, 3, margin=100) # Projector Coordinates
 calibration_points = [] # Camera Coordinates
 
 # Function to capture hand landmarks at target points
@@ -72,12 +94,25 @@ capture_hand_landmarks()
 cv2.destroyAllWindows()
 
 # Ensure the captured points are in the correct order
-if len(calibration_points) == 4:
+if len(calibration_points) == len(target_points):
     target_points_np = np.array(target_points, dtype=np.float32)
     calibration_points_np = np.array(calibration_points, dtype=np.float32)
-    M, _ = cv2.findHomography(calibration_points_np, target_points_np)
-    np.save("M.npy", M)
-    print("Calibration successful. M matrix saved.")
+    undistorted_points = calibration_points_np
+    if lens is not None:
+        undistorted_points = lens.projection().undistort(calibration_points_np)
+    M, inliers, rms_error = solve_homography(undistorted_points, target_points_np)
+    if M is None:
+        print("Error: The captured points do not fit a homography. Please calibrate again.")
+    else:
+        errors = reprojection_errors(M, undistorted_points, target_points_np)
+        for i, (error, inlier) in enumerate(zip(errors, inliers)):
+            print(f"Point {i+1}: {error:.1f} px" + ("" if inlier else " (rejected)"))
+        # Saved as a new version; the previous one stays in the store for rollback
+        store.save(calibration_name, M, (width, height), rms_error=rms_error,
+                   camera_points=calibration_points_np, display_points=target_points_np, inliers=inliers,
+                   camera_matrix=None if lens is None else lens.camera_matrix,
+                   dist_coeffs=None if lens is None else lens.dist_coeffs)
+        print(f"Calibration successful ({rms_error:.2f} px RMS over {inliers.sum()} points).")
 else:
     print("Error: Not all calibration points were captured.")
 
@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+
+from core.camera.projection import apply_homography
+from core.data.constants import RANSAC_REPROJECTION_THRESHOLD
+
+
+def calibration_targets(display_size, columns=3, rows=3, margin=100):
+    """
+    A grid of `columns` x `rows` target points on the display, `margin`
+    pixels in from the edges, row by row. More targets than the four
+    corners let a bad tap be rejected and average out fingertip jitter.
+    """
+    width, height = display_size
+    xs = np.linspace(margin, width - margin, columns)
+    ys = np.linspace(margin, height - margin, rows)
+    return [(int(x), int(y)) for y in ys for x in xs]
+
+
+def reprojection_errors(M, source_points, target_points):
+    """Distance from each projected source point to its target, in target pixels."""
+    projected = apply_homography(np.asarray(source_points, dtype=np.float32), M)
+    return np.linalg.norm(projected - np.asarray(target_points, dtype=np.float32), axis=-1)
+
+
+def solve_homography(source_points, target_points, ransac_threshold=RANSAC_REPROJECTION_THRESHOLD):
+    """
+    Homography mapping `source_points` onto `target_points` (4 or more
+    pairs). With more than four pairs, outliers such as a mis-tapped target
+    are rejected with RANSAC and the fit is refined on the inliers.
+
+    Returns (M, inliers, rms_error), the error in target pixels over the
+    inliers, or (None, None, None) when no homography fits.
+    """
+    source = np.asarray(source_points, dtype=np.float32).reshape(-1, 2)
+    target = np.asarray(target_points, dtype=np.float32).reshape(-1, 2)
+    if len(source) != len(target):
+        raise ValueError(f"{len(source)} source points for {len(target)} targets")
+    if len(source) < 4:
+        raise ValueError(f"A homography needs at least 4 points, got {len(source)}")
+
+    if len(source) == 4:
+        M, mask = cv2.findHomography(source, target, 0)
+    else:
+        M, mask = cv2.findHomography(source, target, cv2.RANSAC, ransac_threshold)
+    if M is None:
+        return None, None, None
+
+    inliers = mask.ravel().astype(bool)
+    errors = reprojection_errors(M, source[inliers], target[inliers])
+    return M, inliers, float(np.sqrt(np.mean(errors ** 2)))
@@ -1,75 +1,364 @@
 import cv2
 import numpy as np
-import mediapipe as mp
 import pygame
 import time
 import os
 import sys
 import math
 
+from core.calibration.calibration_store import load_calibration
+from core.camera.capture_pipeline import CapturePipeline
+from core.camera.frame_sources import DeviceSource, LandmarkRecorder
+from core.camera.hand_tracking import HANDEDNESS_LABELS, HandAssociator, TrackedHand, handedness_to_array
+from core.camera.projection import NUM_LANDMARKS, landmarks_to_array
+from core.camera.roi import RegionOfInterest
+from core.camera.tracker_process import TrackerProcess
+from core.data.constants import MAX_HANDS
+from core.instrumentation.timing import timings
+
 
 class CameraManager:
-    def __init__(self, transformation_matrix_path, width, height):
+    def __init__(self, transformation_matrix_path, width, height, threaded=False, landmark_filter=None,
+                 roi=False, motion_gate=None, tracker_process=False, source=None, record_path=None,
+                 max_num_hands=MAX_HANDS):
         self.width = width
         self.height = height
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
+        # `transformation_matrix_path` is a bare .npy homography or the name
+        # of a calibration in core.calibration.calibration_store
+        self.calibration = load_calibration(transformation_matrix_path, (width, height))
+        self.projection = self.calibration.projection((width, height))
+        self.max_num_hands = max_num_hands
 
-        self.M = np.load(transformation_matrix_path)
+        # With tracker_process the camera and MediaPipe live in a separate
+        # process (see core.camera.tracker_process); roi and motion_gate only
+        # apply to the in-process modes. `source` replaces the live camera
+        # with anything from core.camera.frame_sources; a landmark stream
+        # source skips inference altogether
+        self.tracker = None
+        self.cap = None
+        self.hands = None
+        self.replays_landmarks = getattr(source, 'provides_landmarks', False)
+        if tracker_process:
+            self.tracker = TrackerProcess(0, (1080, 1920, 3), self.max_num_hands)
+            self.tracker.start()
+        elif self.replays_landmarks:
+            self.cap = source
+        else:
+            # The MediaPipe model is created by the first _process_frame call,
+            # i.e. on the inference thread in threaded mode, so startup does
+            # not wait for mediapipe to import and load
+            self.cap = source if source is not None else DeviceSource(0, 1920, 1080)
 
-        # Initialize MediaPipe with GPU support
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            model_complexity=0  # Use simpler model
-        )
-        self.mp_drawing = mp.solutions.drawing_utils
+        # Optionally crop inference to the table area / around the tracked hand
+        self.region_of_interest = RegionOfInterest(self.projection) if roi else None
+
+        # Optional core.camera.motion_gate.MotionGate that skips inference
+        # while nobody is using the table
+        self.motion_gate = motion_gate
 
         self.frame = None
         self.results = None
+        self.roi = None
+        self.frame_timestamp = None
+        self.frame_seq = -1
+        self._tracked_landmarks = None
+        self._tracked_handedness = None
+        # Used by core.instrumentation.timing.present_frame
+        self.last_update_time = None
+        self.presented_seq = -1
+
+        # Preallocated landmark buffers, reused every frame. The projected
+        # result is memoized per captured frame (keyed by frame_seq)
+        self._landmark_buffer = np.zeros((self.max_num_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self._handedness_buffer = np.zeros(self.max_num_hands, dtype=np.int8)
+        self._ordered_buffer = np.zeros_like(self._landmark_buffer)
+        self._projected_buffer = np.zeros_like(self._landmark_buffer)
+        self._projected_seq = None
+        self._projected = None
+        self._projected_list = None
+
+        # Every frame's hands get stable ids (see core.camera.hand_tracking);
+        # landmark rows are kept in id order, with `hand_ids` and
+        # `handedness` (codes) holding each row's id and side
+        self.hand_tracker = HandAssociator(self.max_num_hands)
+        self.hand_ids = np.empty(0, dtype=np.intp)
+        self.handedness = np.empty(0, dtype=np.int8)
+        self._camera_landmarks = None
+        self._associated_seq = None
+
+        # Camera frames warped into display space, one reusable buffer per
+        # output size, each remembering the frame and calibration it holds
+        self._projector_frames = {}
+
+        # Optional smoothing/prediction stage applied to projected landmarks,
+        # e.g. core.camera.landmark_filter.OneEuroFilter
+        self.landmark_filter = landmark_filter
+
+        # Optionally record every frame's camera-space landmarks for replay
+        self.recorder = None
+        if record_path:
+            self.recorder = LandmarkRecorder(record_path, self.max_num_hands, (1920, 1080))
+
+        # In threaded mode capture and inference run in the background and
+        # update() only picks up the most recent result
+        self.pipeline = None
+        if threaded and self.tracker is None and not self.replays_landmarks:
+            self.pipeline = CapturePipeline(self.cap, self._process_frame)
+            self.pipeline.start()
 
     def update(self):
-        ret, frame = self.cap.read()
+        if self.tracker is not None:
+            updated = self._update_from_tracker()
+        elif self.replays_landmarks:
+            updated = self._update_from_landmark_stream()
+        elif self.pipeline is not None:
+            updated = self._update_from_pipeline()
+        else:
+            updated = self._update_from_source()
+
+        if updated and self.frame_seq != self._associated_seq:
+            self._associate_hands()
+            if self.recorder is not None:
+                self.recorder.record(self.frame_timestamp, self._camera_landmarks, self.handedness)
+        self.last_update_time = time.perf_counter()
+        return updated
+
+    def _update_from_source(self):
+        with timings.stage('capture'):
+            ret, frame = self.cap.read()
         if not ret:
             print("Failed to capture frame")
             return False
+        timestamp = time.time()
 
-        # Use OpenCV CUDA for frame processing
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        self.results, self.roi = self._process_frame(frame)
+        self.frame = frame
+        self.frame_timestamp = timestamp
+        self.frame_seq += 1
+        return True
 
+    def _update_from_pipeline(self):
+        tracked = self.pipeline.latest()
+        if tracked is None:
+            # Nothing has been processed yet
+            return False
 
-        # Run inference for hand detection
-        self.results = self.hands.process(rgb_frame)
-        self.frame = frame
+        self.results = tracked.results
+        self.roi = tracked.roi
+        self.frame = tracked.frame
+        self.frame_timestamp = tracked.timestamp
+        self.frame_seq = tracked.seq
         return True
 
-    def get_transformed_landmarks(self):
+    def _update_from_landmark_stream(self):
+        ret, timestamp, landmarks, handedness = self.cap.read_landmarks()
+        if not ret:
+            return False
+
+        self.results = None
+        self.frame = None
+        self.frame_timestamp = timestamp
+        self.frame_seq += 1
+        self._tracked_landmarks = landmarks
+        self._tracked_handedness = handedness
+        return True
+
+    def _update_from_tracker(self):
+        snapshot = self.tracker.latest()
+        if snapshot is None:
+            return False
+
+        self.results = None
+        self.frame = snapshot.frame
+        self.frame_timestamp = snapshot.timestamp
+        self.frame_seq = snapshot.seq
+        self._tracked_landmarks = snapshot.landmarks
+        self._tracked_handedness = snapshot.handedness
+        return True
+
+    @property
+    def M(self):
+        # Camera to display homography of the current calibration; with a
+        # lens model it applies to undistorted camera pixels
+        return self.projection.matrix
+
+    def set_calibration(self, calibration):
+        """
+        Switches to another calibration, e.g. one the drift monitor refined.
+        Safe to call from another thread: the projection is replaced whole.
+        """
+        self.projection = calibration.projection((self.width, self.height))
+        self.calibration = calibration
+        if self.region_of_interest is not None:
+            self.region_of_interest.set_projection(self.projection)
+        # Landmarks of the current frame are projected again
+        self._projected_seq = None
+
+    @property
+    def mp_hands(self):
+        # mediapipe takes most of a second to import, so only on first use
+        import mediapipe as mp
+        return mp.solutions.hands
+
+    @property
+    def mp_drawing(self):
+        import mediapipe as mp
+        return mp.solutions.drawing_utils
+
+    def _create_hands(self):
+        start = time.perf_counter()
+        hands = self.mp_hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_num_hands,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+            model_complexity=0  # Use simpler model
+        )
+        print(f"Hand tracking model loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return hands
+
+    def _process_frame(self, frame):
+        """
+        Runs hand inference on a BGR frame, returns (results, roi). results is
+        None when the motion gate skipped the frame.
+        """
+        if self.hands is None:
+            self.hands = self._create_hands()
+        if self.motion_gate is not None and not self.motion_gate.should_infer(frame):
+            return None, None
+
+        with timings.stage('convert'):
+            if self.region_of_interest is None:
+                roi = (0, 0, frame.shape[1], frame.shape[0])
+                image = frame
+            else:
+                # Crop/downscale first so the color conversion is cheaper too
+                image, roi = self.region_of_interest.select(frame)
+
+            # Use OpenCV CUDA for frame processing
+            rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        # Run inference for hand detection
+        with timings.stage('inference'):
+            results = self.hands.process(rgb_frame)
+
+        if self.region_of_interest is not None:
+            landmarks = None
+            if results.multi_hand_landmarks:
+                landmarks = np.empty((len(results.multi_hand_landmarks), NUM_LANDMARKS, 2), dtype=np.float32)
+                landmarks_to_array(results.multi_hand_landmarks, roi, landmarks)
+            self.region_of_interest.update(landmarks)
+        if self.motion_gate is not None:
+            self.motion_gate.report(bool(results.multi_hand_landmarks))
+        return results, roi
+
+    def get_transformed_landmark_array(self):
+        """
+        Returns a (hands, 21, 2) float32 array of landmarks in screen
+        coordinates, or None when no hand is detected. Rows are in the order
+        of `hand_ids`. The array is a view of an internal buffer and is only
+        valid until the next captured frame.
+        """
+        if self._projected_seq == self.frame_seq:
+            return self._projected
+
+        projection_start = time.perf_counter()
+        projected = None
+        camera_landmarks = self._camera_landmarks
+        if camera_landmarks is not None:
+            projected = self._projected_buffer[:len(camera_landmarks)]
+            self.projection.to_display(camera_landmarks, out=projected)
+            if self.landmark_filter is not None:
+                self.landmark_filter.filter(projected, self.frame_timestamp, out=projected, ids=self.hand_ids)
+
+            # Clip coordinates to be within the screen bounds
+            np.clip(projected[..., 0], 0, self.width - 1, out=projected[..., 0])
+            np.clip(projected[..., 1], 0, self.height - 1, out=projected[..., 1])
+        elif self.landmark_filter is not None:
+            # Hand lost, don't smooth/predict from its old position next time
+            self.landmark_filter.reset()
+
+        self._projected_seq = self.frame_seq
+        self._projected = projected
+        # One TrackedHand per hand, kept as a list so `if landmarks:` still works
+        self._projected_list = None
+        if projected is not None:
+            self._projected_list = [TrackedHand(int(hand_id), HANDEDNESS_LABELS[side], landmarks)
+                                    for hand_id, side, landmarks in zip(self.hand_ids, self.handedness, projected)]
+        timings.record('projection', time.perf_counter() - projection_start)
+        return projected
+
+    def _get_camera_landmarks(self):
+        # (hands, 21, 2) landmarks and handedness codes of the current frame
+        # in camera pixels, in detection order
+        if self.tracker is not None or self.replays_landmarks:
+            return self._tracked_landmarks, self._tracked_handedness
         if self.results and self.results.multi_hand_landmarks:
-            transformed_landmarks = []
-            for hand_landmarks in self.results.multi_hand_landmarks:
-                # Extract landmark coordinates
-                landmark_coords = []
-                for landmark in hand_landmarks.landmark:
-                    x = int(landmark.x * self.frame.shape[1])
-                    y = int(landmark.y * self.frame.shape[0])
-                    landmark_coords.append([x, y])
+            num_hands = landmarks_to_array(self.results.multi_hand_landmarks, self.roi,
+                                           self._landmark_buffer)
+            handedness = self._handedness_buffer[:num_hands]
+            handedness[:] = 0
+            handedness_to_array(self.results.multi_handedness or [], handedness)
+            return self._landmark_buffer[:num_hands], handedness
+        return None, None
 
-                landmark_coords = np.array(landmark_coords, dtype=np.float32)
+    def _associate_hands(self):
+        # Gives the new frame's hands their ids and sorts them by id, so the
+        # same hand stays in the same row while it is tracked
+        self._associated_seq = self.frame_seq
+        landmarks, handedness = self._get_camera_landmarks()
+        ids = self.hand_tracker.update(landmarks, handedness)
+        if not len(ids):
+            self._camera_landmarks = None
+            self.hand_ids = ids
+            self.handedness = self._handedness_buffer[:0]
+            return
 
-                # Apply M transformation to landmark coordinates
-                transformed_coords = cv2.perspectiveTransform(np.array([landmark_coords]), self.M)[0]
+        order = np.argsort(ids)
+        count = len(ids)
+        self._camera_landmarks = self._ordered_buffer[:count]
+        np.take(landmarks[:count], order, axis=0, out=self._camera_landmarks)
+        self.hand_ids = ids[order]
+        self.handedness = handedness[:count][order] if handedness is not None else np.zeros(count, dtype=np.int8)
 
-                # Clip coordinates to be within the screen bounds
-                transformed_coords = np.clip(transformed_coords, [0, 0], [self.width - 1, self.height - 1])
-                transformed_landmarks.append(transformed_coords)
+    def get_projector_frame(self, scale=1.0):
+        """
+        The current camera frame as seen from the display: a BGR image of the
+        display's size times `scale` (e.g. 0.25 for a preview), or None
+        before the first frame. Warped with remap tables built once per
+        calibration and size into a buffer reused for that size, so the
+        image is only valid until the next call with the same scale.
+        """
+        if self.frame is None:
+            return None
+        size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+        source = (self.frame_seq, self.projection)
+        held, out = self._projector_frames.get(size, (None, None))
+        if held == source:
+            return out
+        if out is None:
+            out = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        with timings.stage('projector_frame'):
+            self.projection.warp_frame(self.frame, size, out=out)
+        self._projector_frames[size] = (source, out)
+        return out
 
-            return transformed_landmarks
-        return None
+    def get_transformed_landmarks(self):
+        """
+        Returns one core.camera.hand_tracking.TrackedHand per hand in screen
+        coordinates, ordered by hand id, or None when no hand is detected.
+        Each indexes like its (21, 2) landmark array.
+        """
+        self.get_transformed_landmark_array()
+        return self._projected_list
 
     def release(self):
-        self.cap.release()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.tracker is not None:
+            self.tracker.stop()
+        if self.cap is not None:
+            self.cap.release()
+        if self.recorder is not None:
+            self.recorder.save()
         cv2.destroyAllWindows()
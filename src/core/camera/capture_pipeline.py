@@ -0,0 +1,111 @@
+import threading
+import time
+from collections import namedtuple
+
+from core.instrumentation.timing import timings
+
+# One published hand-tracking result. `frame` is the BGR frame the landmarks
+# were computed from, `roi` the (x, y, w, h) part of it that inference ran on
+# and `seq` increases by one for every captured frame.
+TrackedFrame = namedtuple('TrackedFrame', ['seq', 'timestamp', 'frame', 'results', 'roi'])
+
+
+class LatestSlot:
+    """Holds only the most recent value; readers never block on writers."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._value = None
+        self._seq = -1
+
+    def publish(self, seq, value):
+        with self._condition:
+            self._seq = seq
+            self._value = value
+            self._condition.notify_all()
+
+    def get(self):
+        with self._condition:
+            return self._value
+
+    def wait_newer(self, seq, timeout):
+        # Block until something newer than `seq` was published (or timeout)
+        with self._condition:
+            if self._seq <= seq:
+                self._condition.wait(timeout)
+            if self._seq <= seq:
+                return None
+            return self._value
+
+
+class CapturePipeline:
+    """
+    Runs camera capture and hand inference on two background threads.
+
+    The capture thread keeps pulling frames so the driver buffer never goes
+    stale, the inference thread always works on the newest captured frame
+    (older ones are dropped), and the render loop picks up the latest result
+    with `latest()` without waiting on either of them.
+    """
+
+    def __init__(self, cap, process):
+        self.cap = cap
+        # process(frame) -> (results, roi), run on the inference thread
+        self.process = process
+        self.frames = LatestSlot()
+        self.results = LatestSlot()
+        self.captured_count = 0
+        self.processed_count = 0
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name='camera-capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='hand-inference', daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def latest(self):
+        return self.results.get()
+
+    @property
+    def dropped_count(self):
+        # Frames that were captured but replaced before inference got to them
+        return max(0, self.captured_count - self.processed_count)
+
+    def _capture_loop(self):
+        seq = -1
+        while self._running:
+            with timings.stage('capture'):
+                ret, frame = self.cap.read()
+            if not ret:
+                print("Failed to capture frame")
+                time.sleep(0.01)
+                continue
+            seq += 1
+            self.captured_count += 1
+            self.frames.publish(seq, (seq, time.time(), frame))
+
+    def _inference_loop(self):
+        last_seq = -1
+        while self._running:
+            item = self.frames.wait_newer(last_seq, timeout=0.1)
+            if item is None:
+                continue
+            seq, timestamp, frame = item
+            last_seq = seq
+
+            results, roi = self.process(frame)
+            self.processed_count += 1
+            self.results.publish(seq, TrackedFrame(seq, timestamp, frame, results, roi))
@@ -0,0 +1,217 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from core.camera.projection import NUM_LANDMARKS
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class DeviceSource:
+    """Live camera, the default source."""
+
+    def __init__(self, index=0, width=1920, height=1080):
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+
+class _Pacer:
+    # Sleeps so frames come out at `fps`; does nothing when fps is None
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps else None
+        self.next_time = None
+
+    def wait(self):
+        if self.interval is None:
+            return
+        now = time.time()
+        if self.next_time is not None and now < self.next_time:
+            time.sleep(self.next_time - now)
+            now = self.next_time
+        self.next_time = now + self.interval
+
+
+class VideoFileSource:
+    """
+    Frames from a video file. Plays as fast as they can be consumed unless
+    `realtime` is set, in which case the file's own frame rate is kept.
+    """
+
+    def __init__(self, path, loop=True, realtime=False):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.pacer = _Pacer(self.cap.get(cv2.CAP_PROP_FPS) if realtime else None)
+
+    def read(self):
+        self.pacer.wait()
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return ret, frame
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource:
+    """
+    Frames from the images in a directory, in file name order. Decoded
+    frames are kept in memory so looping does not hit the disk again.
+    """
+
+    def __init__(self, directory, loop=True, fps=None):
+        self.paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise FileNotFoundError(f"No images found in {directory}")
+        self.loop = loop
+        self.pacer = _Pacer(fps)
+        self.index = 0
+        self.cache = {}
+
+    def read(self):
+        if self.index >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.index = 0
+        self.pacer.wait()
+
+        path = self.paths[self.index]
+        self.index += 1
+        if path not in self.cache:
+            self.cache[path] = cv2.imread(path)
+        frame = self.cache[path]
+        return frame is not None, frame
+
+    def release(self):
+        self.cache = {}
+
+
+class LandmarkStreamSource:
+    """
+    Replays a landmark recording made with LandmarkRecorder. There are no
+    camera frames, so CameraManager skips inference entirely and uses the
+    recorded (hands, 21, 2) camera-pixel landmarks and timestamps directly.
+    Recordings made before handedness was recorded replay as unknown hands.
+    """
+
+    provides_landmarks = True
+
+    def __init__(self, path, loop=True, realtime=False):
+        data = np.load(path)
+        self.timestamps = data['timestamps']
+        self.landmarks = data['landmarks']
+        self.num_hands = data['num_hands']
+        if 'handedness' in data:
+            self.handedness = data['handedness']
+        else:
+            self.handedness = np.zeros(self.landmarks.shape[:2], dtype=np.int8)
+        self.frame_size = tuple(int(v) for v in data['frame_size'])
+        self.loop = loop
+        self.realtime = realtime
+        self.index = 0
+        self.loop_offset = 0.0
+        self._start_time = None
+
+    def read_landmarks(self):
+        """Returns (ret, timestamp, landmarks or None, handedness codes)."""
+        if self.index >= len(self.timestamps):
+            if not self.loop or len(self.timestamps) == 0:
+                return False, None, None, None
+            # Keep timestamps increasing across loops
+            self.loop_offset += self.timestamps[-1] - self.timestamps[0] + 1.0 / 30
+            self.index = 0
+
+        timestamp = float(self.timestamps[self.index] + self.loop_offset)
+        if self.realtime:
+            if self._start_time is None:
+                self._start_time = time.time() - (timestamp - self.timestamps[0])
+            delay = self._start_time + (timestamp - self.timestamps[0]) - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+        num_hands = int(self.num_hands[self.index])
+        landmarks = self.landmarks[self.index, :num_hands] if num_hands else None
+        handedness = self.handedness[self.index, :num_hands]
+        self.index += 1
+        return True, timestamp, landmarks, handedness
+
+    def release(self):
+        pass
+
+
+class LandmarkRecorder:
+    """
+    Records per-frame landmarks (camera pixels) and handedness codes with
+    their timestamps into a compact .npz file that LandmarkStreamSource can
+    replay.
+    """
+
+    def __init__(self, path, max_num_hands, frame_size):
+        self.path = path
+        self.max_num_hands = max_num_hands
+        self.frame_size = frame_size
+        self.timestamps = []
+        self.landmarks = []
+        self.handedness = []
+        self.num_hands = []
+
+    def record(self, timestamp, landmarks, handedness=None):
+        entry = np.zeros((self.max_num_hands, NUM_LANDMARKS, 2), dtype=np.float32)
+        sides = np.zeros(self.max_num_hands, dtype=np.int8)
+        num_hands = 0
+        if landmarks is not None:
+            num_hands = min(len(landmarks), self.max_num_hands)
+            entry[:num_hands] = landmarks[:num_hands]
+            if handedness is not None:
+                sides[:num_hands] = handedness[:num_hands]
+        self.timestamps.append(timestamp)
+        self.landmarks.append(entry)
+        self.handedness.append(sides)
+        self.num_hands.append(num_hands)
+
+    def save(self):
+        np.savez_compressed(
+            self.path,
+            timestamps=np.array(self.timestamps, dtype=np.float64),
+            landmarks=np.array(self.landmarks, dtype=np.float32).reshape(-1, self.max_num_hands, NUM_LANDMARKS, 2),
+            handedness=np.array(self.handedness, dtype=np.int8).reshape(-1, self.max_num_hands),
+            num_hands=np.array(self.num_hands, dtype=np.int8),
+            frame_size=np.array(self.frame_size, dtype=np.int32)
+        )
+        print(f"Saved {len(self.timestamps)} landmark frames to {self.path}")
+
+
+def open_source(spec):
+    """
+    Builds a source from a command line style spec:
+    `device:0`, `video:path.mp4`, `images:dir`, `landmarks:recording.npz`.
+    A suffix of `@realtime` keeps the recorded rate instead of max speed.
+    """
+    realtime = spec.endswith('@realtime')
+    if realtime:
+        spec = spec[:-len('@realtime')]
+    kind, _, value = spec.partition(':')
+
+    if kind == 'device':
+        return DeviceSource(int(value or 0))
+    if kind == 'video':
+        return VideoFileSource(value, realtime=realtime)
+    if kind == 'images':
+        return ImageDirectorySource(value, fps=30 if realtime else None)
+    if kind == 'landmarks':
+        return LandmarkStreamSource(value, realtime=realtime)
+    raise ValueError(f"Unknown frame source '{spec}'")
@@ -0,0 +1,161 @@
+import numpy as np
+
+from core.camera.projection import INDEX_FINGER_TIP
+from core.data.constants import HAND_LOST_FRAMES, HAND_MATCH_DISTANCE
+
+# Wrist, index and pinky knuckles: the palm moves less than the fingertips
+PALM_LANDMARKS = [0, 5, 17]
+
+# Handedness codes, as stored in landmark recordings and shared memory
+UNKNOWN_HAND, LEFT_HAND, RIGHT_HAND = 0, 1, 2
+HANDEDNESS_LABELS = (None, 'Left', 'Right')
+
+# Extra distance (camera pixels) for matching a hand to a track of the other
+# side; MediaPipe flips a label now and then, so it is not a hard rule
+HANDEDNESS_PENALTY = 150
+
+
+def handedness_to_array(multi_handedness, out):
+    """
+    Writes MediaPipe's handedness classifications into `out`, a
+    preallocated int8 buffer, as LEFT_HAND / RIGHT_HAND codes. Returns the
+    number of hands written.
+    """
+    num_hands = min(len(multi_handedness), len(out))
+    for i in range(num_hands):
+        label = multi_handedness[i].classification[0].label
+        out[i] = LEFT_HAND if label == 'Left' else RIGHT_HAND if label == 'Right' else UNKNOWN_HAND
+    return num_hands
+
+
+class TrackedHand:
+    """
+    One hand of the current frame: its stable `id`, `handedness` ('Left',
+    'Right' or None) and (21, 2) `landmarks` in screen pixels. Indexes like
+    its landmark array, so `hand[INDEX_FINGER_TIP]` works as before.
+    """
+
+    __slots__ = ('id', 'handedness', 'landmarks')
+
+    def __init__(self, hand_id, handedness, landmarks):
+        self.id = hand_id
+        self.handedness = handedness
+        self.landmarks = landmarks
+
+    def __getitem__(self, index):
+        return self.landmarks[index]
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.landmarks if dtype is None else self.landmarks.astype(dtype)
+
+    @property
+    def cursor(self):
+        tip = self.landmarks[INDEX_FINGER_TIP]
+        return int(tip[0]), int(tip[1])
+
+    def __repr__(self):
+        return f'TrackedHand(id={self.id}, handedness={self.handedness}, cursor={self.cursor})'
+
+
+class HandAssociator:
+    """
+    Gives every detected hand an id that stays the same from frame to frame.
+
+    MediaPipe reports hands in no particular order, so each frame's palms
+    are matched to where the tracked hands were last seen: all distances at
+    once, closest pairs first, none further than `match_distance`. A
+    detection on the other side (left/right) than the track costs
+    HANDEDNESS_PENALTY extra. Unmatched detections start a new track.
+
+    Ids are the slots 0 .. max_hands - 1, so per-hand state elsewhere can
+    live in arrays indexed by id. A lost hand keeps its id for
+    `lost_frames` frames, so a hand missed for a frame or two comes back as
+    itself and a new hand never takes over an id in the frame its previous
+    owner disappeared.
+    """
+
+    def __init__(self, max_hands, match_distance=HAND_MATCH_DISTANCE, lost_frames=HAND_LOST_FRAMES):
+        self.max_hands = max_hands
+        self.match_distance = match_distance
+        self.lost_frames = lost_frames
+
+        self.centers = np.zeros((max_hands, 2), dtype=np.float32)
+        self.handedness = np.zeros(max_hands, dtype=np.int8)
+        # Frames since each track was last seen; active tracks hold their id
+        self.missing = np.zeros(max_hands, dtype=np.int32)
+        self.active = np.zeros(max_hands, dtype=bool)
+        self._ids = np.empty(max_hands, dtype=np.intp)
+        self._seen = np.zeros(max_hands, dtype=bool)
+
+    def update(self, landmarks, handedness=None):
+        """
+        Associates one frame's (hands, 21, 2) landmarks (None without
+        hands) with the tracks. `handedness` holds a code per hand, if
+        known. Returns the id of each hand, a view of an internal buffer.
+        """
+        count = 0 if landmarks is None else min(len(landmarks), self.max_hands)
+        ids = self._ids[:count]
+        seen = self._seen
+        seen[:] = False
+
+        if count:
+            wrist, index_knuckle, pinky_knuckle = PALM_LANDMARKS
+            centers = landmarks[:count, wrist] + landmarks[:count, index_knuckle]
+            centers += landmarks[:count, pinky_knuckle]
+            centers /= 3
+
+            # Distance of every hand to every track at once
+            delta = centers[:, None] - self.centers
+            distances = np.hypot(delta[..., 0], delta[..., 1])
+            distances[:, ~self.active] = np.inf
+            if handedness is not None:
+                sides = handedness[:count, None]
+                flipped = (sides != UNKNOWN_HAND) & (self.handedness != UNKNOWN_HAND) & (sides != self.handedness)
+                distances += flipped * HANDEDNESS_PENALTY
+
+            # Greedy matching, closest pairs first. There are only a few
+            # hands, so plain lists beat numpy from here on
+            row_ids = [-1] * count
+            taken = [False] * self.max_hands
+            flat = distances.ravel().tolist()
+            for pair in np.argsort(distances, axis=None).tolist():
+                if flat[pair] > self.match_distance:
+                    break
+                row, hand_id = divmod(pair, self.max_hands)
+                if row_ids[row] < 0 and not taken[hand_id]:
+                    row_ids[row] = hand_id
+                    taken[hand_id] = True
+
+            # Unmatched hands start new tracks on free ids; when every id is
+            # held by a lost hand, the longest lost one gives up its id
+            active = self.active.tolist()
+            missing = self.missing.tolist()
+            for row in range(count):
+                if row_ids[row] >= 0:
+                    continue
+                free = [i for i in range(self.max_hands) if not taken[i] and not active[i]]
+                if not free:
+                    free = sorted((i for i in range(self.max_hands) if not taken[i]), key=lambda i: -missing[i])
+                row_ids[row] = free[0]
+                taken[free[0]] = True
+                self.handedness[free[0]] = UNKNOWN_HAND
+
+            ids[:] = row_ids
+            seen[ids] = True
+            self.centers[ids] = centers
+            if handedness is not None:
+                known = handedness[:count] != UNKNOWN_HAND
+                self.handedness[ids[known]] = handedness[:count][known]
+
+        self.missing += 1
+        self.missing[seen] = 0
+        self.active = seen | (self.active & (self.missing < self.lost_frames))
+        return ids
+
+    def reset(self):
+        self.active[:] = False
+        self.missing[:] = 0
+        self.handedness[:] = UNKNOWN_HAND
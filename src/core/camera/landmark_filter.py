@@ -0,0 +1,120 @@
+import math
+import time
+
+import numpy as np
+
+
+def _smoothing_factor(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter over whole landmark arrays, shape (hands, 21, 2).
+
+    Slow movements are smoothed heavily (removes jitter), fast ones lightly
+    (keeps lag low). Each landmark's cutoff frequency adapts to its own
+    speed. With `prediction` enabled the filtered points are pushed forward
+    along their estimated velocity to where the finger should be when the
+    frame reaches the projector: the time the frame already spent in the
+    pipeline plus `display_latency`, capped at `max_prediction`.
+
+    With `ids` (the stable id of each row, see core.camera.hand_tracking)
+    every hand keeps its own state, so a hand coming or going does not
+    restart the others. Without ids all hands start over whenever their
+    number changes.
+
+    Any object with `filter(points, timestamp, out, ids)` and `reset()` can
+    be used as a CameraManager landmark filter.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0,
+                 prediction=True, display_latency=0.016, max_prediction=0.1):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.prediction = prediction
+        self.display_latency = display_latency
+        self.max_prediction = max_prediction
+        self.reset()
+
+    def reset(self):
+        # Filter state per hand id, and which ids were in the previous frame
+        self._x_hat = None
+        self._dx_hat = None
+        self._present = None
+        self._last_timestamp = None
+
+    def filter(self, points, timestamp, out=None, ids=None):
+        """
+        Filters `points` captured at `timestamp` (seconds, time.time()) and
+        writes the smoothed, optionally predicted, points into `out`.
+        """
+        if out is None:
+            out = np.empty_like(points)
+        if ids is None:
+            if self._present is not None and np.count_nonzero(self._present) != len(points):
+                self.reset()
+            ids = np.arange(len(points))
+
+        # Start over when time goes backwards
+        if (self._x_hat is None or self._x_hat.shape[1:] != points.shape[1:]
+                or timestamp <= self._last_timestamp):
+            self._allocate(max(len(points), 4), points.shape[1:])
+        if len(ids) and ids.max() >= len(self._x_hat):
+            self._grow(ids.max() + 1)
+
+        # Hands that were not in the previous frame start from where they are
+        fresh = ~self._present[ids]
+        self._present[:] = False
+        self._present[ids] = True
+        dt = timestamp - self._last_timestamp if self._last_timestamp is not None else 0.0
+        self._last_timestamp = timestamp
+        if fresh.all():
+            self._x_hat[ids] = points
+            self._dx_hat[ids] = 0.0
+            out[...] = points
+            return out
+
+        x_hat = self._x_hat[ids]
+        dx_hat = self._dx_hat[ids]
+        x_hat[fresh] = points[fresh]
+        dx_hat[fresh] = 0.0
+
+        # Smoothed velocity
+        dx = (points - x_hat) / dt
+        a_d = _smoothing_factor(self.d_cutoff, dt)
+        dx_hat += a_d * (dx - dx_hat)
+
+        # Per-landmark cutoff from speed, then smoothed position
+        speed = np.linalg.norm(dx_hat, axis=-1, keepdims=True)
+        cutoff = self.min_cutoff + self.beta * speed
+        tau = 1.0 / (2 * math.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        x_hat += a * (points - x_hat)
+        self._x_hat[ids] = x_hat
+        self._dx_hat[ids] = dx_hat
+
+        if self.prediction:
+            lead = min(max(time.time() - timestamp, 0.0) + self.display_latency, self.max_prediction)
+            np.multiply(dx_hat, lead, out=out)
+            out += x_hat
+        else:
+            out[...] = x_hat
+        return out
+
+    def _allocate(self, size, shape):
+        self._x_hat = np.zeros((size, *shape), dtype=np.float32)
+        self._dx_hat = np.zeros_like(self._x_hat)
+        self._present = np.zeros(size, dtype=bool)
+        self._last_timestamp = None
+
+    def _grow(self, size):
+        x_hat, dx_hat, present = self._x_hat, self._dx_hat, self._present
+        last_timestamp = self._last_timestamp
+        self._allocate(size, x_hat.shape[1:])
+        self._last_timestamp = last_timestamp
+        self._x_hat[:len(x_hat)] = x_hat
+        self._dx_hat[:len(dx_hat)] = dx_hat
+        self._present[:len(present)] = present
@@ -0,0 +1,76 @@
+import time
+
+import cv2
+
+
+class MotionGate:
+    """
+    Decides per frame whether hand inference is worth running.
+
+    While hands are around every frame is processed. When no hand has been
+    seen for `idle_after` seconds the gate goes idle: it only looks at a
+    small grayscale thumbnail `check_rate` times per second and compares it
+    with the previous one. If more than `motion_threshold` of the pixels
+    changed by more than `pixel_threshold` it switches back to full rate.
+    A full inference still runs every `probe_interval` seconds in idle mode
+    so a hand that is already resting on the table is picked up.
+    """
+
+    def __init__(self, idle_after=5.0, check_rate=4.0, motion_threshold=0.01,
+                 pixel_threshold=25, probe_interval=2.0, thumbnail_size=(64, 36)):
+        self.idle_after = idle_after
+        self.check_interval = 1.0 / check_rate
+        self.motion_threshold = motion_threshold
+        self.pixel_threshold = pixel_threshold
+        self.probe_interval = probe_interval
+        self.thumbnail_size = thumbnail_size
+
+        self.active = True
+        self._last_hand_time = None
+        self._last_check_time = 0.0
+        self._last_probe_time = 0.0
+        self._previous = None
+
+    def should_infer(self, frame, now=None):
+        now = time.time() if now is None else now
+        if self.active:
+            return True
+
+        if now - self._last_probe_time >= self.probe_interval:
+            self._last_probe_time = now
+            return True
+
+        if now - self._last_check_time < self.check_interval:
+            return False
+        self._last_check_time = now
+
+        if self._detect_motion(frame):
+            print("Motion detected, resuming full-rate hand tracking")
+            self.active = True
+            # Give the hand time to be found before going idle again
+            self._last_hand_time = now
+            return True
+        return False
+
+    def report(self, hand_found, now=None):
+        """Call after every inference with whether a hand was detected."""
+        now = time.time() if now is None else now
+        if hand_found or self._last_hand_time is None:
+            self._last_hand_time = now
+            self.active = True
+        elif self.active and now - self._last_hand_time >= self.idle_after:
+            print("No hands for a while, switching to presence detection")
+            self.active = False
+            self._previous = None
+            self._last_probe_time = now
+
+    def _detect_motion(self, frame):
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        previous, self._previous = self._previous, gray
+        if previous is None:
+            return False
+
+        diff = cv2.absdiff(gray, previous)
+        changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+        return changed > self.motion_threshold * diff.size
@@ -0,0 +1,168 @@
+import cv2
+import numpy as np
+
+# MediaPipe reports 21 landmarks per hand
+NUM_LANDMARKS = 21
+# Indices of mp.solutions.hands.HandLandmark, without importing mediapipe
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+
+# Iterations for undistorting points: OpenCV's default of 5 leaves a
+# noticeable error in the corners of a wide-angle image
+UNDISTORT_CRITERIA = (cv2.TERM_CRITERIA_COUNT | cv2.TERM_CRITERIA_EPS, 20, 1e-6)
+
+
+def landmarks_to_array(multi_hand_landmarks, roi, out):
+    """
+    Copies MediaPipe landmarks into `out`, a preallocated (max_hands, 21, 2)
+    float32 buffer, in full-frame camera pixel coordinates. `roi` is the
+    (x, y, w, h) box of the frame the landmarks were detected in (the whole
+    frame when not cropping). Returns the number of hands written.
+    """
+    x, y, w, h = roi
+    num_hands = min(len(multi_hand_landmarks), out.shape[0])
+    for i in range(num_hands):
+        out[i] = [(landmark.x, landmark.y) for landmark in multi_hand_landmarks[i].landmark]
+    hands = out[:num_hands]
+    hands *= (w, h)
+    hands += (x, y)
+    return num_hands
+
+
+def apply_homography(points, M, out=None):
+    """
+    Projects an (..., 2) array of points through the 3x3 homography `M` in
+    one matrix operation. Equivalent to cv2.perspectiveTransform but works
+    on any number of hands at once and can write into a reusable buffer.
+    """
+    return _project(points, M[:, :2].T.astype(np.float32), M[:, 2].astype(np.float32), out)
+
+
+def _project(points, linear, offset, out):
+    if out is None:
+        out = np.empty(points.shape, dtype=np.float32)
+    flat = points.reshape(-1, 2)
+    projected = flat @ linear + offset
+    np.divide(projected[:, :2], projected[:, 2:3], out=out.reshape(-1, 2))
+    return out
+
+
+def _undistort_points(points, camera_matrix, dist_coeffs, P, out=None):
+    # OpenCV 4 has the criteria on a separate function, 5 on undistortPoints
+    if hasattr(cv2, 'undistortPointsIter'):
+        return cv2.undistortPointsIter(points, camera_matrix, dist_coeffs, None, P, UNDISTORT_CRITERIA, dst=out)
+    return cv2.undistortPoints(points, camera_matrix, dist_coeffs, dst=out, P=P, criteria=UNDISTORT_CRITERIA)
+
+
+class DisplayProjection:
+    """
+    The camera to display mapping of one display, with everything derived
+    from its homography computed once: the float32 terms the per-frame
+    projection needs, the inverse, the display's outline in camera pixels
+    and, on first use per output size, the remap tables that warp whole
+    camera frames into display space.
+
+    With a lens model (`camera_matrix` and `dist_coeffs` from
+    cv2.calibrateCamera) the homography maps undistorted camera pixels, and
+    points are undistorted and projected in a single cv2.undistortPoints
+    call. Without one it is a pure homography, as before.
+
+    A new calibration builds a new instance, so a reader on another thread
+    sees either the old mapping or the new one, never a mix.
+    """
+
+    def __init__(self, M, display_size, camera_matrix=None, dist_coeffs=None):
+        self.matrix = np.asarray(M, dtype=np.float64)
+        self.inverse = np.linalg.inv(self.matrix)
+        self.display_size = tuple(display_size)
+        self._linear = self.matrix[:, :2].T.astype(np.float32)
+        self._offset = self.matrix[:, 2].astype(np.float32)
+        self._inverse_linear = self.inverse[:, :2].T.astype(np.float32)
+        self._inverse_offset = self.inverse[:, 2].astype(np.float32)
+
+        self.camera_matrix = None
+        self.dist_coeffs = None
+        if dist_coeffs is not None:
+            self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+            self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).ravel()
+            # undistortPoints applies P to the undistorted normalized
+            # coordinates, so M @ K goes from there straight to the display
+            self._lens_to_display = self.matrix @ self.camera_matrix
+            display_to_lens = np.linalg.inv(self._lens_to_display)
+            self._lens_linear = display_to_lens[:, :2].T.astype(np.float32)
+            self._lens_offset = display_to_lens[:, 2].astype(np.float32)
+
+        width, height = self.display_size
+        if self.dist_coeffs is None:
+            outline = [[0, 0], [width, 0], [width, height], [0, height]]
+        else:
+            # Straight display edges are curves in a distorted image
+            steps = np.linspace(0, 1, 9)[:-1]
+            outline = ([(width * t, 0) for t in steps] + [(width, height * t) for t in steps]
+                       + [(width * (1 - t), height) for t in steps] + [(0, height * (1 - t)) for t in steps])
+        self.camera_outline = self.to_camera(np.array(outline, dtype=np.float32))
+        self._frame_maps = {}
+
+    def to_display(self, points, out=None):
+        """Camera pixels to display pixels, for an (..., 2) array."""
+        if self.dist_coeffs is None:
+            return _project(points, self._linear, self._offset, out)
+        if out is None:
+            out = np.empty(points.shape, dtype=np.float32)
+        _undistort_points(np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 1, 2),
+                          self.camera_matrix, self.dist_coeffs, self._lens_to_display, out.reshape(-1, 1, 2))
+        return out
+
+    def to_camera(self, points, out=None):
+        """Display pixels to camera pixels, for an (..., 2) array."""
+        if self.dist_coeffs is None:
+            return _project(points, self._inverse_linear, self._inverse_offset, out)
+        if out is None:
+            out = np.empty(points.shape, dtype=np.float32)
+        if out.size:
+            # Back to normalized camera coordinates, then through the lens
+            normalized = _project(points, self._lens_linear, self._lens_offset, None).reshape(-1, 2)
+            rays = np.concatenate([normalized, np.ones((len(normalized), 1), dtype=np.float32)], axis=1)
+            distorted, _ = cv2.projectPoints(rays, np.zeros(3), np.zeros(3), self.camera_matrix, self.dist_coeffs)
+            out.reshape(-1, 2)[:] = distorted.reshape(-1, 2)
+        return out
+
+    def undistort(self, points):
+        """Camera pixels with the lens distortion removed (a copy without a lens model)."""
+        points = np.asarray(points, dtype=np.float32)
+        if self.dist_coeffs is None or not points.size:
+            return points.copy()
+        undistorted = _undistort_points(points.reshape(-1, 1, 2), self.camera_matrix, self.dist_coeffs,
+                                        self.camera_matrix)
+        return undistorted.reshape(points.shape)
+
+    def frame_maps(self, output_size):
+        """
+        cv2.remap tables from display pixels, at `output_size` (the display
+        size, or smaller for previews), to camera pixels. Built once per
+        size by cv2.initUndistortRectifyMap with the homography as its
+        rectification (and the lens model, if any), in the fixed-point
+        format remap is fastest with.
+        """
+        maps = self._frame_maps.get(output_size)
+        if maps is None:
+            width, height = output_size
+            scale_x = width / self.display_size[0]
+            scale_y = height / self.display_size[1]
+            # Display to output pixels, keeping pixel centres aligned
+            scale = np.array([[scale_x, 0, 0.5 * scale_x - 0.5],
+                              [0, scale_y, 0.5 * scale_y - 0.5],
+                              [0, 0, 1]])
+            if self.dist_coeffs is None:
+                maps = cv2.initUndistortRectifyMap(np.eye(3), None, np.eye(3), scale @ self.matrix,
+                                                   output_size, cv2.CV_16SC2)
+            else:
+                maps = cv2.initUndistortRectifyMap(self.camera_matrix, self.dist_coeffs, np.eye(3),
+                                                   scale @ self._lens_to_display, output_size, cv2.CV_16SC2)
+            self._frame_maps[output_size] = maps
+        return maps
+
+    def warp_frame(self, frame, output_size=None, out=None):
+        """A camera frame seen from the display, written into `out` if given."""
+        map1, map2 = self.frame_maps(output_size or self.display_size)
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR, dst=out)
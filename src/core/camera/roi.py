@@ -0,0 +1,69 @@
+import cv2
+
+
+class RegionOfInterest:
+    """
+    Picks the part of the camera frame that hand inference runs on.
+
+    Without a tracked hand this is the bounding box of the calibrated table
+    area (the screen outline mapped back into the camera).
+    Once a hand is found it is a padded box around the last detection, so
+    inference cost follows the size of the hand instead of the sensor
+    resolution. Crops larger than `max_size` are downscaled before inference.
+    """
+
+    def __init__(self, projection, max_size=640,
+                 hand_padding=0.6, min_hand_box=192):
+        self.max_size = max_size
+        self.hand_padding = hand_padding
+        self.min_hand_box = min_hand_box
+        self.set_projection(projection)
+        self.hand_box = None
+
+    def set_projection(self, projection):
+        # The table area moves with the calibration (a DisplayProjection)
+        self.table_min = projection.camera_outline.min(axis=0)
+        self.table_max = projection.camera_outline.max(axis=0)
+
+    def _clip_box(self, x0, y0, x1, y1, frame_width, frame_height):
+        x0 = int(max(0, min(x0, frame_width - 1)))
+        y0 = int(max(0, min(y0, frame_height - 1)))
+        x1 = int(max(x0 + 1, min(x1, frame_width)))
+        y1 = int(max(y0 + 1, min(y1, frame_height)))
+        return x0, y0, x1 - x0, y1 - y0
+
+    def select(self, frame):
+        """
+        Returns (crop, roi) where crop is the (possibly downscaled) image to
+        run inference on and roi is the (x, y, w, h) box it covers in the
+        full frame.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        if self.hand_box is not None:
+            roi = self._clip_box(*self.hand_box, frame_width, frame_height)
+        else:
+            roi = self._clip_box(*self.table_min, *self.table_max, frame_width, frame_height)
+
+        x, y, w, h = roi
+        crop = frame[y:y + h, x:x + w]
+        scale = self.max_size / max(w, h)
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, int(w * scale)), max(1, int(h * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return crop, roi
+
+    def update(self, landmarks):
+        """
+        Feeds back the detected landmarks in full-frame camera pixels, shape
+        (hands, 21, 2), or None when nothing was found.
+        """
+        if landmarks is None or len(landmarks) == 0:
+            self.hand_box = None
+            return
+
+        low = landmarks.reshape(-1, 2).min(axis=0)
+        high = landmarks.reshape(-1, 2).max(axis=0)
+        center = (low + high) / 2
+        # Square box, which is what the palm detector expects
+        half = max(float((high - low).max()) * (1 + self.hand_padding), self.min_hand_box) / 2
+        self.hand_box = (center[0] - half, center[1] - half, center[0] + half, center[1] + half)
@@ -0,0 +1,160 @@
+import multiprocessing
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.camera.hand_tracking import handedness_to_array
+from core.camera.projection import NUM_LANDMARKS, landmarks_to_array
+
+# Latest result read from the tracker process. `frame` is a zero-copy view
+# into the shared ring buffer (valid until the ring wraps around, i.e. for
+# `slots - 1` more captured frames); `landmarks` is a (hands, 21, 2) copy in
+# camera pixels, or None when no hand was found, and `handedness` a copy of
+# the hands' core.camera.hand_tracking handedness codes.
+TrackerSnapshot = namedtuple('TrackerSnapshot', ['seq', 'timestamp', 'frame', 'landmarks', 'handedness'])
+
+# Per-slot metadata columns: sequence number (-1 while being written),
+# capture timestamp and number of hands
+META_SEQ, META_TIMESTAMP, META_HANDS = 0, 1, 2
+
+
+def _attach(name, shape, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _tracker_main(camera_index, buffers, max_num_hands, latest_seq, stop_event):
+    """Entry point of the tracker process: capture + Hands.process in a loop."""
+    import cv2
+    import mediapipe as mp
+
+    frames_shm, frames = _attach(*buffers['frames'])
+    landmarks_shm, landmarks = _attach(*buffers['landmarks'])
+    handedness_shm, handedness = _attach(*buffers['handedness'])
+    meta_shm, meta = _attach(*buffers['meta'])
+    slots, height, width = frames.shape[:3]
+
+    cap = cv2.VideoCapture(camera_index)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5,
+        model_complexity=0
+    )
+
+    seq = -1
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                print("Failed to capture frame")
+                time.sleep(0.01)
+                continue
+            timestamp = time.time()
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height))
+
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+            seq += 1
+            slot = seq % slots
+            # Mark the slot as being written so readers can detect a torn read
+            meta[slot, META_SEQ] = -1
+            frames[slot] = frame
+            num_hands = 0
+            if results.multi_hand_landmarks:
+                num_hands = landmarks_to_array(results.multi_hand_landmarks, (0, 0, width, height),
+                                               landmarks[slot])
+                handedness_to_array(results.multi_handedness or [], handedness[slot])
+            meta[slot, META_TIMESTAMP] = timestamp
+            meta[slot, META_HANDS] = num_hands
+            meta[slot, META_SEQ] = seq
+            latest_seq.value = seq
+    finally:
+        cap.release()
+        hands.close()
+        for shm in (frames_shm, landmarks_shm, handedness_shm, meta_shm):
+            shm.close()
+
+
+class TrackerProcess:
+    """
+    Runs camera capture and MediaPipe hand tracking in a separate process so
+    it gets its own core and does not compete with rendering or speech
+    recognition for the GIL.
+
+    Frames and landmark arrays are written into a ring of `slots` entries in
+    shared memory; `latest()` returns views into the newest complete entry
+    without copying the frame.
+    """
+
+    def __init__(self, camera_index=0, frame_shape=(1080, 1920, 3), max_num_hands=1, slots=4):
+        self.camera_index = camera_index
+        self.max_num_hands = max_num_hands
+        self.slots = slots
+
+        specs = {
+            'frames': ((slots, *frame_shape), np.uint8),
+            'landmarks': ((slots, max_num_hands, NUM_LANDMARKS, 2), np.float32),
+            'handedness': ((slots, max_num_hands), np.int8),
+            'meta': ((slots, 3), np.float64),
+        }
+        self._shms = {}
+        self._buffers = {}
+        self._arrays = {}
+        for key, (shape, dtype) in specs.items():
+            size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shms[key] = shm
+            self._buffers[key] = (shm.name, shape, dtype)
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        self._arrays['meta'][:, META_SEQ] = -1
+
+        # Spawn rather than fork: the UI process already has SDL and other
+        # threads running which must not be duplicated into the child
+        context = multiprocessing.get_context('spawn')
+        self._latest_seq = context.Value('q', -1, lock=False)
+        self._stop_event = context.Event()
+        self._process = context.Process(
+            target=_tracker_main,
+            args=(camera_index, self._buffers, max_num_hands, self._latest_seq, self._stop_event),
+            name='hand-tracker',
+            daemon=True
+        )
+
+    def start(self):
+        self._process.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        for shm in self._shms.values():
+            shm.close()
+            shm.unlink()
+        self._shms = {}
+
+    def latest(self):
+        seq = self._latest_seq.value
+        if seq < 0:
+            return None
+
+        frames = self._arrays['frames']
+        meta = self._arrays['meta']
+        slot = seq % self.slots
+        num_hands = int(meta[slot, META_HANDS])
+        timestamp = float(meta[slot, META_TIMESTAMP])
+        landmarks = self._arrays['landmarks'][slot, :num_hands].copy() if num_hands else None
+        handedness = self._arrays['handedness'][slot, :num_hands].copy()
+
+        # The writer got to this slot again while we were reading; the next
+        # call will pick up the newer entry
+        if meta[slot, META_SEQ] != seq:
+            return None
+        return TrackerSnapshot(seq, timestamp, frames[slot], landmarks, handedness)
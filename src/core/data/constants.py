@@ -4,11 +4,55 @@ SCREEN_WIDTH = 1920
 SCREEN_HEIGHT = 1080
 SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
 
-# Distance threshold for pinch detection (pixel distance between thumb & index)
-PINCH_THRESHOLD = 100
+# Pinch detection (pixel distance between thumb & index tips, see
+# core.input.gestures): a pinch starts below PINCH_START_DISTANCE and ends
+# beyond PINCH_RELEASE_DISTANCE, each after PINCH_DEBOUNCE_FRAMES camera frames
+PINCH_START_DISTANCE = 50
+PINCH_RELEASE_DISTANCE = 70
+PINCH_DEBOUNCE_FRAMES = 2
+# An index tip resting within DWELL_RADIUS pixels for DWELL_TIME seconds
+# counts as a dwell (hover to select)
+DWELL_RADIUS = 30
+DWELL_TIME = 1.0
+
+# Hand tracking (see core.camera.hand_tracking): hands tracked at once, how
+# far (camera pixels) a palm may move between frames and still be the same
+# hand, and for how many frames a lost hand keeps its id
+MAX_HANDS = 2
+HAND_MATCH_DISTANCE = 200
+HAND_LOST_FRAMES = 5
 # Animation duration in seconds (same as the 0.5 sec used in the code for circle movement)
 ANIMATION_DURATION = 0.5
 
 NAVY_BLUE = (20, 20, 40)
 LIGHT_BLUE = (173, 216, 230)
 HOME_TOGGLE_DELAY = 1.0  # Delay in seconds for home button toggle
+
+TARGET_FPS = 60  # Render rate for the home screen, independent of the camera rate
+
+# Memory apps suspended in the background may use together, in MB; the least
+# recently used are dropped beyond it
+APP_MEMORY_BUDGET_MB = 512
+DEFAULT_APP_MEMORY_MB = 64  # For apps whose manifest does not declare memory_budget_mb
+
+# Calibration store (see core.calibration.calibration_store): where versioned
+# camera to display homographies are kept, the calibration used by the home
+# screen, and the single-matrix file it is migrated from
+CALIBRATION_DIR = './calibration'
+DEFAULT_CALIBRATION = 'projector'
+LEGACY_MATRIX_PATH = './M.npy'
+# Display pixels a calibration point may be off and still count as an inlier
+RANSAC_REPROJECTION_THRESHOLD = 15.0
+
+# Drift checks with projected fiducials (see core.calibration.drift_monitor):
+# seconds between checks while the table is idle, and median display pixels
+# the fiducials may have moved before the calibration is refined
+DRIFT_CHECK_INTERVAL = 300
+DRIFT_THRESHOLD = 6.0
+FIDUCIAL_SIZE = 96
+
+# Lens calibration (see core.calibration.camera_intrinsics): inner corners of
+# the printed chessboard, its square size in mm, and the views to collect
+CHESSBOARD_SIZE = (9, 6)
+CHESSBOARD_SQUARE_MM = 25.0
+MIN_CHESSBOARD_VIEWS = 12
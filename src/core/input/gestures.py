@@ -0,0 +1,148 @@
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from core.camera.projection import INDEX_FINGER_TIP, THUMB_TIP
+from core.data.constants import (
+    DWELL_RADIUS,
+    DWELL_TIME,
+    PINCH_DEBOUNCE_FRAMES,
+    PINCH_RELEASE_DISTANCE,
+    PINCH_START_DISTANCE
+)
+
+PINCH_START, PINCH_MOVE, PINCH_END = 'pinch_start', 'pinch_move', 'pinch_end'
+DWELL = 'dwell'
+
+# `hand` is the hand's id (see core.camera.hand_tracking), `position` the point
+# between the thumb and index tips, `cursor` the index tip and `distance`
+# the thumb to index distance, all in screen pixels
+GestureEvent = namedtuple('GestureEvent', ['type', 'hand', 'position', 'cursor', 'distance', 'timestamp'])
+
+
+class GestureEngine:
+    """
+    Turns the stream of projected landmarks into pinch and dwell events for
+    every hand at once.
+
+    Feed it each camera frame's (hands, 21, 2) landmark array and the
+    hands' stable ids with `update()`; state is kept per id, so a hand keeps
+    its pinch while others come and go. Thumb to index distances of all
+    hands are computed in one array operation. A pinch starts when the
+    distance drops below `start_distance` and ends once it grows past the
+    larger `release_distance`, so jitter around one threshold does not
+    flicker.
+    Either change must also be seen on `debounce_frames` consecutive frames.
+    A hand that disappears ends its pinch at once.
+
+    A drag is a held pinch: PINCH_START where it is picked up, PINCH_MOVE
+    with the new position on every frame while it is held, and PINCH_END
+    where it is let go.
+
+    DWELL replaces hover timers: it fires once when an index tip has stayed
+    within `dwell_radius` of one spot for `dwell_time` seconds, and again
+    only after the tip has moved away and settled somewhere else.
+
+    Events are returned by `update()` and passed to the callbacks
+    registered with `subscribe()`.
+    """
+
+    def __init__(self, start_distance=PINCH_START_DISTANCE, release_distance=PINCH_RELEASE_DISTANCE,
+                 debounce_frames=PINCH_DEBOUNCE_FRAMES, dwell_radius=DWELL_RADIUS, dwell_time=DWELL_TIME,
+                 max_hands=4):
+        self.start_distance = start_distance
+        self.release_distance = release_distance
+        self.debounce_frames = debounce_frames
+        self.dwell_radius = dwell_radius
+        self.dwell_time = dwell_time
+        self.max_hands = max_hands
+
+        self.pinched = np.zeros(max_hands, dtype=bool)
+        self.distances = np.full(max_hands, np.inf, dtype=np.float32)
+        self.positions = np.zeros((max_hands, 2), dtype=np.float32)
+        self.cursors = np.zeros((max_hands, 2), dtype=np.float32)
+        # Consecutive frames each hand has looked like the opposite state
+        self._pending = np.zeros(max_hands, dtype=np.int32)
+        self._present = np.zeros(max_hands, dtype=bool)
+        # Where each index tip settled and since when (NaN without a hand)
+        self._dwell_anchors = np.zeros((max_hands, 2), dtype=np.float32)
+        self._dwell_start = np.full(max_hands, np.nan)
+        self._dwelled = np.zeros(max_hands, dtype=bool)
+        self._subscribers = {}
+
+    def subscribe(self, event_type, callback):
+        self._subscribers.setdefault(event_type, []).append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def update(self, landmarks, timestamp=None, hand_ids=None):
+        """
+        Processes one camera frame. `landmarks` is a (hands, 21, 2) array in
+        screen pixels or None without hands, `timestamp` the frame's capture
+        time in seconds (default: now) and `hand_ids` the id of each row
+        (below `max_hands`); without ids the row is the id. Returns the
+        events it emitted.
+        """
+        count = 0 if landmarks is None else min(len(landmarks), self.max_hands)
+        rows = slice(0, count) if hand_ids is None else hand_ids[:count]
+        present = self._present
+        present[:] = False
+        present[rows] = True
+        distances = self.distances
+        distances[~present] = np.inf
+        if count:
+            thumbs = landmarks[:count, THUMB_TIP]
+            cursors = landmarks[:count, INDEX_FINGER_TIP]
+            distances[rows] = np.hypot(thumbs[:, 0] - cursors[:, 0], thumbs[:, 1] - cursors[:, 1])
+            self.positions[rows] = (thumbs + cursors) * 0.5
+            self.cursors[rows] = cursors
+
+        # Hysteresis: a held pinch only lets go beyond the release distance
+        closed = np.where(self.pinched, distances <= self.release_distance, distances < self.start_distance)
+        self._pending = np.where(closed != self.pinched, self._pending + 1, 0)
+        changed = (self._pending >= self.debounce_frames) | (self.pinched & ~present)
+
+        # A tip that leaves its spot settles again from where it is now
+        now = time.time() if timestamp is None else timestamp
+        drift = self.cursors - self._dwell_anchors
+        moved = present & (np.isnan(self._dwell_start) | (np.hypot(drift[:, 0], drift[:, 1]) > self.dwell_radius))
+        self._dwell_anchors[moved] = self.cursors[moved]
+        self._dwell_start[moved] = now
+        self._dwelled[moved] = False
+        self._dwell_start[~present] = np.nan
+        dwelled = present & ~self._dwelled & (now - self._dwell_start >= self.dwell_time)
+        self._dwelled |= dwelled
+
+        events = []
+        for hand in np.flatnonzero(changed | self.pinched):
+            if changed[hand]:
+                event_type = PINCH_END if self.pinched[hand] else PINCH_START
+                self.pinched[hand] = not self.pinched[hand]
+                self._pending[hand] = 0
+            else:
+                event_type = PINCH_MOVE
+            events.append(self._event(event_type, hand, timestamp))
+        for hand in np.flatnonzero(dwelled):
+            events.append(self._event(DWELL, hand, timestamp))
+
+        for event in events:
+            for callback in self._subscribers.get(event.type, ()):
+                callback(event)
+        return events
+
+    def _event(self, event_type, hand, timestamp):
+        position = self.positions[hand]
+        cursor = self.cursors[hand]
+        return GestureEvent(event_type, int(hand), (int(position[0]), int(position[1])),
+                            (int(cursor[0]), int(cursor[1])), float(self.distances[hand]), timestamp)
+
+    def reset(self):
+        """Forgets all pinches and dwells without emitting events."""
+        self.pinched[:] = False
+        self._pending[:] = 0
+        self._dwell_start[:] = np.nan
+        self._dwelled[:] = False
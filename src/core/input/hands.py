@@ -0,0 +1,7 @@
+def steering_hand(hands, hand_id):
+    """
+    The tracked hand with `hand_id` while it is in view, otherwise the first
+    hand (None without hands). A control follows one hand this way, so
+    another hand reaching in does not take it over.
+    """
+    return next((hand for hand in hands if hand.id == hand_id), hands[0] if hands else None)
@@ -0,0 +1,116 @@
+import numpy as np
+
+CIRCLE, RECT = 0, 1
+
+
+class HitTestGrid:
+    """
+    Uniform grid index answering "which widgets are under this point".
+
+    Widgets register a circle or rectangle under a key (re-registering a key
+    moves it). Each shape is listed in the grid cells its bounding box
+    touches, so a query only tests the few shapes sharing the point's cell.
+    `query_many` handles all fingertips of a frame in one call.
+
+    Results are in registration order, so the last key is the one drawn on
+    top when widgets are registered in draw order.
+    """
+
+    def __init__(self, width, height, cell_size=128):
+        self.cell_size = cell_size
+        self.columns = width // cell_size + 1
+        self.rows = height // cell_size + 1
+        self._shapes = {}
+        self._order = {}
+        self._cells = {}
+        self._next_order = 0
+
+    def add_circle(self, key, center, radius):
+        self._add(key, (CIRCLE, center[0], center[1], radius),
+                  (center[0] - radius, center[1] - radius, center[0] + radius, center[1] + radius))
+
+    def add_rect(self, key, rect):
+        x, y, w, h = rect
+        self._add(key, (RECT, x, y, w, h), (x, y, x + w, y + h))
+
+    def _add(self, key, shape, bounds):
+        if key in self._shapes:
+            previous_shape, previous_cells = self._shapes[key]
+            # Moving to the same spot is the common case for static widgets
+            if previous_shape == shape:
+                return
+            self._remove_from_cells(key, previous_cells)
+        else:
+            self._order[key] = self._next_order
+            self._next_order += 1
+
+        cells = self._cells_for(bounds)
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(key)
+        self._shapes[key] = (shape, cells)
+
+    def remove(self, key):
+        if key in self._shapes:
+            self._remove_from_cells(key, self._shapes.pop(key)[1])
+            del self._order[key]
+
+    def clear(self):
+        self._shapes = {}
+        self._order = {}
+        self._cells = {}
+
+    def __contains__(self, key):
+        return key in self._shapes
+
+    def _remove_from_cells(self, key, cells):
+        for cell in cells:
+            keys = self._cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self._cells[cell]
+
+    def _cells_for(self, bounds):
+        x0, y0, x1, y1 = bounds
+        c0 = max(int(x0 // self.cell_size), 0)
+        r0 = max(int(y0 // self.cell_size), 0)
+        c1 = min(int(x1 // self.cell_size), self.columns - 1)
+        r1 = min(int(y1 // self.cell_size), self.rows - 1)
+        return [(c, r) for c in range(c0, c1 + 1) for r in range(r0, r1 + 1)]
+
+    def _contains(self, key, x, y):
+        shape = self._shapes[key][0]
+        if shape[0] == CIRCLE:
+            _, cx, cy, radius = shape
+            return (x - cx) ** 2 + (y - cy) ** 2 <= radius ** 2
+        _, rx, ry, w, h = shape
+        return rx <= x < rx + w and ry <= y < ry + h
+
+    def query(self, point):
+        """All keys whose shape contains `point`, in registration order."""
+        return self.query_many([point])[0]
+
+    def hit(self, point):
+        """The topmost key under `point`, or None."""
+        keys = self.query(point)
+        return keys[-1] if keys else None
+
+    def query_many(self, points):
+        """
+        Batched query for an (N, 2) array or a list of points. Returns one
+        list of keys per point.
+        """
+        if isinstance(points, np.ndarray):
+            points = points.reshape(-1, 2).tolist()
+        cell_size = self.cell_size
+        max_column, max_row = self.columns - 1, self.rows - 1
+
+        results = []
+        for x, y in points:
+            # Shapes reaching past the edges are kept in the border cells
+            column = min(max(int(x // cell_size), 0), max_column)
+            row = min(max(int(y // cell_size), 0), max_row)
+            keys = [key for key in self._cells.get((column, row), ()) if self._contains(key, x, y)]
+            if len(keys) > 1:
+                keys.sort(key=self._order.__getitem__)
+            results.append(keys)
+        return results
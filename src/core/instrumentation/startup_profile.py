@@ -0,0 +1,81 @@
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Measures where cold start time goes: named startup phases plus a
+    per-module import breakdown in the spirit of `python -X importtime`
+    (self and cumulative time of every module imported while running).
+
+    Imports are timed by wrapping builtins.__import__, so only modules that
+    were not loaded yet are counted. Each thread keeps its own import stack
+    so background imports do not mix with the main thread's.
+    """
+
+    def __init__(self):
+        self.start_time = None
+        self.phases = []
+        self.imports = []
+        self._original_import = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.start_time, time.perf_counter() - start))
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        try:
+            package = globals.get('__package__') if level and globals else None
+            module = importlib.util.resolve_name('.' * level + name, package) if level else name
+        except (ImportError, ValueError):
+            module = name
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.imports.append((module, elapsed - children, elapsed, len(stack)))
+
+    def report(self, top=30):
+        total = time.perf_counter() - self.start_time
+        print(f"Startup took {total * 1000:.0f} ms")
+        for name, offset, duration in self.phases:
+            print(f"  {name:<24} {duration * 1000:8.0f} ms  (at {offset * 1000:.0f} ms)")
+
+        top_level = sum(cumulative for _, _, cumulative, depth in self.imports if depth == 0)
+        print(f"Imports: {len(self.imports)} modules, {top_level * 1000:.0f} ms at top level")
+        print(f"{'self [us]':>10} | {'cumulative':>10} | imported package")
+        for module, self_time, cumulative, depth in sorted(self.imports, key=lambda item: -item[2])[:top]:
+            print(f"{self_time * 1e6:10.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{module}")
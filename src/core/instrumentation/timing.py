@@ -0,0 +1,185 @@
+import csv
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pygame
+
+from core.render.text_cache import get_font, render_text
+
+WHITE = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 180)
+
+
+class StageTimings:
+    """
+    Rolling per-stage timings for the capture -> inference -> projection ->
+    app logic -> draw -> flip path. Each stage keeps its last `window`
+    samples for live percentiles; with `keep_history` every sample is also
+    kept so it can be exported to CSV/JSON for offline analysis.
+
+    Stages may be recorded from any thread (the capture pipeline records
+    from its own threads).
+    """
+
+    def __init__(self, window=300, keep_history=False):
+        self.window = window
+        self.keep_history = keep_history
+        self.enabled = True
+        self.overlay_enabled = False
+        self._stages = {}
+        self._history = []
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        samples = self._stages.get(stage)
+        if samples is None:
+            with self._lock:
+                samples = self._stages.setdefault(stage, deque(maxlen=self.window))
+        samples.append(seconds * 1000.0)
+        if self.keep_history:
+            self._history.append((time.time(), stage, seconds * 1000.0))
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def percentiles(self, stage):
+        """Returns (p50, p95, p99) in milliseconds, or None without samples."""
+        samples = self._stages.get(stage)
+        if not samples:
+            return None
+        values = np.percentile(np.fromiter(list(samples), dtype=np.float64), (50, 95, 99))
+        return tuple(float(v) for v in values)
+
+    def summary(self):
+        summary = {}
+        for stage in sorted(self._stages):
+            values = self.percentiles(stage)
+            if values is not None:
+                summary[stage] = {'p50': values[0], 'p95': values[1], 'p99': values[2],
+                                  'count': len(self._stages[stage])}
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._history = []
+
+    def export_csv(self, path):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            if self.keep_history:
+                writer.writerow(['timestamp', 'stage', 'ms'])
+                writer.writerows(self._history)
+            else:
+                writer.writerow(['stage', 'p50_ms', 'p95_ms', 'p99_ms', 'count'])
+                for stage, values in self.summary().items():
+                    writer.writerow([stage, values['p50'], values['p95'], values['p99'], values['count']])
+        print(f"Saved timings to {path}")
+
+    def export_json(self, path):
+        data = {'summary': self.summary()}
+        if self.keep_history:
+            data['samples'] = [{'timestamp': t, 'stage': stage, 'ms': ms} for t, stage, ms in self._history]
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"Saved timings to {path}")
+
+    def export(self, path):
+        if path.endswith('.json'):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
+
+
+# Shared instance used by CameraManager, the home screen and the apps
+timings = StageTimings()
+
+# Screen area the timing overlay was last shown in
+_overlay_area = None
+
+
+def render_timing_overlay(screen, stage_timings=timings, top_right=None):
+    """
+    A p50/p95/p99 table (milliseconds) of all stages as a translucent panel.
+    Returns (panel, position) to blit it at.
+    """
+    rows = [('stage (ms)', 'p50', 'p95', 'p99')]
+    for stage, values in stage_timings.summary().items():
+        rows.append((stage, f"{values['p50']:.1f}", f"{values['p95']:.1f}", f"{values['p99']:.1f}"))
+
+    column_x = (5, 170, 230, 290)
+    line_height = get_font(None, 24).get_linesize()
+    width = 350
+    height = line_height * len(rows) + 10
+    if top_right is None:
+        top_right = (screen.get_width() - 10, 10)
+
+    panel = pygame.Surface((width, height), pygame.SRCALPHA)
+    panel.fill(OVERLAY_BACKGROUND)
+    for i, row in enumerate(rows):
+        for x, text in zip(column_x, row):
+            panel.blit(render_text(text, 24, WHITE), (x, 5 + i * line_height))
+    return panel, (top_right[0] - width, top_right[1])
+
+
+def draw_timing_overlay(screen, stage_timings=timings, top_right=None):
+    """Draws the timing table onto the screen, returns the area it covers."""
+    panel, position = render_timing_overlay(screen, stage_timings, top_right)
+    return screen.blit(panel, position)
+
+
+def present_frame(camera_manager, name='frame', rects=None):
+    """
+    Replacement for pygame.display.flip() in render loops: records the time
+    spent on logic and drawing since the last camera update as `name`, the
+    flip itself and, once per camera frame, the end-to-end latency from
+    capture to the frame being presented. With `rects` only those areas are
+    pushed to the display (see core.render.dirty_rects). `camera_manager`
+    may be None for apps without hand tracking.
+    """
+    global _overlay_area
+    now = time.perf_counter()
+    if camera_manager is not None and camera_manager.last_update_time is not None:
+        timings.record(name, now - camera_manager.last_update_time)
+
+    underlay = None
+    if timings.overlay_enabled:
+        # The panel is translucent and dirty-rect loops only redraw what
+        # changed, so it is blitted over the finished frame and the pixels
+        # under it are put back after the flip; drawing it again next frame
+        # then never stacks on top of the old one
+        screen = pygame.display.get_surface()
+        panel, position = render_timing_overlay(screen)
+        area = panel.get_rect(topleft=position).clip(screen.get_rect())
+        underlay = screen.subsurface(area).copy()
+        screen.blit(panel, position)
+        if rects is not None:
+            # The panel's area, and last frame's in case it has shrunk
+            rects = list(rects) + [area] + ([_overlay_area] if _overlay_area is not None else [])
+        _overlay_area = area
+
+    with timings.stage('display.flip'):
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    if underlay is not None:
+        screen.blit(underlay, area)
+
+    if camera_manager is None:
+        return
+    if camera_manager.frame_timestamp is not None and camera_manager.frame_seq != camera_manager.presented_seq:
+        camera_manager.presented_seq = camera_manager.frame_seq
+        timings.record('end_to_end', time.time() - camera_manager.frame_timestamp)
@@ -0,0 +1,117 @@
+import pygame
+
+
+def merge_rects(rects, bounds):
+    """Clips rects to `bounds` and merges overlapping ones."""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width == 0 or rect.height == 0:
+            continue
+        # Keep absorbing overlapping rects until nothing overlaps any more
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """
+    Pushes only the parts of the screen that changed to the display.
+
+    Retained widgets are registered every frame with `add(key, rect, draw,
+    changed)`; a widget is dirty when it is new, gone, moved/resized or says
+    it changed. Only dirty areas are cleared and redrawn (with every widget
+    overlapping them, in registration order). Immediate-mode loops that
+    redraw everything themselves instead report what they drew with
+    `damage(rect)` and push `flush_damage()`.
+
+    A full redraw and flip is done on the first frame, after `invalidate()`
+    (layout change, returning from an app) or when the dirty area covers
+    more than `full_update_ratio` of the screen.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0), full_update_ratio=0.5):
+        self.screen = screen
+        self.background = background
+        self.full_update_ratio = full_update_ratio
+        self._widgets = []
+        self._previous_rects = {}
+        self._damage = []
+        self._previous_damage = []
+        self._full = True
+
+    def invalidate(self):
+        self._full = True
+
+    def begin_frame(self):
+        self._widgets = []
+        self._damage = []
+
+    def add(self, key, rect, draw, changed=False):
+        if rect is None:
+            return
+        self._widgets.append((key, pygame.Rect(rect), draw, changed))
+
+    def damage(self, rect):
+        self._damage.append(pygame.Rect(rect))
+
+    def _needs_full_update(self, dirty):
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        if self._full or dirty_area > self.full_update_ratio * screen_area:
+            self._full = False
+            return True
+        return False
+
+    def render(self):
+        """
+        Draws the registered widgets. Returns the rects to pass to
+        pygame.display.update, or None when the whole screen must be flipped.
+        """
+        dirty = []
+        current_rects = {}
+        for key, rect, draw, changed in self._widgets:
+            previous = self._previous_rects.get(key)
+            if changed or previous != rect:
+                dirty.append(rect)
+                if previous is not None:
+                    dirty.append(previous)
+            current_rects[key] = rect if key not in current_rects else current_rects[key].union(rect)
+        for key, rect in self._previous_rects.items():
+            if key not in current_rects:
+                dirty.append(rect)
+        self._previous_rects = current_rects
+
+        # Outlines and antialiasing can spill a pixel past the reported rect
+        dirty = merge_rects([rect.inflate(4, 4) for rect in dirty], self.screen.get_rect())
+
+        if self._needs_full_update(dirty):
+            self.screen.fill(self.background)
+            for _, _, draw, _ in self._widgets:
+                draw(self.screen)
+            return None
+
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.screen.fill(self.background, area)
+            for _, rect, draw, _ in self._widgets:
+                if rect.colliderect(area):
+                    draw(self.screen)
+        self.screen.set_clip(None)
+        return dirty
+
+    def flush_damage(self):
+        """
+        For immediate-mode loops: returns the rects drawn this frame plus
+        those drawn last frame (which now need erasing), or None for a full
+        flip.
+        """
+        rects = [rect.inflate(4, 4) for rect in self._damage + self._previous_damage]
+        self._previous_damage = self._damage
+        dirty = merge_rects(rects, self.screen.get_rect())
+        if self._needs_full_update(dirty):
+            return None
+        return dirty
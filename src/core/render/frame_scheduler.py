@@ -0,0 +1,80 @@
+import time
+
+import pygame
+
+
+class FrameScheduler:
+    """
+    Paces a render loop at a target frame rate with pygame.time.Clock and
+    keeps track of frames that overran their budget.
+
+    A frame is "late" when it took longer than its budget; the number of
+    whole frame slots it overran by are counted as "dropped" frames. A
+    target of 0 runs unthrottled and does not count late frames.
+    """
+
+    def __init__(self, target_fps=60, report_interval=10.0, name='Render'):
+        self.target_fps = target_fps
+        self.frame_budget = 1.0 / target_fps if target_fps else None
+        self.report_interval = report_interval
+        self.name = name
+        self.clock = pygame.time.Clock()
+
+        self.frame_count = 0
+        self.late_frames = 0
+        self.dropped_frames = 0
+        self._last_frame_time = None
+        self._last_report_time = time.time()
+        self._report_frames = 0
+        self._report_late = 0
+        self._report_dropped = 0
+
+    def tick(self):
+        """
+        Call once per rendered frame, after display.flip(). Sleeps for the
+        rest of the frame budget and returns the time since the previous
+        frame in seconds.
+        """
+        self.clock.tick(self.target_fps)
+        now = time.time()
+        dt = 0.0 if self._last_frame_time is None else now - self._last_frame_time
+        self._last_frame_time = now
+
+        self.frame_count += 1
+        self._report_frames += 1
+        # Allow a little jitter before calling a frame late
+        if self.frame_budget is not None and dt > self.frame_budget * 1.2:
+            missed = int(dt / self.frame_budget) - 1
+            self.late_frames += 1
+            self.dropped_frames += missed
+            self._report_late += 1
+            self._report_dropped += missed
+
+        if self.report_interval and now - self._last_report_time >= self.report_interval:
+            self.report(now)
+        return dt
+
+    def set_target(self, target_fps):
+        # e.g. when the main loop switches to an app with its own frame rate
+        self.target_fps = target_fps
+        self.frame_budget = 1.0 / target_fps if target_fps else None
+        self.reset()
+
+    def reset(self):
+        # Forget the previous frame, e.g. after returning from a blocking app
+        self._last_frame_time = None
+        self.clock.tick()
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+    def report(self, now=None):
+        now = time.time() if now is None else now
+        elapsed = now - self._last_report_time
+        fps = self._report_frames / elapsed if elapsed > 0 else 0.0
+        print(f"{self.name}: {fps:.1f} fps (target {self.target_fps}), "
+              f"{self._report_late} late, {self._report_dropped} dropped")
+        self._last_report_time = now
+        self._report_frames = 0
+        self._report_late = 0
+        self._report_dropped = 0
@@ -0,0 +1,76 @@
+import os
+from collections import OrderedDict
+
+import pygame
+
+WHITE = (255, 255, 255)
+
+_fonts = {}
+
+
+def get_font(name=None, size=32):
+    """
+    Shared font registry. `name` is None for pygame's default font, a path
+    to a font file, or a system font name. Each font is loaded once.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if name is None or os.path.splitext(name)[1].lower() in ('.ttf', '.otf'):
+            font = pygame.font.Font(name, size)
+        else:
+            font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed by (font, size, text, color,
+    antialias). Labels that do not change are rendered once; changing text
+    (clock, measurements) simply cycles through the cache.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, text, size=32, color=WHITE, font_name=None, antialias=True):
+        key = (font_name, size, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = get_font(font_name, size).render(text, antialias, color)
+        if pygame.display.get_surface() is not None:
+            # Display-format surfaces blit faster
+            surface = surface.convert_alpha()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+# Shared by the widgets and all apps
+text_cache = TextCache()
+
+
+def render_text(text, size=32, color=WHITE, font_name=None, antialias=True):
+    return text_cache.render(text, size, color, font_name, antialias)
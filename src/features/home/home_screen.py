@@ -7,7 +7,22 @@ import time
 import os
 import sys
 import math
+from core.apps.app_cache import SuspendedApps
+from core.apps.app_loader import AppLoader, LOADING, READY
+from core.apps.lifecycle import App
+from core.apps.registry import AppRegistry
+from core.assets.asset_manager import assets, play_sound
 from core.camera.camera_manager import CameraManager
+from core.camera.projection import INDEX_FINGER_TIP
+from core.instrumentation.timing import present_frame, timings
+from core.camera.landmark_filter import OneEuroFilter
+from core.camera.motion_gate import MotionGate
+from core.data.constants import APP_MEMORY_BUDGET_MB, MAX_HANDS, TARGET_FPS
+from core.input.gestures import GestureEngine, PINCH_START
+from core.input.hit_test import HitTestGrid
+from core.render.dirty_rects import DirtyRectRenderer
+from core.render.frame_scheduler import FrameScheduler
+from widgets.app_circle import AppCircle as BaseAppCircle
 # from dotenv import load_dotenv
 
 # load_dotenv()
@@ -25,94 +40,28 @@ NAVY_BLUE = (20, 20, 40)
 LIGHT_BLUE = (173, 216, 230)
 HOME_TOGGLE_DELAY = 1.0  # Delay in seconds for home button toggle
 
-# Distance threshold for pinch detection (pixel distance between thumb & index)
-PINCH_THRESHOLD = 100
 # Animation duration in seconds (same as the 0.5 sec used in the code for circle movement)
 ANIMATION_DURATION = 0.5
 
+# Decoded up front so the first click does not wait for the disk
+UI_SOUNDS = ['./audio/home.wav', './audio/confirmation.wav', './audio/reject.wav', './audio/back.wav',
+             './audio/quick_click.wav']
+
 JARVIS_COMMANDS_MAP = {
     'home_command': False,
     'jarvis_app_index': 0
 }
 
 
-def play_sound(file_path):
-    mixer.music.load(file_path)
-    mixer.music.play()
-
-class AppCircle:
-    def __init__(self, center, radius, app_index, final_pos, is_main=False):
-        self.center = center
-        self.radius = radius
-        self.app_index = app_index
-        self.text = 'Home' if is_main else f'App {app_index}'
-        self.hover_time = 0
-        self.is_hovered_flag = False
-        self.is_main = is_main
-        self.visible = is_main
-        self.final_pos = final_pos
-        self.animation_start_time = None
-        self.is_animating = False
-        self.image = self.load_image()
-
-    def load_image(self):
-        if not self.is_main:
-            image_path = f'./apps/app_{self.app_index}/app_{self.app_index}.jpg'
-            if os.path.exists(image_path):
-                image = pygame.image.load(image_path)
-                return pygame.transform.scale(image, (2 * self.radius, 2 * self.radius))
-        return None
-
-    def draw(self, screen):
-        # If circle is hovered, slightly enlarge radius over time
-        if self.is_hovered_flag:
-            current_radius = self.radius + min((time.time() - self.hover_time) * 10, self.radius * 0.5)
-        else:
-            current_radius = self.radius
-
-        # Animate movement from center to final position (and back)
-        if self.animation_start_time is not None:
-            elapsed_time = time.time() - self.animation_start_time
-            if elapsed_time < ANIMATION_DURATION:  # 0.5 seconds
-                t = elapsed_time / ANIMATION_DURATION
-                if self.visible:
-                    self.center = (
-                        int((1 - t) * SCREEN_SIZE[0] // 2 + t * self.final_pos[0]),
-                        int((1 - t) * SCREEN_SIZE[1] // 2 + t * self.final_pos[1])
-                    )
-                else:
-                    self.center = (
-                        int(t * SCREEN_SIZE[0] // 2 + (1 - t) * self.final_pos[0]),
-                        int(t * SCREEN_SIZE[1] // 2 + (1 - t) * self.final_pos[1])
-                    )
-            else:
-                self.center = self.final_pos if self.visible else (SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2)
-                self.animation_start_time = None
-                self.is_animating = False
-
-        # Draw if visible or if still animating
-        if self.visible or self.is_animating:
-            if self.image:
-                image_width, image_height = self.image.get_size()
-                top_left = (self.center[0] - image_width // 2, self.center[1] - image_height // 2)
-                screen.blit(self.image, top_left)
-            else:
-                pygame.draw.circle(screen, NAVY_BLUE, self.center, int(current_radius))
-            pygame.draw.circle(screen, LIGHT_BLUE, self.center, int(current_radius), 5)
-
-            # Draw text label if no image
-            if not self.image:
-                font = pygame.font.Font(None, 32)
-                text_surface = font.render(self.text, True, (255, 255, 255))
-                text_rect = text_surface.get_rect(center=self.center)
-                screen.blit(text_surface, text_rect)
-
-    def is_hovered(self, pos):
-        return math.hypot(pos[0] - self.center[0], pos[1] - self.center[1]) <= self.radius
+class AppCircle(BaseAppCircle):
+    # The home screen grows hovered circles slower but further than the widget default
+    hover_growth_rate = 10
+    hover_growth_limit = 0.5
 
-def create_circles():
+def create_circles(apps):
+    """Home circle plus one circle per app manifest, in the given order."""
     circles = []
-    num_circles = 8
+    num_circles = len(apps)
     center_x, center_y = SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2
     main_circle_radius = 100
     app_circle_radius = 75
@@ -123,12 +72,13 @@ def create_circles():
     circles.append(main_circle)
 
     # Surrounding app circles
-    angle_step = 360 / num_circles
-    for i in range(num_circles):
+    angle_step = 360 / max(num_circles, 1)
+    for i, app in enumerate(apps):
         angle = math.radians(angle_step * i)
         x = center_x + int(distance * math.cos(angle))
         y = center_y + int(distance * math.sin(angle))
-        circles.append(AppCircle((center_x, center_y), app_circle_radius, i + 1, (x, y)))
+        circles.append(AppCircle((center_x, center_y), app_circle_radius, app.index, (x, y),
+                                 image_path=app.icon, text=app.name))
     return circles
 
 def all_animations_completed(circles):
@@ -140,143 +90,308 @@ def all_animations_completed(circles):
     return all(not circle.is_animating for circle in circles)
 
 
+def register_circles(hits, circles):
+    # Circles move while animating, so their shapes are refreshed every frame.
+    # Hidden circles sit under the home circle and must not catch its hits
+    for circle in circles:
+        if circle.visible or circle.is_animating:
+            hits.add_circle(circle, circle.center, circle.radius)
+        else:
+            hits.remove(circle)
 
 
+def update_hover_state(circles, under_cursor):
+    """
+    Updates the hover flag and hover timer of every circle for a cursor
+    that is over the circles in `under_cursor` (a hit-test result). Returns
+    the last circle under the cursor, or None.
+    """
+    hovered_circle = None
+    for circle in circles:
+        if circle in under_cursor:
+            circle.is_hovered_flag = True
+            hovered_circle = circle
+            # Record the first time we hovered (for animation)
+            if circle.hover_time == 0:
+                circle.hover_time = time.time()
+        else:
+            # Reset hover_time if not hovered
+            if not circle.is_main:
+                # Only reset if circle is visible to avoid messing up the main circle
+                if circle.visible:
+                    circle.hover_time = 0
+    return hovered_circle
 
-def run_home_screen(screen, camera_manager):
-    global JARVIS_COMMANDS_MAP
 
-    circles = create_circles()
-    main_circle = circles[0]
-    running = True
-    apps_visible = False
-    last_toggle_time = 0
+def draw_loading(surface, circle):
+    # Spinning arc around a circle whose app is still being imported
+    angle = (time.time() * 2 * math.pi) % (2 * math.pi)
+    radius = int(circle.current_radius) + 10
+    rect = pygame.Rect(circle.center[0] - radius, circle.center[1] - radius, 2 * radius, 2 * radius)
+    pygame.draw.arc(surface, LIGHT_BLUE, rect, angle, angle + math.pi / 2, 4)
 
-    # play_sound("./audio/startup.wav")
 
-    while running:
-        if not camera_manager.update():
-            continue
+def app_frame_rate(app, default_fps):
+    # target_fps=0 (as fast as possible) applies to every app
+    if app.target_fps is None or not default_fps:
+        return default_fps
+    return app.target_fps
+
+
+def run_main_loop(screen, camera_manager, root_app, target_fps=None, on_first_frame=None):
+    """
+    The one render loop of the system. Every frame it updates the camera,
+    pumps events, runs new landmarks through the gesture engine, then
+    updates and draws whichever app is on top of the app stack (see
+    core.apps.lifecycle.App), records its timings and paces the frame.
+    Apps open other apps on top of themselves and close back to the one
+    below; the loop returns once the root app closes.
+
+    `camera_manager` may be None for apps that do not need hand tracking.
+    """
+    default_fps = TARGET_FPS if target_fps is None else target_fps
+    scheduler = FrameScheduler(default_fps, name='Main loop')
+    stack = [root_app]
+    # Pinches and dwells are detected once per camera frame for every app
+    gestures = GestureEngine(max_hands=camera_manager.max_num_hands if camera_manager is not None else MAX_HANDS)
+    gesture_seq = None
+    scheduler.set_target(app_frame_rate(root_app, default_fps))
+    root_app.on_enter()
+    dt = 0.0
+
+    while stack:
+        app = stack[-1]
+        if camera_manager is not None:
+            camera_manager.update()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                for running_app in reversed(stack):
+                    running_app.on_exit()
                 pygame.quit()
-                camera_manager.release()
+                if camera_manager is not None:
+                    camera_manager.release()
                 sys.exit()
+            app.handle_event(event)
+
+        hands = []
+        if camera_manager is not None:
+            hands = camera_manager.get_transformed_landmarks() or []
+            if camera_manager.frame_seq != gesture_seq:
+                gesture_seq = camera_manager.frame_seq
+                with timings.stage('gestures'):
+                    gesture_events = gestures.update(camera_manager.get_transformed_landmark_array(),
+                                                     camera_manager.frame_timestamp, camera_manager.hand_ids)
+                for gesture_event in gesture_events:
+                    app.handle_gesture(gesture_event)
+
+        with timings.stage(f'{app.name}.update'):
+            app.update(dt, hands)
+
+        if app.closed or app.opened_app is not None:
+            # The next app draws its first frame on the next iteration
+            app.on_exit()
+            if app.closed:
+                stack.pop()
+                if app.next_app is not None:
+                    stack.append(app.next_app)
+            else:
+                stack.append(app.opened_app)
+                app.opened_app = None
+            if stack:
+                stack[-1].reopen()
+                scheduler.set_target(app_frame_rate(stack[-1], default_fps))
+                stack[-1].on_enter()
+            dt = 0.0
+            continue
 
-        screen.fill((0, 0, 0))
+        with timings.stage(f'{app.name}.draw'):
+            rects = app.draw(screen)
+        present_frame(camera_manager, f'{app.name}.frame', rects)
+        dt = scheduler.tick()
+
+        # Lets the caller start the rest of the system once something is on screen
+        if on_first_frame is not None:
+            on_first_frame()
+            on_first_frame = None
+
+
+def run_home_screen(screen, camera_manager, target_fps=None, app_loader=None, on_first_frame=None,
+                    app_memory_budget_mb=None, drift_monitor=None):
+    home = HomeScreen(screen, camera_manager, app_loader, app_memory_budget_mb, drift_monitor)
+    run_main_loop(screen, camera_manager, home, target_fps, on_first_frame)
+
+
+class HomeScreen(App):
+    name = 'home'
+
+    def __init__(self, screen, camera_manager, app_loader=None, app_memory_budget_mb=None, drift_monitor=None):
+        super().__init__(screen, camera_manager)
+        # Apps are imported in the background while nobody is using the table;
+        # one that is opened before it is ready shows a spinner until it is
+        self.loader = app_loader or AppLoader(AppRegistry())
+        self.loader.preload()
+        self.pending_app = None
+        # Apps closed back to the home screen stay alive until the memory
+        # budget needs their space, so reopening them is instant
+        self.suspended = SuspendedApps(APP_MEMORY_BUDGET_MB if app_memory_budget_mb is None else app_memory_budget_mb)
+        self.active_app = None
+        # Optional core.calibration.drift_monitor.DriftMonitor; its fiducials
+        # are shown while nobody is using the table
+        self.drift_monitor = drift_monitor
+
+        self.circles = create_circles(self.loader.registry.available())
+        self.main_circle = self.circles[0]
+        self.apps_visible = False
+        self.last_toggle_time = 0
+
+        # Only the circles and cursors that changed are redrawn and pushed to the display
+        self.renderer = DirtyRectRenderer(screen)
+        self.hits = HitTestGrid(SCREEN_SIZE[0], SCREEN_SIZE[1])
+
+        assets.preload_sounds(UI_SOUNDS)
+        # play_sound("./audio/startup.wav")
+
+    def on_enter(self):
+        # Back from an app: the screen holds whatever it drew last
+        self.renderer.invalidate()
+        if self.active_app is not None:
+            index, app = self.active_app
+            self.suspended.suspend(index, app, self.loader.apps[index].memory_budget_mb)
+            self.active_app = None
+
+    def on_exit(self):
+        self.loader.set_idle(False)
+
+    def launch(self, app_index):
+        if open_app(self, app_index) == LOADING:
+            self.pending_app = app_index
+
+    def update(self, dt, hands):
+        circles = self.circles
+        renderer = self.renderer
+        loader = self.loader
+        renderer.begin_frame()
 
         # Draw all circles first
         for circle in circles:
             circle.is_hovered_flag = False
-            circle.draw(screen)
-
-        hovered_circle = None  # Track which circle is hovered this frame
-
-        # Get landmarks from camera
-        transformed_landmarks = camera_manager.get_transformed_landmarks()
+            circle.update()
+            renderer.add(('circle', circle.app_index), circle.get_rect(), circle.render, circle.is_changing)
+
+        idle = not hands and self.pending_app is None and all_animations_completed(circles)
+        loader.set_idle(idle)
+        if self.drift_monitor is not None and self.drift_monitor.wants_fiducials(idle):
+            for marker_id, (rect, marker) in enumerate(self.drift_monitor.markers):
+                renderer.add(('fiducial', marker_id), rect,
+                             lambda surface, rect=rect, marker=marker: surface.blit(marker, rect))
+
+        if self.pending_app is not None:
+            if loader.status(self.pending_app) == LOADING:
+                loading_circle = next((circle for circle in circles if circle.app_index == self.pending_app), None)
+                if loading_circle is not None and loading_circle.get_rect() is not None:
+                    renderer.add('loading', loading_circle.get_rect().inflate(40, 40),
+                                 lambda surface, circle=loading_circle: draw_loading(surface, circle), True)
+            else:
+                open_app(self, self.pending_app)
+                self.pending_app = None
 
         if JARVIS_COMMANDS_MAP['jarvis_app_index'] > 0:
             print('Voice App Launch')
-            index = JARVIS_COMMANDS_MAP['jarvis_app_index']
-            run_app_with_index(index, screen, camera_manager)
+            self.launch(JARVIS_COMMANDS_MAP['jarvis_app_index'])
             JARVIS_COMMANDS_MAP['jarvis_app_index'] = 0
-        else:
-            if transformed_landmarks:
-                # Assuming one hand for simplicity, or take the first hand
-                for transformed_coords in transformed_landmarks:
-                    # Index finger tip
-                    index_tip = transformed_coords[camera_manager.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-                    screen_x = int(index_tip[0])
-                    screen_y = int(index_tip[1])
-
-                    # Thumb tip (for pinch detection)
-                    thumb_tip = transformed_coords[camera_manager.mp_hands.HandLandmark.THUMB_TIP]
-                    thumb_x = int(thumb_tip[0])
-                    thumb_y = int(thumb_tip[1])
-
-                    # Draw the index finger cursor
-                    index_finger_pos = (screen_x, screen_y)
-                    pygame.draw.circle(screen, LIGHT_BLUE, index_finger_pos, 15, 3)
-
-                    # Check hover state
-                    for circle in circles:
-                        if circle.is_hovered(index_finger_pos):
-                            circle.is_hovered_flag = True
-                            hovered_circle = circle
-                            # Record the first time we hovered (for animation)
-                            if circle.hover_time == 0:
-                                circle.hover_time = time.time()
-                        else:
-                            # Reset hover_time if not hovered
-                            if not circle.is_main:
-                                # Only reset if circle is visible to avoid messing up the main circle
-                                if circle.visible:
-                                    circle.hover_time = 0
-
-                    # Check for pinch (distance between index tip & thumb tip)
-                    dx = thumb_x - screen_x
-                    dy = thumb_y - screen_y
-                    distance = math.hypot(dx, dy)
-                    is_pinched = (distance < PINCH_THRESHOLD)
-
-                    # Only allow interaction if no circle is still animating
-                    if JARVIS_COMMANDS_MAP["home_command"] is True or (hovered_circle and is_pinched and all_animations_completed(circles)):
-                        current_time = time.time()
-                        print('JARVIS HOME COMMAND: ', JARVIS_COMMANDS_MAP)
-
-                        # If it's the Home circle
-                        if JARVIS_COMMANDS_MAP["home_command"] is True or hovered_circle.is_main:
-                            # set_jarvis_home_command()
-                            JARVIS_COMMANDS_MAP["home_command"] = False
-                            # Toggle app visibility (if enough time passed)
-                            if current_time - last_toggle_time > HOME_TOGGLE_DELAY:
-                                apps_visible = not apps_visible
-                                print(f"Toggling apps visibility to: {apps_visible}")
-                                play_sound("./audio/home.wav")
-                                last_toggle_time = current_time
-
-                                for app_circle in circles[1:]:
-                                    app_circle.visible = apps_visible
-                                    app_circle.animation_start_time = time.time()
-                                    app_circle.is_animating = True
-
-                        # Otherwise, an app circle
-                        else:
-                            # Launch an app if visible
-                            if hovered_circle.visible and apps_visible:
-                                run_app_with_index(hovered_circle.app_index, screen, camera_manager)
-                                # try:
-                                #     app_name = f'app_{hovered_circle.app_index}.app_{hovered_circle.app_index}'
-                                #     print(f"Launching app: {app_name}")
-                                #     mod = __import__(f'apps.{app_name}', fromlist=[''])
-                                #     play_sound("./audio/confirmation.wav")
-                                #     # Pass camera_manager to the app
-                                #     mod.run(screen, camera_manager)
-                                # except ModuleNotFoundError:
-                                #     print(f"Module 'apps.{app_name}' not found.")
-                                #     play_sound("./audio/reject.wav")
-
+        elif JARVIS_COMMANDS_MAP['home_command'] is True:
+            print('JARVIS HOME COMMAND: ', JARVIS_COMMANDS_MAP)
+            JARVIS_COMMANDS_MAP['home_command'] = False
+            self.toggle_apps()
+
+        # Pinches are hit-tested against the circles as they are this frame
+        register_circles(self.hits, circles)
+        if hands:
+            # Hit-test every index fingertip at once
+            under_fingertips = self.hits.query_many([hand[INDEX_FINGER_TIP] for hand in hands])
+
+            for hand in hands:
+                # Every hand has its own cursor, keyed by its id so it is
+                # erased where that hand was last drawn
+                index_finger_pos = hand.cursor
+                renderer.add(('cursor', hand.id), (index_finger_pos[0] - 16, index_finger_pos[1] - 16, 32, 32),
+                             lambda surface, pos=index_finger_pos: pygame.draw.circle(surface, LIGHT_BLUE, pos, 15, 3))
+
+            # A circle is hovered while any hand is over it
+            update_hover_state(circles, set().union(*under_fingertips))
 
         # Redraw main circle on top (optional)
-        main_circle.draw(screen)
-
-        pygame.display.flip()
-        pygame.time.delay(50)
-
-
-def run_app_with_index(app_index, screen, camera_manager):
-    try:
-        app_name = f'app_{app_index}.app_{app_index}'
-        print(f"Launching app: {app_name}")
-        mod = __import__(f'apps.{app_name}', fromlist=[''])
+        self.main_circle.update()
+        renderer.add('main_circle_top', self.main_circle.get_rect(), self.main_circle.render,
+                     self.main_circle.is_changing)
+
+    def handle_gesture(self, event):
+        # Pinching a circle toggles the apps (home circle) or opens the app,
+        # but only once no circle is still animating
+        if event.type != PINCH_START or not all_animations_completed(self.circles):
+            return
+        pinched_circle = self.hits.hit(event.cursor)
+        if pinched_circle is None:
+            return
+        if pinched_circle.is_main:
+            self.toggle_apps()
+        elif pinched_circle.visible and self.apps_visible and self.pending_app is None:
+            self.launch(pinched_circle.app_index)
+
+    def toggle_apps(self):
+        # Toggle app visibility (if enough time passed)
+        current_time = time.time()
+        if current_time - self.last_toggle_time > HOME_TOGGLE_DELAY:
+            self.apps_visible = not self.apps_visible
+            print(f"Toggling apps visibility to: {self.apps_visible}")
+            play_sound("./audio/home.wav")
+            self.last_toggle_time = current_time
+
+            for app_circle in self.circles[1:]:
+                app_circle.visible = self.apps_visible
+                app_circle.animation_start_time = time.time()
+                app_circle.is_animating = True
+
+    def draw(self, surface):
+        return self.renderer.render()
+
+
+def open_app(home, app_index):
+    """
+    Opens the app on top of the home screen: resumes it if it was
+    suspended, or creates it if its module is loaded. Otherwise starts
+    loading it and returns LOADING so the caller can retry once it is
+    ready. Returns the app's final load status.
+    """
+    loader = home.loader
+    app = home.suspended.resume(app_index)
+    if app is not None:
+        print(f"Resuming app: {loader.apps[app_index].name}")
         play_sound("./audio/confirmation.wav")
-
-        # Pass camera_manager to the app
-        mod.run(screen, camera_manager)
-    except ModuleNotFoundError:
-        print(f"Module 'apps.{app_name}' not found.")
+        home.active_app = (app_index, app)
+        home.open(app)
+        return READY
+
+    entry = loader.entry(app_index) if app_index in loader.apps else None
+    if entry is None:
+        if app_index in loader.apps:
+            loader.request(app_index)
+        status = loader.status(app_index)
+        if status == LOADING:
+            print(f"App {app_index} is still loading")
+            return LOADING
+        print(f"App {app_index} is not available")
         play_sound("./audio/reject.wav")
+        return status
+
+    print(f"Launching app: {loader.apps[app_index].name}")
+    play_sound("./audio/confirmation.wav")
+    # The entry point is the app's App class; it shares the home screen's camera
+    app = entry(home.screen, home.camera_manager)
+    home.active_app = (app_index, app)
+    home.open(app)
+    return READY
 
 
 if __name__ == '__main__':
@@ -287,7 +402,8 @@ if __name__ == '__main__':
     screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     pygame.display.set_caption('Home Screen')
 
-    camera_manager = CameraManager('./M.npy', SCREEN_WIDTH, SCREEN_HEIGHT)
+    camera_manager = CameraManager('./M.npy', SCREEN_WIDTH, SCREEN_HEIGHT, threaded=True,
+                                   landmark_filter=OneEuroFilter(), motion_gate=MotionGate())
     run_home_screen(screen, camera_manager)
 
 
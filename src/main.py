@@ -1,44 +1,137 @@
+import argparse
+import atexit
 import os
 import threading
+import time
+from contextlib import nullcontext
 
-import pygame
-
-from core.camera.camera_manager import CameraManager
-from core.assistant_module import jarvis
+# Everything else is imported in the startup stages below, so the home
+# screen and camera come up first and --profile-startup can see it all
 
 
 def start_jarvis():
+    # The assistant stack (speech recognition, OpenAI, search) is only
+    # imported here, on its own thread, once the home screen is running
+    start = time.perf_counter()
+    from core.assistant_module import jarvis
+    print(f"Assistant loaded in {(time.perf_counter() - start) * 1000:.0f} ms")
     jarvis.init_jarvis()
 
 
-def start_home(screen, camera_manager):
+def start_home(screen, camera_manager, target_fps=None, app_loader=None, on_first_frame=None,
+               app_memory_budget_mb=None, drift_monitor=None):
     from features.home.home_screen import run_home_screen
-    run_home_screen(screen, camera_manager)
+    run_home_screen(screen, camera_manager, target_fps, app_loader, on_first_frame, app_memory_budget_mb,
+                    drift_monitor)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Holomat home screen')
+    parser.add_argument('--source', default=None,
+                        help='Frame source instead of the live camera: device:N, video:PATH, images:DIR '
+                             'or landmarks:RECORDING.npz, optionally suffixed with @realtime')
+    parser.add_argument('--record', default=None, metavar='PATH',
+                        help='Record camera-space landmarks to PATH (.npz) for later replay')
+    parser.add_argument('--headless', action='store_true',
+                        help='Run without a display or Jarvis and render as fast as possible')
+    parser.add_argument('--timing-overlay', action='store_true',
+                        help='Show per-stage p50/p95/p99 timings on the projector')
+    parser.add_argument('--timing-export', default=None, metavar='PATH',
+                        help='On exit, write every timing sample to PATH (.csv or .json)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print the startup phases and an import time breakdown once the home screen is up')
+    parser.add_argument('--app-memory-mb', type=int, default=None, metavar='MB',
+                        help='Memory budget for apps kept suspended in the background '
+                             '(default: APP_MEMORY_BUDGET_MB in core/data/constants.py)')
+    parser.add_argument('--max-hands', type=int, default=None, metavar='N',
+                        help='Number of hands to track at once (default: MAX_HANDS in core/data/constants.py)')
+    parser.add_argument('--calibration', default=None, metavar='NAME',
+                        help='Calibration to use from the calibration store, or a bare .npy homography '
+                             '(default: DEFAULT_CALIBRATION in core/data/constants.py)')
+    parser.add_argument('--drift-check', type=float, default=None, metavar='SECONDS',
+                        help='Seconds between fiducial drift checks while the table is idle, 0 to disable '
+                             '(default: DRIFT_CHECK_INTERVAL in core/data/constants.py)')
+    return parser.parse_args()
 
 
 if __name__ == '__main__':
     SCREEN_WIDTH = 1920
     SCREEN_HEIGHT = 1080
 
-    os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"] = "1"
-    # os.environ['SDL_VIDEO_WINDOW_POS'] = '-3440,0'
-
-    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-    pygame.display.set_caption('Home Screen')
-
-    camera_manager = CameraManager('./M.npy', SCREEN_WIDTH, SCREEN_HEIGHT)
-
-    # thread1 = threading.Thread(target=start_home, args=(screen, camera_manager))
-    thread2 = threading.Thread(target=start_jarvis)
-
-    # Start threads
-    # thread1.start()
-    thread2.start()
-
-    # Optionally, wait for threads to complete (infinite loop here means you may not want to join)
-    # thread1.join()
-    # thread2.join()
-
-    # start_jarvis()
-    start_home(screen, camera_manager)
-
+    args = parse_args()
+
+    profiler = None
+    if args.profile_startup:
+        from core.instrumentation.startup_profile import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.start()
+
+    def stage(name):
+        return profiler.phase(name) if profiler else nullcontext()
+
+    with stage('display'):
+        import pygame
+        from core.instrumentation.timing import timings
+
+        timings.overlay_enabled = args.timing_overlay
+        if args.timing_export:
+            timings.keep_history = True
+            atexit.register(timings.export, args.timing_export)
+
+        if args.headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            os.environ["SDL_VIDEO_FULLSCREEN_DISPLAY"] = "1"
+            # os.environ['SDL_VIDEO_WINDOW_POS'] = '-3440,0'
+            screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        pygame.display.set_caption('Home Screen')
+
+    with stage('camera'):
+        from core.camera.camera_manager import CameraManager
+        from core.camera.frame_sources import open_source
+        from core.camera.landmark_filter import OneEuroFilter
+        from core.camera.motion_gate import MotionGate
+        from core.data.constants import DEFAULT_CALIBRATION, DRIFT_CHECK_INTERVAL, MAX_HANDS
+
+        source = open_source(args.source) if args.source else None
+        camera_manager = CameraManager(args.calibration or DEFAULT_CALIBRATION, SCREEN_WIDTH, SCREEN_HEIGHT,
+                                       threaded=True,
+                                       landmark_filter=OneEuroFilter(), motion_gate=MotionGate(),
+                                       source=source, record_path=args.record,
+                                       max_num_hands=args.max_hands or MAX_HANDS)
+
+        # Keeps a stored calibration in line with the table from then on
+        drift_monitor = None
+        drift_interval = DRIFT_CHECK_INTERVAL if args.drift_check is None else args.drift_check
+        if drift_interval and camera_manager.calibration.name is not None:
+            from core.calibration.calibration_store import CalibrationStore
+            from core.calibration.drift_monitor import DriftMonitor
+            drift_monitor = DriftMonitor(camera_manager, CalibrationStore(), camera_manager.calibration.name,
+                                         drift_interval)
+
+    with stage('app registry'):
+        from core.apps.app_loader import AppLoader
+        from core.apps.registry import AppRegistry
+
+        # Apps are read from their manifests without importing them; the home
+        # screen loads them in the background. Per-app load times are printed on exit.
+        registry = AppRegistry()
+        registry.report()
+        app_loader = AppLoader(registry)
+        atexit.register(app_loader.report)
+
+    home_start = time.perf_counter()
+
+    def on_first_frame():
+        if profiler:
+            profiler.phases.append(('home screen', home_start - profiler.start_time,
+                                    time.perf_counter() - home_start))
+            profiler.stop()
+            profiler.report()
+        # The assistant comes last, in the background
+        if not args.headless:
+            threading.Thread(target=start_jarvis, name='jarvis', daemon=True).start()
+
+    start_home(screen, camera_manager, 0 if args.headless else None, app_loader, on_first_frame,
+               args.app_memory_mb, drift_monitor)
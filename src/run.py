@@ -18,6 +18,10 @@ M = np.load("M.npy")
 
 width, height = 3840, 2160
 
+# Drawn into in place every frame; only the area last drawn on is cleared
+output_image = np.zeros((height, width, 3), np.uint8)
+drawn = None
+
 while True:
     ret, frame = cap.read()
 
@@ -32,8 +36,11 @@ while True:
     # Run inference for hand detection
     results = hands.process(rgb_frame)
 
-    # Create an empty image to draw on
-    output_image = np.zeros((height, width, 3), np.uint8)
+    # Clear last frame's landmarks
+    if drawn is not None:
+        x0, y0, x1, y1 = drawn
+        output_image[y0:y1, x0:x1] = 0
+        drawn = None
 
     if results.multi_hand_landmarks:
         for hand_landmarks in results.multi_hand_landmarks:
@@ -51,6 +58,14 @@ while True:
             transformed_coords = cv2.perspectiveTransform(np.array([landmark_coords]), M)[0]
             print(f"Transformed Landmark Coordinates: {transformed_coords}")
 
+            # Bounding box of the circles and labels about to be drawn
+            x0, y0 = np.floor(transformed_coords.min(axis=0)).astype(int) - 20
+            x1, y1 = np.ceil(transformed_coords.max(axis=0)).astype(int) + 60
+            if drawn is not None:
+                x0, y0 = min(x0, drawn[0]), min(y0, drawn[1])
+                x1, y1 = max(x1, drawn[2]), max(y1, drawn[3])
+            drawn = (max(x0, 0), max(y0, 0), min(x1, width), min(y1, height))
+
             # Draw landmarks on the output image
             for i, (x, y) in enumerate(transformed_coords):
                 cv2.circle(output_image, (int(x), int(y)), 5, (0, 255, 0), -1)
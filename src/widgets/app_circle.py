@@ -4,15 +4,24 @@ import time
 
 import pygame
 
+from core.assets.asset_manager import load_image
 from core.data.constants import ANIMATION_DURATION, SCREEN_SIZE, NAVY_BLUE, LIGHT_BLUE
+from core.render.text_cache import render_text
 
 
 class AppCircle:
-    def __init__(self, center, radius, app_index, final_pos, is_main=False, hover_time=0):
+    # Hover growth in pixels per second, and its cap as a fraction of the radius
+    hover_growth_rate = 60
+    hover_growth_limit = 0.25
+
+    def __init__(self, center, radius, app_index, final_pos, is_main=False, hover_time=0,
+                 image_path=None, text=None):
         self.center = center
         self.radius = radius
+        self.current_radius = radius
         self.app_index = app_index
-        self.text = 'Home' if is_main else f'App {app_index}'
+        self.text = text or ('Home' if is_main else f'App {app_index}')
+        self.image_path = image_path
         self.hover_time = hover_time
         self.is_hovered_flag = False
         self.is_main = is_main
@@ -24,20 +33,19 @@ class AppCircle:
 
     def load_image(self):
         if not self.is_main:
-            image_path = f'./apps/app_{self.app_index}/app_{self.app_index}.jpg'
+            image_path = self.image_path or f'./apps/app_{self.app_index}/app_{self.app_index}.jpg'
             if os.path.exists(image_path):
-                image = pygame.image.load(image_path)
-                return pygame.transform.scale(image, (2 * self.radius, 2 * self.radius))
+                return load_image(image_path, (2 * self.radius, 2 * self.radius))
         return None
 
-    def draw(self, screen):
+    def update(self):
+        """Advances the hover growth and the open/close animation."""
         # If circle is hovered, slightly enlarge radius over time
         if self.is_hovered_flag:
-            # current_radius = self.radius + min((time.time() - self.hover_time) * 10, self.radius * 0.5)
-            # Increase the growth rate from 10 to 30
-            current_radius = self.radius + min((time.time() - self.hover_time) * 60, self.radius * 0.25)
+            self.current_radius = self.radius + min((time.time() - self.hover_time) * self.hover_growth_rate,
+                                                    self.radius * self.hover_growth_limit)
         else:
-            current_radius = self.radius
+            self.current_radius = self.radius
 
         # Animate movement from center to final position (and back)
         if self.animation_start_time is not None:
@@ -59,6 +67,8 @@ class AppCircle:
                 self.animation_start_time = None
                 self.is_animating = False
 
+    def render(self, screen):
+        """Draws the circle in its current state without advancing it."""
         # Draw if visible or if still animating
         if self.visible or self.is_animating:
             if self.image:
@@ -66,15 +76,32 @@ class AppCircle:
                 top_left = (self.center[0] - image_width // 2, self.center[1] - image_height // 2)
                 screen.blit(self.image, top_left)
             else:
-                pygame.draw.circle(screen, NAVY_BLUE, self.center, int(current_radius))
-            pygame.draw.circle(screen, LIGHT_BLUE, self.center, int(current_radius), 5)
+                pygame.draw.circle(screen, NAVY_BLUE, self.center, int(self.current_radius))
+            pygame.draw.circle(screen, LIGHT_BLUE, self.center, int(self.current_radius), 5)
 
             # Draw text label if no image
             if not self.image:
-                font = pygame.font.Font(None, 32)
-                text_surface = font.render(self.text, True, (255, 255, 255))
+                text_surface = render_text(self.text, 32, (255, 255, 255))
                 text_rect = text_surface.get_rect(center=self.center)
                 screen.blit(text_surface, text_rect)
 
+    def draw(self, screen):
+        self.update()
+        self.render(screen)
+
+    def get_rect(self):
+        """Screen area covered by the circle, or None when it is not drawn."""
+        if not (self.visible or self.is_animating):
+            return None
+        extent = int(self.current_radius) + 1
+        if self.image:
+            extent = max(extent, self.image.get_width() // 2 + 1, self.image.get_height() // 2 + 1)
+        return pygame.Rect(self.center[0] - extent, self.center[1] - extent, 2 * extent, 2 * extent)
+
+    @property
+    def is_changing(self):
+        # Hover growth and animation change the circle every frame
+        return self.is_animating or self.is_hovered_flag
+
     def is_hovered(self, pos):
-        return math.hypot(pos[0] - self.center[0], pos[1] - self.center[1]) <= self.radius
\ No newline at end of file
+        return math.hypot(pos[0] - self.center[0], pos[1] - self.center[1]) <= self.radius